@@ -106,6 +106,10 @@ export class NotificationService {
         return 'Mención en comentario';
       case 'card_updated':
         return 'Tarjeta modificada';
+      case 'card_due_soon':
+        return 'Tarjeta por vencer';
+      case 'card_overdue':
+        return 'Tarjeta vencida';
       case 'invite':
         return 'Invitación a un equipo';
       case 'system':
@@ -122,6 +126,8 @@ export class NotificationService {
       case 'card_comment':
         return 'mention';
       case 'card_updated':
+      case 'card_due_soon':
+      case 'card_overdue':
         return 'task';
       case 'invite':
         return 'invite';
@@ -137,6 +143,8 @@ export class NotificationService {
         case 'card_assigned':
         case 'card_comment':
         case 'card_updated':
+        case 'card_due_soon':
+        case 'card_overdue':
           if (notification.data.board_id && notification.data.card_id) {
             return `/boards/${notification.data.board_id}?card=${notification.data.card_id}`;
           }
@@ -1,12 +1,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.supabase import validate_jwt_token, get_user_by_id
+from app.core.config import settings
+from app.core.supabase import AuthServiceUnavailable, validate_jwt_token, get_user_by_id
 from typing import Optional, Any, Dict
 from pydantic import BaseModel
 from app.database.db import engine
 from sqlalchemy.sql import text
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 # Modelo para representar los datos del usuario autenticado
 class AuthUser(BaseModel):
     id: str
@@ -68,7 +72,7 @@ async def sync_user_to_database(user_info: Dict[str, Any]) -> None:
                 
                 # Hacer commit de los cambios
                 conn.commit()
-                print(f"Usuario {user_info['email']} sincronizado con la base de datos local")
+                logger.info("Usuario %s sincronizado con la base de datos local", user_info['email'])
             else:
                 # Si el usuario existe pero el auth_id no coincide, actualizarlo
                 update_query = text("""
@@ -84,7 +88,7 @@ async def sync_user_to_database(user_info: Dict[str, Any]) -> None:
                 
                 conn.commit()
     except Exception as e:
-        print(f"Error al sincronizar usuario con la base de datos local: {e}")
+        logger.error("Error al sincronizar usuario con la base de datos local: %s", e)
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> AuthUser:
     """
@@ -92,9 +96,15 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     Lanza una excepción 401 si el token no es válido.
     """
     token = credentials.credentials
-    user_response = await validate_jwt_token(token)
-    
-    print(f"Validando token JWT con respuesta: {user_response}")
+    try:
+        user_response = await validate_jwt_token(token)
+    except AuthServiceUnavailable:
+        # Supabase caído y token sin verificar: 503 para que el cliente no cierre la sesión
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servicio de autenticación no disponible, intenta de nuevo en unos segundos",
+            headers={"Retry-After": str(int(settings.SUPABASE_BREAKER_RESET_SECONDS))},
+        )
     
     # Verifica si la respuesta es None o vacía
     if not user_response:
@@ -140,12 +150,9 @@ def extract_user_info(response: Any) -> Dict[str, Any]:
     Extrae la información del usuario de la respuesta de Supabase.
     Maneja diferentes formatos de respuesta.
     """
-    # Para depuración
-    print(f"Extrayendo información de usuario de: {type(response)}")
-    
     # Si no es un dict, convertir a string y retornar error
     if not isinstance(response, dict):
-        print(f"Respuesta no es un diccionario: {response}")
+        logger.debug("Respuesta de validación no es un diccionario: %s", type(response).__name__)
         return None
     
     # Para la nueva API de Supabase (v1.0+)
@@ -200,7 +207,7 @@ def extract_user_info(response: Any) -> Dict[str, Any]:
             }
     
     # Si llegamos aquí, no pudimos extraer la información
-    print(f"No se pudo extraer información de usuario de la respuesta: {response}")
+    logger.warning("No se pudo extraer información de usuario de la respuesta")
     return None
 
 # Dependencia opcional para rutas que pueden tener autenticación opcional
@@ -214,5 +221,5 @@ async def get_optional_user(credentials: Optional[HTTPAuthorizationCredentials]
     except HTTPException:
         return None
     except Exception as e:
-        print(f"Error obteniendo usuario opcional: {e}")
+        logger.error("Error obteniendo usuario opcional: %s", e)
         return None 
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Caché en memoria por proyecto con invalidación explícita.
+
+Los servicios que precalculan datos costosos (analíticas, resúmenes de sprint)
+crean su propia instancia de ProjectCache. Las rutas que modifican datos de un
+proyecto llaman a `invalidate_project(project_id)` y todas las cachés registradas
+descartan sus entradas. El TTL acota la desactualización entre workers, ya que
+cada proceso mantiene su propia copia.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class ProjectCache:
+    """Caché LRU con expiración, indexada por (project_id, clave)"""
+
+    def __init__(self, name: str, ttl_seconds: float = 300, max_entries: int = 1024):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def get(self, project_id: str, key: Hashable = None, default: Any = None) -> Any:
+        """Obtener un valor vigente o `default` si no existe o expiró"""
+        cache_key = (project_id, key)
+        with self._lock:
+            entry = self._entries.get(cache_key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[cache_key]
+                return default
+            self._entries.move_to_end(cache_key)
+            return value
+
+    def set(self, project_id: str, value: Any, key: Hashable = None) -> None:
+        """Guardar un valor para el proyecto"""
+        cache_key = (project_id, key)
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, project_id: str) -> None:
+        """Descartar todas las entradas de un proyecto"""
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == project_id]:
+                del self._entries[cache_key]
+
+    def clear(self) -> None:
+        """Descartar todas las entradas"""
+        with self._lock:
+            self._entries.clear()
+
+
+_registry: List[ProjectCache] = []
+
+
+def invalidate_project(project_id: Optional[str]) -> None:
+    """Invalidar las entradas del proyecto en todas las cachés registradas"""
+    if not project_id:
+        return
+    for cache in _registry:
+        cache.invalidate(project_id)
+
+
+def invalidate_all() -> None:
+    """Vaciar todas las cachés registradas del proceso actual (no las de otros workers)"""
+    for cache in _registry:
+        cache.clear()
@@ -0,0 +1,97 @@
+"""
+Circuit breaker para dependencias externas (Supabase Auth).
+
+Tras `failure_threshold` fallos consecutivos (errores de red, timeouts o 5xx) el
+circuito se abre y las llamadas fallan de inmediato con CircuitOpenError en
+lugar de esperar al servicio caído. Pasados `reset_timeout` segundos se deja
+pasar una llamada de prueba (half_open): si funciona el circuito se cierra y si
+falla vuelve a abrirse. El estado es por proceso y se publica en el gauge
+`circuit_breaker_state` (0 cerrado, 1 half_open, 2 abierto).
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+from app.core.metrics import CIRCUIT_BREAKER_STATE, CIRCUIT_BREAKER_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """La dependencia está marcada como caída y la llamada no se intentó"""
+
+
+class CircuitBreaker:
+    """Contador de fallos consecutivos con apertura temporal"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        CIRCUIT_BREAKER_STATE.labels(name).set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Indicar si la llamada se puede intentar; reserva la llamada de prueba en half_open"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            # Abierto, o half_open con una prueba que no terminó a tiempo:
+            # cada reset_timeout se permite una nueva llamada de prueba
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._opened_at = time.monotonic()
+                self._transition(HALF_OPEN)
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado para /health"""
+        with self._lock:
+            data: Dict[str, Any] = {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+            }
+            if self._state != CLOSED:
+                data["retry_in_seconds"] = round(
+                    max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 1
+                )
+            return data
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        log = logger.warning if state == OPEN else logger.info
+        log("Circuito %s: %s -> %s", self.name, self._state, state)
+        self._state = state
+        CIRCUIT_BREAKER_STATE.labels(self.name).set(_STATE_VALUES[state])
+        CIRCUIT_BREAKER_TRANSITIONS.labels(self.name, state).inc()
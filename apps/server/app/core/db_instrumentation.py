@@ -0,0 +1,166 @@
+"""
+Instrumentación de las consultas SQL por petición.
+
+Los eventos del engine cuentan y cronometran cada sentencia y las acumulan en
+las estadísticas de la petición en curso (una ContextVar, que FastAPI copia al
+threadpool donde corren los endpoints síncronos). Con eso:
+
+- QueryStatsMiddleware agrega los encabezados `Server-Timing` y `X-DB-Queries`
+  a la respuesta fuera de producción.
+- Las sentencias más lentas que SLOW_QUERY_THRESHOLD_MS se registran con el SQL
+  normalizado y la plantilla de la ruta que las ejecutó.
+- assert_query_budget() permite fijar en pruebas un máximo de consultas por
+  endpoint para que las regresiones N+1 fallen en CI.
+"""
+
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql.slow")
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s)(?:\s*,\s*(?:\?|%\(\w+\)s))+\s*\)")
+
+
+def normalize_sql(statement: str) -> str:
+    """SQL en una línea y sin literales, para agrupar sentencias equivalentes en los logs"""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("(?)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryStats:
+    """Consultas ejecutadas durante una petición"""
+
+    __slots__ = ("count", "total_seconds", "scope")
+
+    def __init__(self, scope: Optional[Scope] = None):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.scope = scope
+
+    @property
+    def route(self) -> str:
+        if not self.scope:
+            return "-"
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path", "-")
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Registrar los eventos de conteo y tiempo en el engine"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.total_seconds += elapsed
+
+        if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            logger.warning(
+                "Consulta lenta (%.1f ms) en %s: %s",
+                elapsed * 1000,
+                stats.route if stats is not None else "-",
+                normalize_sql(statement)
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # Mantener la pila de tiempos alineada si la sentencia falló
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
+class QueryStatsMiddleware:
+    """Middleware ASGI: abre las estadísticas de la petición y, fuera de producción, las expone en encabezados"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.expose_headers = settings.ENVIRONMENT != "production"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.expose_headers:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((
+                    b"server-timing",
+                    f'db;desc="{stats.count} queries";dur={stats.total_seconds * 1000:.1f}'.encode()
+                ))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Se ejecutaron más consultas que las permitidas"""
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, engine: Optional[Engine] = None) -> Iterator[List[str]]:
+    """
+    Fallar si el bloque ejecuta más de `max_queries` sentencias en el engine.
+
+    Escucha el engine directamente, así que también cuenta las consultas que el
+    TestClient ejecuta en su propio hilo. Uso en pytest:
+
+        with assert_query_budget(4):
+            client.get(f"/api/boards/lists/{list_id}/cards", headers=auth)
+    """
+    if engine is None:
+        from app.database.db import engine
+
+    statements: List[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(normalize_sql(statement))
+
+    event.listen(engine, "after_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "after_cursor_execute", _record)
+
+    if len(statements) > max_queries:
+        listing = "\n".join(f"  {i + 1}. {sql}" for i, sql in enumerate(statements))
+        raise QueryBudgetExceeded(
+            f"Se ejecutaron {len(statements)} consultas (presupuesto: {max_queries}):\n{listing}"
+        )
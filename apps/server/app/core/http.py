@@ -0,0 +1,66 @@
+"""
+Cliente HTTP compartido para servicios externos (Supabase Auth).
+
+Un único httpx.AsyncClient por proceso mantiene conexiones keep-alive (y
+HTTP/2 si está habilitado), así las validaciones de token reutilizan la
+conexión TLS en lugar de abrir una nueva por llamada. Se abre y se cierra en el
+lifespan de la aplicación; fuera de ella (scripts) se crea en el primer uso.
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    http2 = settings.HTTP_CLIENT_HTTP2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("Paquete h2 no instalado; el cliente HTTP usará HTTP/1.1")
+            http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+            read=settings.HTTP_CLIENT_READ_TIMEOUT,
+            write=settings.HTTP_CLIENT_READ_TIMEOUT,
+            pool=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Cliente compartido del proceso"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def start_http_client() -> None:
+    """Crear el cliente al arrancar la aplicación"""
+    get_http_client()
+    logger.info("Cliente HTTP compartido inicializado")
+
+
+async def close_http_client() -> None:
+    """Cerrar las conexiones abiertas al apagar la aplicación"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
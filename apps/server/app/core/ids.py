@@ -0,0 +1,63 @@
+"""
+Identificadores ordenados por tiempo (UUIDv7, RFC 9562).
+
+Los primeros 48 bits son el instante de creación en milisegundos, por lo que
+los ids se ordenan cronológicamente y los índices B-tree reciben inserciones al
+final en lugar de en posiciones aleatorias.
+"""
+
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def _next_timestamp() -> Tuple[int, int]:
+    """Milisegundo actual y contador de 12 bits para mantener el orden dentro del mismo milisegundo"""
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                # Contador agotado: avanzar al siguiente milisegundo lógico
+                _last_ms += 1
+                _counter = 0
+        return _last_ms, _counter
+
+
+def uuid7(timestamp_ms: Optional[int] = None) -> str:
+    """Generar un UUIDv7 como texto"""
+    if timestamp_ms is None:
+        timestamp_ms, counter = _next_timestamp()
+    else:
+        counter = int.from_bytes(os.urandom(2), "big") & 0xFFF
+    rand_b = int.from_bytes(os.urandom(8), "big") & 0x3FFFFFFFFFFFFFFF
+
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0x2 << 62
+    value |= rand_b
+    return str(uuid.UUID(int=value))
+
+
+def uuid7_datetime(value: str) -> Optional[datetime]:
+    """Instante (UTC, sin zona) codificado en un UUIDv7; None si no es un UUIDv7"""
+    try:
+        parsed = uuid.UUID(value)
+    except (ValueError, AttributeError, TypeError):
+        return None
+    if parsed.version != 7:
+        return None
+    timestamp_ms = parsed.int >> 80
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).replace(tzinfo=None)
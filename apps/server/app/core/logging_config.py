@@ -0,0 +1,141 @@
+"""
+Configuración de logging de la aplicación.
+
+- Los registros se encolan con un QueueHandler y un QueueListener los escribe
+  desde su propio hilo, así el event loop no queda bloqueado por la escritura
+  en stdout.
+- LOG_FORMAT=json produce un objeto JSON por línea (campos `extra` incluidos);
+  LOG_FORMAT=text mantiene el formato legible de desarrollo.
+- LOG_LEVEL fija el nivel raíz y LOG_LEVELS permite ajustar módulos concretos,
+  p. ej. "app.core.auth=DEBUG,sqlalchemy.engine=WARNING".
+- Los eventos DEBUG se muestrean (LOG_DEBUG_SAMPLE_RATE) para que activar el
+  modo detallado en rutas calientes no multiplique el volumen de logs.
+"""
+
+import copy
+import json
+import logging
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Atributos estándar de LogRecord; el resto se considera `extra`
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por registro"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Deja pasar uno de cada N registros DEBUG por punto de llamada; el resto de niveles pasa siempre"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counters: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if not self.every:
+            return False
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            count = self._counters.get(key, 0)
+            self._counters[key] = count + 1
+        if count % self.every:
+            return False
+        if self.every > 1:
+            record.sample_rate = 1 / self.every
+        return True
+
+
+class _RecordQueueHandler(QueueHandler):
+    """
+    Encola el registro con el mensaje ya interpolado pero sin formatear, para
+    que el formateo (JSON incluido) ocurra en el hilo del listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_module_levels(spec: str) -> Dict[str, int]:
+    """Interpretar "modulo=NIVEL,otro=NIVEL"; las entradas inválidas se ignoran"""
+    levels: Dict[str, int] = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        level_no = logging.getLevelName(level.strip().upper())
+        if name.strip() and isinstance(level_no, int):
+            levels[name.strip()] = level_no
+    return levels
+
+
+def setup_logging() -> None:
+    """Configurar el logging raíz; llamar una vez al arrancar la aplicación"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _RecordQueueHandler(log_queue)
+    queue_handler.addFilter(DebugSamplingFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    for name, level in parse_module_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Vaciar la cola y detener el hilo de escritura"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,240 @@
+"""
+Métricas de Prometheus de la aplicación.
+
+Con varios workers de uvicorn/gunicorn se debe definir PROMETHEUS_MULTIPROC_DIR
+(un directorio vacío al arrancar, compartido por los workers) antes de iniciar
+el proceso. En ese modo cada worker escribe sus valores en archivos mmap y
+GET /metrics los agrega, así que cualquier worker que atienda la petición
+devuelve el total correcto.
+"""
+
+import os
+import time
+from typing import Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+MULTIPROCESS_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.getenv("prometheus_multiproc_dir")
+
+# Límites en segundos para latencias de peticiones y dependencias
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Peticiones HTTP
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Peticiones HTTP atendidas",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de las peticiones HTTP por plantilla de ruta",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Peticiones HTTP en curso",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# Pool de conexiones de la base de datos
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Conexiones del pool en uso",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_capacity_connections",
+    "Conexiones máximas del pool (tamaño + overflow)",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Counter(
+    "db_pool_connections_created_total",
+    "Conexiones nuevas abiertas por el pool",
+)
+DB_POOL_INVALIDATIONS = Counter(
+    "db_pool_connections_invalidated_total",
+    "Conexiones del pool invalidadas",
+)
+
+# Supabase Auth
+SUPABASE_VALIDATION_DURATION = Histogram(
+    "supabase_token_validation_seconds",
+    "Latencia de la validación de tokens contra Supabase Auth",
+    buckets=LATENCY_BUCKETS,
+)
+SUPABASE_VALIDATIONS = Counter(
+    "supabase_token_validations_total",
+    "Validaciones de tokens por resultado (valid, invalid, error, cached, unavailable)",
+    ["outcome"],
+)
+
+# Circuit breakers de dependencias externas (app/core/circuit_breaker.py)
+CIRCUIT_BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Estado del circuit breaker (0 cerrado, 1 half_open, 2 abierto)",
+    ["breaker"],
+    multiprocess_mode="livemax",
+)
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    "circuit_breaker_transitions_total",
+    "Cambios de estado del circuit breaker",
+    ["breaker", "state"],
+)
+
+# Mailjet
+MAILJET_SEND_DURATION = Histogram(
+    "mailjet_send_seconds",
+    "Latencia de los envíos a Mailjet",
+    buckets=LATENCY_BUCKETS,
+)
+MAILJET_SENDS = Counter(
+    "mailjet_sends_total",
+    "Envíos a Mailjet por resultado y tipo de notificación",
+    ["outcome", "notification_type"],
+)
+
+EMAIL_QUEUE_DEPTH = Gauge(
+    "email_queue_depth",
+    "Emails de notificación pendientes en la cola del despachador",
+    multiprocess_mode="livesum",
+)
+EMAIL_QUEUE_DROPPED = Counter(
+    "email_queue_dropped_total",
+    "Emails descartados por cola llena o despachador detenido",
+)
+
+# Notificaciones
+NOTIFICATIONS_CREATED = Counter(
+    "notifications_created_total",
+    "Notificaciones creadas por tipo",
+    ["notification_type"],
+)
+NOTIFICATIONS_COALESCED = Counter(
+    "notifications_coalesced_total",
+    "Eventos agrupados en una notificación no leída existente, por tipo",
+    ["notification_type"],
+)
+NOTIFICATIONS_PURGED = Counter(
+    "notifications_purged_total",
+    "Notificaciones borradas por la política de retención (read, unread)",
+    ["state"],
+)
+NOTIFICATION_PURGE_BATCHES = Counter(
+    "notification_purge_batches_total",
+    "Lotes de borrado ejecutados por la tarea de retención",
+)
+NOTIFICATION_PURGE_PENDING = Gauge(
+    "notification_purge_pending",
+    "1 si la última ejecución de la retención terminó por tiempo con filas pendientes",
+    multiprocess_mode="livemax",
+)
+NOTIFICATION_PURGE_LAST_RUN = Gauge(
+    "notification_purge_last_run_timestamp_seconds",
+    "Fin de la última ejecución de la tarea de retención",
+    multiprocess_mode="max",
+)
+DUE_REMINDERS_SENT = Counter(
+    "due_reminders_sent_total",
+    "Recordatorios de vencimiento creados, por umbral (card_due_soon, card_overdue)",
+    ["threshold"],
+)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposición en formato de texto de Prometheus (agregada entre workers si aplica)"""
+    if MULTIPROCESS_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Descartar los gauges 'live' de este worker al terminar"""
+    if MULTIPROCESS_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def instrument_engine(engine) -> None:
+    """Registrar eventos del pool de SQLAlchemy en las métricas"""
+    from sqlalchemy import event
+
+    pool = engine.pool
+    size = getattr(pool, "size", None)
+    overflow = getattr(pool, "_max_overflow", 0)
+    if callable(size):
+        DB_POOL_CAPACITY.inc(size() + max(overflow, 0))
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS.inc()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_INVALIDATIONS.inc()
+
+
+def _route_template(app, scope: Scope) -> Optional[str]:
+    """Plantilla de la ruta atendida (p. ej. /api/boards/{board_id}); None si no hubo coincidencia"""
+    route = scope.get("route")
+    if route is not None and hasattr(route, "path"):
+        return route.path
+    for candidate in getattr(app, "routes", []):
+        match, _ = candidate.matches(scope)
+        if match == Match.FULL:
+            return getattr(candidate, "path", None)
+    return None
+
+
+class PrometheusMiddleware:
+    """Middleware ASGI: latencia por plantilla de ruta, conteo por estado y peticiones en curso"""
+
+    def __init__(self, app: ASGIApp, router_app=None):
+        self.app = app
+        self.router_app = router_app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+        HTTP_IN_PROGRESS.labels(method).inc()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_PROGRESS.labels(method).dec()
+            # Las rutas sin coincidencia se agrupan para no crear series por URL
+            route = _route_template(self.router_app, scope) or "<unmatched>"
+            HTTP_REQUEST_DURATION.labels(method, route).observe(elapsed)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
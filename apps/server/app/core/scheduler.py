@@ -0,0 +1,114 @@
+"""
+Planificador de tareas periódicas en segundo plano.
+
+Cada tarea se ejecuta en un hilo aparte para no bloquear el event loop, con su
+propia sesión de base de datos. Un advisory lock de PostgreSQL garantiza que,
+con varios workers de uvicorn, solo uno ejecute cada tarea a la vez.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from sqlmodel import Session
+from sqlalchemy.sql import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PeriodicJob:
+    """Tarea registrada en el planificador"""
+    name: str
+    interval_seconds: float
+    func: Callable[[Session], object]
+    run_on_start: bool = False
+
+
+class Scheduler:
+    """Ejecuta tareas periódicas registradas mientras la aplicación está activa"""
+
+    def __init__(self):
+        self.jobs: Dict[str, PeriodicJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def register(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[Session], object],
+        run_on_start: bool = False
+    ) -> None:
+        """Registrar una tarea. `func` recibe una sesión síncrona; puede ser async."""
+        self.jobs[name] = PeriodicJob(name, interval_seconds, func, run_on_start)
+
+    async def start(self) -> None:
+        """Lanzar un bucle por tarea registrada"""
+        if not settings.ENABLE_SCHEDULER:
+            logger.info("Planificador de tareas deshabilitado")
+            return
+        for job in self.jobs.values():
+            if job.name not in self._tasks:
+                self._tasks[job.name] = asyncio.create_task(self._loop(job))
+        logger.info(f"Planificador iniciado con {len(self._tasks)} tarea(s)")
+
+    async def stop(self) -> None:
+        """Cancelar los bucles de todas las tareas"""
+        for task in self._tasks.values():
+            task.cancel()
+        for task in self._tasks.values():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks.clear()
+
+    async def run_now(self, name: str) -> Optional[object]:
+        """Ejecutar una tarea inmediatamente (scripts y administración)"""
+        return await asyncio.to_thread(self._run_locked, self.jobs[name])
+
+    async def _loop(self, job: PeriodicJob) -> None:
+        if not job.run_on_start:
+            await asyncio.sleep(job.interval_seconds)
+        while True:
+            try:
+                await asyncio.to_thread(self._run_locked, job)
+            except Exception as e:
+                logger.error(f"Error ejecutando tarea '{job.name}': {e}")
+            await asyncio.sleep(job.interval_seconds)
+
+    def _run_locked(self, job: PeriodicJob) -> Optional[object]:
+        """Ejecutar la tarea si ningún otro worker tiene el lock de la misma"""
+        from app.database.db import engine
+
+        with engine.connect() as lock_conn:
+            acquired = lock_conn.execute(
+                text("SELECT pg_try_advisory_lock(hashtext(:name))"),
+                {"name": f"scheduler:{job.name}"}
+            ).scalar()
+            if not acquired:
+                logger.debug(f"Tarea '{job.name}' en ejecución en otro worker, se omite")
+                return None
+            try:
+                start_time = time.time()
+                with Session(engine) as db:
+                    result = job.func(db)
+                    if inspect.iscoroutine(result):
+                        result = asyncio.run(result)
+                logger.info(f"Tarea '{job.name}' completada en {time.time() - start_time:.2f}s")
+                return result
+            finally:
+                lock_conn.execute(
+                    text("SELECT pg_advisory_unlock(hashtext(:name))"),
+                    {"name": f"scheduler:{job.name}"}
+                )
+                lock_conn.commit()
+
+
+# Instancia global del planificador
+scheduler = Scheduler()
@@ -1,25 +1,85 @@
-from supabase import create_client, Client
 from app.core.config import settings
+from app.core.metrics import SUPABASE_VALIDATION_DURATION, SUPABASE_VALIDATIONS
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.http import get_http_client
+from app.core.token_cache import VerifiedTokenCache
+import asyncio
 import httpx
-from typing import Optional, Dict, Any
+import logging
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any
 import json
 
-# Intentamos importar supabase con manejo de excepciones
-try:
+if TYPE_CHECKING:
+    from supabase import Client
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def get_supabase_client() -> Optional["Client"]:
+    """
+    Cliente de supabase-py, creado en el primer uso.
+
+    Importar supabase-py y construir el cliente es costoso y la mayoría de las
+    rutas solo usan httpx, así que no se hace al importar este módulo.
+    """
     # Verificar que las credenciales están disponibles
     if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
-        print("⚠️ Variables de Supabase no configuradas correctamente.")
-        supabase = None
-    else:
+        logger.warning("Variables de Supabase no configuradas correctamente")
+        return None
+    try:
+        from supabase import create_client
+
         # Crear cliente Supabase (versión 1.0.4)
-        supabase: Optional[Client] = create_client(
-            settings.SUPABASE_URL,
-            settings.SUPABASE_KEY
+        client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        logger.info("Cliente Supabase inicializado con URL: %s", settings.SUPABASE_URL)
+        return client
+    except Exception as e:
+        logger.error("Error al inicializar Supabase: %s", e)
+        return None
+
+class AuthServiceUnavailable(Exception):
+    """Supabase Auth no respondió y el token no está en la caché de tokens verificados"""
+
+# Un fallo de Supabase Auth no debe retener las peticiones: circuito por proceso
+# y caché de tokens verificados para el modo degradado
+auth_breaker = CircuitBreaker(
+    "supabase_auth",
+    failure_threshold=settings.SUPABASE_BREAKER_FAILURES,
+    reset_timeout=settings.SUPABASE_BREAKER_RESET_SECONDS
+)
+verified_tokens = VerifiedTokenCache(
+    max_entries=settings.SUPABASE_TOKEN_CACHE_SIZE,
+    max_age=settings.SUPABASE_TOKEN_CACHE_MAX_AGE
+)
+
+async def _auth_request(method: str, url: str, timeout: Optional[float] = None, **kwargs) -> httpx.Response:
+    """
+    Petición a Supabase Auth con presupuesto de tiempo y circuit breaker.
+
+    Lanza CircuitOpenError sin intentar la llamada si el circuito está abierto.
+    Los errores de red, los timeouts y las respuestas 5xx cuentan como fallos.
+    """
+    if not auth_breaker.allow_request():
+        raise CircuitOpenError("Supabase Auth no disponible (circuito abierto)")
+    
+    budget = timeout if timeout is not None else settings.SUPABASE_AUTH_TIMEOUT
+    client = get_http_client()
+    try:
+        response = await asyncio.wait_for(
+            client.request(method, url, timeout=budget, **kwargs),
+            timeout=budget
         )
-        print(f"✅ Cliente Supabase inicializado correctamente con URL: {settings.SUPABASE_URL}")
-except Exception as e:
-    print(f"Error al inicializar Supabase: {e}")
-    supabase = None
+    except (httpx.HTTPError, asyncio.TimeoutError):
+        auth_breaker.record_failure()
+        raise
+    
+    if response.status_code >= 500:
+        auth_breaker.record_failure()
+    else:
+        auth_breaker.record_success()
+    return response
 
 async def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
     """Obtiene un usuario de Supabase por su ID"""
@@ -32,20 +92,48 @@ async def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            print(f"Respuesta de get_user_by_id: Código {response.status_code}")
+        response = await _auth_request("GET", url, headers=headers)
+        logger.debug("get_user_by_id: código %s", response.status_code)
             
-            if response.status_code == 200:
-                return response.json()
-            print(f"Error en get_user_by_id: {response.status_code} - {response.text}")
-            return None
+        if response.status_code == 200:
+            return response.json()
+        logger.warning("Error en get_user_by_id: %s - %s", response.status_code, response.text)
+        return None
     except Exception as e:
-        print(f"Error en get_user_by_id: {e}")
+        logger.error("Error en get_user_by_id: %s", e)
         return None
 
+async def sign_in_with_password(email: str, password: str) -> httpx.Response:
+    """
+    Login con email y contraseña (grant_type=password) en un solo intento.
+
+    Devuelve la respuesta de GoTrue para que el router traduzca los códigos;
+    lanza asyncio.TimeoutError si se agota SUPABASE_LOGIN_TIMEOUT,
+    httpx.HTTPError si no hay conexión y CircuitOpenError si el circuito está
+    abierto.
+    """
+    url = f"{settings.SUPABASE_URL}/auth/v1/token?grant_type=password"
+    headers = {
+        "apikey": settings.SUPABASE_KEY,
+        "Content-Type": "application/json"
+    }
+    payload = {
+        "email": email,
+        "password": password
+    }
+    
+    return await _auth_request(
+        "POST", url, headers=headers, json=payload, timeout=settings.SUPABASE_LOGIN_TIMEOUT
+    )
+
 async def validate_jwt_token(token: str) -> Optional[Dict[str, Any]]:
-    """Valida un token JWT de Supabase"""
+    """
+    Valida un token JWT de Supabase.
+
+    Devuelve None si Supabase rechaza el token. Si Supabase no responde o el
+    circuito está abierto, acepta el token desde la caché de tokens verificados
+    hasta su `exp`; si no está en caché lanza AuthServiceUnavailable.
+    """
     # Usar httpx directamente
     url = f"{settings.SUPABASE_URL}/auth/v1/user"
     headers = {
@@ -54,25 +142,55 @@ async def validate_jwt_token(token: str) -> Optional[Dict[str, Any]]:
         "Content-Type": "application/json"
     }
     
+    start = time.perf_counter()
+    outcome = "error"
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            print(f"Respuesta de validate_jwt_token: Código {response.status_code}")
-            
-            if response.status_code == 200:
-                user_data = response.json()
-                # Formatear en un formato consistente para nuestro código
-                return {
-                    "data": {
-                        "user": user_data
-                    }
+        try:
+            response = await _auth_request("GET", url, headers=headers)
+        except (CircuitOpenError, httpx.HTTPError, asyncio.TimeoutError) as e:
+            response = None
+            failure = e
+        
+        if response is None or response.status_code >= 500:
+            # Modo degradado: aceptar tokens verificados recientemente
+            cached = verified_tokens.get(token)
+            if cached is not None:
+                outcome = "cached"
+                return cached
+            outcome = "unavailable"
+            if response is not None:
+                reason = f"código {response.status_code}"
+            else:
+                reason = str(failure) or type(failure).__name__
+            logger.warning("Supabase Auth no disponible para validar el token: %s", reason)
+            raise AuthServiceUnavailable(reason)
+        
+        logger.debug("validate_jwt_token: código %s", response.status_code)
+        if response.status_code == 200:
+            outcome = "valid"
+            user_data = response.json()
+            # Formatear en un formato consistente para nuestro código
+            user_response = {
+                "data": {
+                    "user": user_data
                 }
+            }
+            verified_tokens.set(token, user_response)
+            return user_response
             
-            print(f"Error en validate_jwt_token: {response.status_code} - {response.text}")
-            return None
+        if response.status_code in (401, 403):
+            outcome = "invalid"
+            verified_tokens.discard(token)
+        logger.info("Token rechazado por Supabase: código %s", response.status_code)
+        return None
+    except AuthServiceUnavailable:
+        raise
     except Exception as e:
-        print(f"Error en validate_jwt_token: {e}")
+        logger.error("Error en validate_jwt_token: %s", e)
         return None
+    finally:
+        SUPABASE_VALIDATION_DURATION.observe(time.perf_counter() - start)
+        SUPABASE_VALIDATIONS.labels(outcome).inc()
 
 async def update_user_metadata(user_id: str, metadata: Dict[str, Any]) -> Optional[dict]:
     """Actualiza los metadatos de un usuario en Supabase Auth"""
@@ -88,17 +206,16 @@ async def update_user_metadata(user_id: str, metadata: Dict[str, Any]) -> Option
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.put(url, headers=headers, json=payload)
-            print(f"Respuesta de update_user_metadata: Código {response.status_code}")
+        response = await _auth_request("PUT", url, headers=headers, json=payload)
+        logger.debug("update_user_metadata: código %s", response.status_code)
             
-            if response.status_code == 200:
-                return response.json()
+        if response.status_code == 200:
+            return response.json()
             
-            print(f"Error en update_user_metadata: {response.status_code} - {response.text}")
-            return None
+        logger.warning("Error en update_user_metadata: %s - %s", response.status_code, response.text)
+        return None
     except Exception as e:
-        print(f"Error en update_user_metadata: {e}")
+        logger.error("Error en update_user_metadata: %s", e)
         return None
 
 async def create_user(email: str, password: str, user_metadata: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
@@ -121,17 +238,16 @@ async def create_user(email: str, password: str, user_metadata: Dict[str, Any] =
         payload["user_metadata"] = user_metadata
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload)
-            print(f"Respuesta de create_user: Código {response.status_code}")
+        response = await _auth_request("POST", url, headers=headers, json=payload)
+        logger.debug("create_user: código %s", response.status_code)
             
-            if response.status_code == 200 or response.status_code == 201:
-                return response.json()
+        if response.status_code == 200 or response.status_code == 201:
+            return response.json()
             
-            print(f"Error en create_user: {response.status_code} - {response.text}")
-            return None
+        logger.warning("Error en create_user: %s - %s", response.status_code, response.text)
+        return None
     except Exception as e:
-        print(f"Error en create_user: {e}")
+        logger.error("Error en create_user: %s", e)
         return None
 
 def sign_up_with_email_password(email: str, password: str, user_metadata: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
@@ -139,8 +255,9 @@ def sign_up_with_email_password(email: str, password: str, user_metadata: Dict[s
     Registra un nuevo usuario usando el cliente de Supabase 
     (para uso directo en endpoints sin async)
     """
+    supabase = get_supabase_client()
     if not supabase:
-        print("⚠️ Cliente Supabase no disponible")
+        logger.warning("Cliente Supabase no disponible")
         return None
         
     try:
@@ -153,8 +270,8 @@ def sign_up_with_email_password(email: str, password: str, user_metadata: Dict[s
             } if user_metadata else {}
         })
         
-        print(f"Respuesta de sign_up: {signup_data}")
+        logger.debug("sign_up completado para %s", email)
         return signup_data
     except Exception as e:
-        print(f"Error en sign_up_with_email_password: {e}")
+        logger.error("Error en sign_up_with_email_password: %s", e)
         return None 
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Caché de tokens verificados por Supabase Auth.
+
+Solo se consulta en modo degradado (circuito abierto o Supabase sin responder):
+un token que Supabase aceptó hace poco se sigue aceptando hasta su `exp`, y
+nunca más de `max_age` segundos después de la última verificación. La caché es
+LRU y acotada, y se indexa por el hash del token para no retener los tokens.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """Claim `exp` del JWT (epoch en segundos) sin verificar la firma; None si no se puede leer"""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + "=" * (-len(parts[1]) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload.encode())).get("exp")
+        return float(exp) if exp is not None else None
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+class VerifiedTokenCache:
+    """LRU de respuestas de validación con expiración por token"""
+
+    def __init__(self, max_entries: int = 10000, max_age: float = 900.0):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def set(self, token: str, user_response: Dict[str, Any]) -> None:
+        """Registrar una validación exitosa"""
+        expires_at = time.time() + self.max_age
+        exp = token_expiry(token)
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        if expires_at <= time.time():
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, user_response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Respuesta guardada si el token sigue vigente"""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user_response = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user_response
+
+    def discard(self, token: str) -> None:
+        """Olvidar un token que Supabase rechazó"""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
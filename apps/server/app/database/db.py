@@ -2,6 +2,8 @@ from sqlmodel import SQLModel, create_engine, Session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.core.db_instrumentation import instrument_queries
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,10 +15,14 @@ sync_database_url = settings.DATABASE_URL.replace(
 
 engine = create_engine(
     sync_database_url,
-    echo=settings.DEBUG,  # Mostrar consultas SQL en consola si estamos en modo debug
+    echo=settings.SQL_ECHO,  # Mostrar consultas SQL en consola (solo para depurar)
     pool_pre_ping=True    # Comprobar la conexión antes de usarla
 )
 
+# Métricas del pool de conexiones (GET /metrics) y conteo de consultas por petición
+instrument_engine(engine)
+instrument_queries(engine)
+
 # Engine para operaciones asíncronas (API)
 # Asegurar que use asyncpg para conexiones asíncronas
 async_database_url = settings.DATABASE_URL
@@ -26,7 +32,7 @@ if not async_database_url.startswith('postgresql+asyncpg://'):
 
 async_engine = create_async_engine(
     async_database_url,
-    echo=True,
+    echo=settings.SQL_ECHO,
     future=True
 )
 
@@ -0,0 +1,116 @@
+"""
+Versión del esquema de la base de datos.
+
+Las migraciones idempotentes de migrations/*.py se aplican en el orden de
+MIGRATIONS con `python scripts/migrate.py --apply`, que registra la versión
+alcanzada en la tabla `schema_version`. Al arrancar, la aplicación solo compara
+esa marca con SCHEMA_VERSION (una consulta) en lugar de ejecutar create_all y
+revisar information_schema en cada worker.
+
+Para agregar una migración: crear el script en migrations/ con una función
+`run_migration()` que devuelva True/False y añadirlo al final de MIGRATIONS.
+"""
+
+import importlib
+import logging
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# (módulo en migrations/, función a ejecutar); el orden define la versión
+MIGRATIONS: List[Tuple[str, str]] = [
+    ("add_creator_id", "add_creator_id_column"),
+    ("add_notifications_table", "run_migration"),
+    ("add_email_notifications_column", "run_migration"),
+    ("add_comments_table", "run_migration"),
+    ("combined_migration", "run_migration"),
+    ("add_card_events_table", "run_migration"),
+    ("partition_project_activities", "run_migration"),
+    ("add_search_vectors", "run_migration"),
+    ("add_user_trigram_indexes", "run_migration"),
+    ("add_notification_coalesce_index", "run_migration"),
+    ("convert_notification_data_jsonb", "run_migration"),
+    ("add_notification_retention_index", "run_migration"),
+    ("add_card_due_reminders", "run_migration"),
+    ("add_user_prefix_indexes", "run_migration"),
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(engine: Engine) -> Optional[int]:
+    """Versión registrada, o None si la base de datos aún no tiene la marca"""
+    with engine.connect() as conn:
+        exists = conn.execute(text("SELECT to_regclass('public.schema_version')")).scalar()
+        if not exists:
+            return None
+        return conn.execute(text("SELECT version FROM schema_version WHERE id = 1")).scalar()
+
+
+def _set_schema_version(engine: Engine, version: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO schema_version (id, version, applied_at)
+            VALUES (1, :version, NOW())
+            ON CONFLICT (id) DO UPDATE SET version = EXCLUDED.version, applied_at = EXCLUDED.applied_at
+        """), {"version": version})
+
+
+def _create_base_schema(engine: Engine) -> None:
+    """Tablas de los modelos, columna role y tabla de la marca (antes se hacía en cada arranque)"""
+    import app.models  # noqa: F401 - registra los modelos en SQLModel.metadata
+    from app.database.db import create_db_and_tables
+
+    create_db_and_tables()
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE user_profiles ADD COLUMN IF NOT EXISTS role VARCHAR(50) DEFAULT 'member'"))
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            )
+        """))
+
+
+def _load_migration(module_name: str, function_name: str) -> Callable[[], Optional[bool]]:
+    module = importlib.import_module(f"migrations.{module_name}")
+    return getattr(module, function_name)
+
+
+def apply_migrations(engine: Engine, bootstrap: bool = False) -> bool:
+    """
+    Aplicar las migraciones pendientes y actualizar la marca tras cada una.
+
+    Sin marca (base nueva o anterior al versionado) o con `bootstrap`, se crea
+    el esquema base y se ejecutan todas; como los scripts son idempotentes, es
+    seguro sobre una base ya migrada a mano.
+    """
+    current = None if bootstrap else get_schema_version(engine)
+    if current is None:
+        logger.info("Creando el esquema base...")
+        _create_base_schema(engine)
+        current = 0
+
+    if current > SCHEMA_VERSION:
+        logger.error(f"La base de datos está en la versión {current}, más nueva que el código ({SCHEMA_VERSION})")
+        return False
+
+    for version, (module_name, function_name) in enumerate(MIGRATIONS[current:], start=current + 1):
+        logger.info(f"Aplicando migración {version}: {module_name}")
+        try:
+            result = _load_migration(module_name, function_name)()
+        except Exception as e:
+            logger.error(f"Migración {module_name} falló: {e}")
+            return False
+        # Los scripts antiguos no devuelven nada; solo False indica fallo
+        if result is False:
+            logger.error(f"Migración {module_name} falló; el esquema queda en la versión {version - 1}")
+            return False
+        _set_schema_version(engine, version)
+
+    logger.info(f"Esquema en la versión {SCHEMA_VERSION}")
+    return True
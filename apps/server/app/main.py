@@ -1,23 +1,101 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from sqlmodel import SQLModel
 from typing import List
 import os
 import subprocess
 import logging
-from sqlalchemy import text
 
 from app.core.config import settings
-from app.database.db import create_db_and_tables
+from app.core.http import close_http_client, start_http_client
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.metrics import PrometheusMiddleware, mark_process_dead, render_metrics
+from app.core.db_instrumentation import QueryStatsMiddleware
+from app.core.scheduler import scheduler
+from app.core.supabase import auth_breaker
+from app.database.db import engine
+from app.database.schema import SCHEMA_VERSION, get_schema_version
+from app.services.email_dispatcher import email_dispatcher
 from app.services.email_service import email_service
+from app.services.due_reminders import send_due_reminders_job
+from app.services.email_templates import email_templates
+from app.services.notification_retention import purge_notifications_job
+from app.services.sprint_metrics import snapshot_sprint_metrics_job
+from app.services.activity import activity_recorder, ensure_activity_partitions_job
 
-# Configuración de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+# Configuración de logging (cola + hilo de escritura, ver app/core/logging_config.py)
+setup_logging()
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Iniciando servidor...")
+    
+    # Solo se compara la marca de versión; el DDL se aplica con scripts/migrate.py --apply
+    try:
+        schema_version = get_schema_version(engine)
+        if schema_version == SCHEMA_VERSION:
+            logger.info(f"Esquema de la base de datos en la versión {schema_version}")
+        else:
+            logger.error(
+                f"El esquema está en la versión {schema_version} y el código espera la {SCHEMA_VERSION}; "
+                "ejecuta `python scripts/migrate.py --apply`"
+            )
+    except Exception as e:
+        logger.error(f"No se pudo verificar la versión del esquema: {str(e)}")
+    
+    # Cliente HTTP compartido (keep-alive) para Supabase Auth
+    await start_http_client()
+    
+    # Compilar las plantillas de email una sola vez
+    if email_service.enabled:
+        try:
+            email_templates.load()
+        except Exception as e:
+            logger.error(f"No se pudieron compilar las plantillas de email: {str(e)}")
+    
+    # Tareas periódicas en segundo plano
+    scheduler.register(
+        "sprint_metrics_snapshot",
+        settings.SPRINT_METRICS_INTERVAL_SECONDS,
+        snapshot_sprint_metrics_job,
+        run_on_start=True
+    )
+    # Particiones mensuales de project_activities con meses de anticipación
+    scheduler.register(
+        "activity_partitions",
+        24 * 3600,
+        ensure_activity_partitions_job,
+        run_on_start=True
+    )
+    # Retención de notificaciones (borrado por lotes)
+    scheduler.register(
+        "notification_retention",
+        settings.NOTIFICATION_PURGE_INTERVAL_SECONDS,
+        purge_notifications_job
+    )
+    # Recordatorios de tarjetas por vencer y vencidas
+    scheduler.register(
+        "due_reminders",
+        settings.DUE_REMINDER_INTERVAL_SECONDS,
+        send_due_reminders_job
+    )
+    await scheduler.start()
+    activity_recorder.start()
+    await email_dispatcher.start()
+    
+    yield
+    
+    await scheduler.stop()
+    # Escribir las actividades pendientes antes de salir
+    activity_recorder.stop()
+    # Enviar los emails encolados antes de cerrar el cliente HTTP
+    await email_dispatcher.stop()
+    await close_http_client()
+    mark_process_dead()
+    shutdown_logging()
+
 # Crear aplicación FastAPI
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -26,6 +104,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configuración de Apitally (solo si está habilitado y configurado)
@@ -63,12 +142,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["Content-Type", "Authorization"],
+    expose_headers=["Content-Type", "Authorization", "X-DB-Queries", "Server-Timing"],
     max_age=600,  # Preflight cache time in seconds
 )
 
+# Conteo y tiempo de consultas SQL por petición (Server-Timing / X-DB-Queries fuera de producción)
+app.add_middleware(QueryStatsMiddleware)
+
+# Métricas de Prometheus por plantilla de ruta (se agrega al final para medir
+# también el tiempo de CORS y del resto de middlewares)
+app.add_middleware(PrometheusMiddleware, router_app=app.router)
+
 # Importar routers
-from app.routers import users, auth, boards, projects, notifications, project_lifecycle, sprints
+from app.routers import users, auth, boards, projects, notifications, project_lifecycle, sprints, analytics, search
 
 # Incluir routers en la aplicación
 app.include_router(users.router, prefix=settings.API_PREFIX)
@@ -78,30 +164,8 @@ app.include_router(projects.router, prefix=settings.API_PREFIX)
 app.include_router(project_lifecycle.router, prefix=settings.API_PREFIX)
 app.include_router(notifications.router, prefix=settings.API_PREFIX)
 app.include_router(sprints.router, prefix=settings.API_PREFIX)
-
-@app.on_event("startup")
-async def on_startup():
-    logger.info("Iniciando servidor...")
-    logger.info("Creando tablas si no existen...")
-    create_db_and_tables()
-    logger.info("Operación de creación de tablas completada")
-    
-    # Ejecutar SQL directo para asegurar que user_profiles tiene la columna role
-    try:
-        from app.database.db import engine
-        with engine.connect() as conn:
-            # Verificar si la columna role existe
-            result = conn.execute(text("SELECT column_name FROM information_schema.columns WHERE table_name='user_profiles' AND column_name='role'"))
-            if result.rowcount == 0:
-                # La columna role no existe, agregarla
-                logger.info("Agregando columna 'role' a la tabla user_profiles...")
-                conn.execute(text("ALTER TABLE user_profiles ADD COLUMN IF NOT EXISTS role VARCHAR(50) DEFAULT 'member'"))
-                conn.commit()
-                logger.info("Columna 'role' agregada correctamente")
-            else:
-                logger.info("La columna 'role' ya existe en la tabla user_profiles")
-    except Exception as e:
-        logger.error(f"Error actualizando el esquema de la base de datos: {str(e)}")
+app.include_router(analytics.router, prefix=settings.API_PREFIX)
+app.include_router(search.router, prefix=settings.API_PREFIX)
 
 @app.get("/")
 async def root():
@@ -115,7 +179,19 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": settings.PROJECT_VERSION}
+    # El proceso sigue atendiendo con Supabase Auth caído (modo degradado)
+    supabase_auth = auth_breaker.snapshot()
+    return {
+        "status": "healthy" if supabase_auth["state"] == "closed" else "degraded",
+        "version": settings.PROJECT_VERSION,
+        "supabase_auth": supabase_auth,
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Métricas en formato de exposición de Prometheus"""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
 
 @app.get("/metrics/email")
 async def email_metrics():
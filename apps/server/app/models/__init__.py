@@ -4,7 +4,7 @@ from app.models.project import Project, ProjectMember
 from app.models.agile import (
     UserStory, Sprint, SprintBacklogItem, SprintMetric,
     Board, List, Card, Task, Comment, Label, CardLabel,
-    Notification
+    Notification, CardEvent
 )
 
 # Para crear todas las tablas
@@ -24,5 +24,6 @@ __all__ = [
     'Comment',
     'Label',
     'CardLabel',
-    'Notification'
+    'Notification',
+    'CardEvent'
 ] 
\ No newline at end of file
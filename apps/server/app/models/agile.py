@@ -2,6 +2,8 @@ from __future__ import annotations
 from sqlmodel import Field, SQLModel, Relationship
 from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from datetime import datetime
+from sqlalchemy import Column, BigInteger, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 # Usar TYPE_CHECKING para evitar importaciones circulares
@@ -171,8 +173,32 @@ class Notification(BaseModel, table=True):
     content: str
     type: str  # card_assigned, card_comment, etc.
     entity_id: str  # ID de la entidad relacionada (card, board, etc.)
-    data: Optional[str] = None  # JSON string con datos adicionales
+    data: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSONB))  # Datos adicionales (card_id, board_id, ...)
     read: bool = False
     
     # Relaciones
-    user = Relationship(sa_relationship=relationship("UserProfile")) 
\ No newline at end of file
+    user = Relationship(sa_relationship=relationship("UserProfile"))
+
+class CardEvent(SQLModel, table=True):
+    """
+    Evento de tarjeta: creación, movimiento entre listas o asignación.
+
+    Registro de solo inserción; se escribe en la misma transacción que el cambio
+    de la tarjeta. No tiene claves foráneas para conservar el historial aunque
+    se eliminen tarjetas o listas.
+    """
+    __tablename__ = "card_events"
+    __table_args__ = (
+        Index("idx_card_events_board_ts", "board_id", "ts"),
+        Index("idx_card_events_card_ts", "card_id", "ts"),
+    )
+    
+    id: Optional[int] = Field(default=None, sa_column=Column(BigInteger, primary_key=True, autoincrement=True))
+    card_id: str
+    board_id: str
+    event_type: str  # created, moved, assigned, deleted
+    from_list_id: Optional[str] = None
+    to_list_id: Optional[str] = None
+    assignee_id: Optional[str] = None
+    actor_id: Optional[str] = None
+    ts: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,44 @@
+"""
+Endpoints de analíticas de proyecto para los gráficos del frontend
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+from app.database.db import get_db
+from app.core.auth import get_current_user, AuthUser
+from app.routers.project_lifecycle import _get_user_id, _check_project_access
+from app.services.analytics import ProjectAnalyticsService
+from app.services.forecast import MAX_TRIALS, ForecastService
+
+router = APIRouter(
+    prefix="/projects",
+    tags=["analytics"],
+    responses={404: {"description": "No encontrado"}},
+)
+
+@router.get("/{project_id}/analytics")
+async def get_project_analytics(
+    project_id: str,
+    days: int = Query(90, ge=7, le=3650, description="Días del diagrama de flujo acumulado"),
+    velocity_sprints: int = Query(12, ge=1, le=100, description="Sprints en la tendencia de velocidad"),
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Burndown, tendencia de velocidad y flujo acumulado por lista del proyecto"""
+    user_id = await _get_user_id(current_user, db)
+    await _check_project_access(project_id, user_id, db)
+
+    return ProjectAnalyticsService(db).get_analytics(project_id, days, velocity_sprints)
+
+@router.get("/{project_id}/forecast")
+async def get_project_forecast(
+    project_id: str,
+    trials: int = Query(MAX_TRIALS, ge=1000, le=MAX_TRIALS, description="Escenarios a simular"),
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Pronóstico Monte Carlo de la fecha de finalización del backlog restante"""
+    user_id = await _get_user_id(current_user, db)
+    await _check_project_access(project_id, user_id, db)
+
+    return ForecastService(db).get_forecast(project_id, trials)
@@ -4,12 +4,18 @@ from sqlalchemy import text
 from app.database.db import get_db
 from app.models.user import UserProfile
 from app.core.auth import get_current_user, AuthUser
-from app.core.supabase import create_user, sign_up_with_email_password, supabase, update_user_metadata
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+from app.core.supabase import create_user, sign_in_with_password, sign_up_with_email_password, update_user_metadata
 from pydantic import BaseModel
-import uuid
+import asyncio
 import httpx
+import uuid
+import logging
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/auth",
     tags=["auth"],
@@ -53,79 +59,50 @@ async def login(
     login_data: LoginRequest,
 ):
     """Inicia sesión con email y contraseña"""
+    # Un solo intento asíncrono contra GoTrue con el cliente compartido; el
+    # presupuesto de tiempo evita que un Supabase lento retenga la petición
     try:
-        # Verificar si tenemos acceso directo a Supabase
-        if supabase:
-            try:
-                # Intentar login con el cliente Supabase
-                print(f"Intentando login con Supabase: {login_data.email}")
-                login_response = supabase.auth.sign_in_with_password({
-                    "email": login_data.email,
-                    "password": login_data.password
-                })
-                
-                # Extraer token de la respuesta
-                if hasattr(login_response, 'session') and login_response.session:
-                    print(f"Login exitoso con cliente Supabase para {login_data.email}")
-                    return TokenResponse(
-                        access_token=login_response.session.access_token,
-                        token_type="bearer"
-                    )
-                else:
-                    print(f"Respuesta de login sin sesión: {login_response}")
-            except Exception as e:
-                print(f"Error en login con cliente Supabase: {e}")
-        
-        # Si el cliente no está disponible o falló, usar httpx directamente
-        print("Intentando login directo con la API REST de Supabase")
-        url = f"{supabase.supabase_url}/auth/v1/token?grant_type=password"
-        headers = {
-            "apikey": supabase.supabase_key,
-            "Content-Type": "application/json"
-        }
-        payload = {
-            "email": login_data.email,
-            "password": login_data.password
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload)
-            print(f"Respuesta de login directo: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                return TokenResponse(
-                    access_token=data.get("access_token"),
-                    token_type="bearer"
-                )
-            
-            # Manejar errores comunes
-            if response.status_code == 400:
-                print(f"Error de autenticación: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Credenciales inválidas"
-                )
-            elif response.status_code == 422:
-                print(f"Error en formato de datos: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                    detail="Formato de datos inválido"
-                )
-            else:
-                print(f"Error inesperado en login: {response.status_code} - {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Error en el servidor de autenticación"
-                )
+        response = await sign_in_with_password(login_data.email, login_data.password)
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+        logger.warning("Login de %s excedió %ss", login_data.email, settings.SUPABASE_LOGIN_TIMEOUT)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="El servidor de autenticación no respondió a tiempo"
+        )
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        logger.error("Supabase Auth no disponible en login: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor de autenticación no disponible"
+        )
     
-    except HTTPException as e:
-        raise e
-    except Exception as e:
-        print(f"Error inesperado en login: {str(e)}")
+    logger.debug("Login: código %s", response.status_code)
+    if response.status_code == 200:
+        data = response.json()
+        logger.info("Login exitoso para %s", login_data.email)
+        return TokenResponse(
+            access_token=data.get("access_token"),
+            token_type="bearer"
+        )
+    
+    # Manejar errores comunes
+    if response.status_code == 400:
+        logger.info("Credenciales inválidas para %s", login_data.email)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Credenciales inválidas"
+        )
+    elif response.status_code == 422:
+        logger.warning("Error en formato de datos de login: %s", response.text)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Formato de datos inválido"
+        )
+    else:
+        logger.error("Error inesperado en login: %s - %s", response.status_code, response.text)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al iniciar sesión: {str(e)}"
+            detail="Error en el servidor de autenticación"
         )
 
 @router.post("/register", response_model=RegisterResponse)
@@ -152,7 +129,7 @@ async def register_user(
         }
         
         # Intentar crear el usuario en Supabase Auth
-        print(f"Intentando crear usuario en Supabase: {user_data.email}")
+        logger.info("Creando usuario en Supabase: %s", user_data.email)
         
         # Primero intentar con el método admin (asíncrono)
         auth_user = await create_user(
@@ -163,7 +140,7 @@ async def register_user(
         
         # Si falla, intentar con el método de registro normal
         if not auth_user:
-            print("Intentando crear usuario con sign_up...")
+            logger.info("Creación admin fallida, intentando con sign_up")
             auth_user = sign_up_with_email_password(
                 email=user_data.email,
                 password=user_data.password,
@@ -177,7 +154,7 @@ async def register_user(
                 detail="Error al crear usuario en Supabase Auth"
             )
         
-        print(f"Usuario creado en Supabase: {auth_user}")
+        logger.debug("Usuario creado en Supabase: %s", user_data.email)
         
         # Extraer ID de Supabase de la respuesta
         auth_user_id = None
@@ -201,7 +178,7 @@ async def register_user(
         
         # Si no se pudo obtener el ID, usar un UUID como fallback
         if not auth_user_id:
-            print("⚠️ No se pudo obtener ID de Supabase, usando UUID como fallback")
+            logger.warning("No se pudo obtener ID de Supabase, usando UUID como fallback")
             auth_user_id = str(uuid.uuid4())
         
         # Generar ID para el perfil en nuestra base de datos
@@ -282,15 +259,15 @@ async def register_user(
                                 "role": user_data.role
                             })
                             
-                            print(f"✅ Usuario {user_data.email} ({user_data.role}) asignado automáticamente al proyecto '{project_name}'")
+                            logger.info("Usuario %s (%s) asignado automáticamente al proyecto '%s'", user_data.email, user_data.role, project_name)
                     
                     if projects:
-                        print(f"🎯 Total de proyectos asignados automáticamente: {len(projects)}")
+                        logger.info("Total de proyectos asignados automáticamente: %s", len(projects))
                     else:
-                        print(f"ℹ️ No hay proyectos disponibles para asignar al usuario {user_data.email}")
+                        logger.info("No hay proyectos disponibles para asignar al usuario %s", user_data.email)
                         
             except Exception as e:
-                print(f"⚠️ Error al asignar proyectos automáticamente: {str(e)}")
+                logger.warning("Error al asignar proyectos automáticamente: %s", e)
                 # No fallar la creación del usuario por este error
         
         db.commit()
@@ -307,7 +284,7 @@ async def register_user(
         # Re-lanzar excepciones HTTP
         raise e
     except Exception as e:
-        print(f"Error inesperado al registrar usuario: {str(e)}")
+        logger.exception("Error inesperado al registrar usuario: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al registrar usuario: {str(e)}"
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlmodel import Session, select
 from app.database.db import get_db
 from app.models.agile import Board, List, Card
 from app.models.project import Project, ProjectMember
 from app.models.user import UserProfile
 from app.core.auth import get_current_user, AuthUser
+from app.core.cache import invalidate_project
+from app.core.config import settings
 from app.routers.notifications import create_notification
+from app.services.card_events import record_card_event, FlowMetricsService
+from app.services.sprint_summary import SprintSummaryService
+from app.services.activity import record_activity
 from typing import List as TypeList, Optional
 from pydantic import BaseModel
 from sqlalchemy.sql import text
@@ -109,6 +114,15 @@ class UserResponse(BaseModel):
     role: str
     avatar: Optional[str] = None
 
+def get_local_user_id(current_user: AuthUser, db: Session) -> Optional[str]:
+    """Obtener el ID local (user_profiles) del usuario autenticado"""
+    user_query = text("""
+        SELECT id FROM user_profiles 
+        WHERE auth_id = :auth_id OR email = :email
+        LIMIT 1
+    """)
+    return db.execute(user_query, {"auth_id": current_user.id, "email": current_user.email}).scalar()
+
 async def is_product_owner_or_admin(
     project_id: str,
     current_user: AuthUser,
@@ -239,6 +253,13 @@ async def create_board(
         "project_id": board_data.project_id
     })
     
+    local_user_id = get_local_user_id(current_user, db)
+    if local_user_id:
+        record_activity(
+            db, board_data.project_id, local_user_id, "board_created",
+            f"Tablero '{board_data.name}' creado", {"board_id": board_id}
+        )
+    
     # Crear listas por defecto según el template o usar secciones personalizadas
     # Priorizar secciones personalizadas sobre template
     if board_data.sections and len(board_data.sections) > 0:
@@ -493,7 +514,8 @@ async def create_board_list(
     create_list_query = text("""
         INSERT INTO lists (id, name, board_id, position, created_at, updated_at, is_active)
         VALUES (:id, :name, :board_id, :position, NOW(), NOW(), true)
-        RETURNING id, name, board_id, position, created_at
+        RETURNING id, name, board_id, position, created_at,
+                  (SELECT project_id FROM boards WHERE id = :board_id)
     """)
     
     result = db.execute(create_list_query, {
@@ -502,10 +524,11 @@ async def create_board_list(
         "board_id": board_id,
         "position": position
     })
+    list_record = result.fetchone()
     
     db.commit()
-    
-    list_record = result.fetchone()
+    # Las listas forman parte del flujo acumulado y de las analíticas del proyecto
+    invalidate_project(list_record[5])
     
     return {
         "id": list_record[0],
@@ -551,9 +574,12 @@ async def get_list_cards(
         )
     
     # Obtener tarjetas ordenadas por posición con información del asignado
+    # (una sola consulta en lugar de una por tarjeta asignada)
     cards_query = text("""
-        SELECT c.id, c.title, c.description, c.list_id, c.position, c.due_date, c.created_at, c.updated_at, c.cover_color, c.assignee_id
+        SELECT c.id, c.title, c.description, c.list_id, c.position, c.due_date, c.created_at, c.updated_at, c.cover_color, c.assignee_id,
+               up.email, up.first_name, up.last_name
         FROM cards c
+        LEFT JOIN user_profiles up ON up.id = c.assignee_id
         WHERE c.list_id = :list_id
         ORDER BY c.position ASC
     """)
@@ -562,23 +588,11 @@ async def get_list_cards(
     
     cards = []
     for row in result:
-        # Obtener datos del usuario asignado si existe
         assignee_id = row[9]
+        assignee_email = row[10]
         assignee_name = None
-        assignee_email = None
-        
-        if assignee_id:
-            assignee_query = text("""
-                SELECT email, first_name, last_name 
-                FROM user_profiles 
-                WHERE id = :assignee_id
-            """)
-            assignee_result = db.execute(assignee_query, {"assignee_id": assignee_id})
-            assignee_record = assignee_result.fetchone()
-            
-            if assignee_record:
-                assignee_email = assignee_record[0]
-                assignee_name = f"{assignee_record[1]} {assignee_record[2]}".strip() if assignee_record[1] else assignee_email
+        if assignee_email:
+            assignee_name = f"{row[11]} {row[12]}".strip() if row[11] else assignee_email
         
         card = {
             "id": row[0],
@@ -609,8 +623,9 @@ async def create_card(
     
     # Verificar que la lista existe y el usuario tiene acceso al tablero
     list_query = text("""
-        SELECT l.board_id
+        SELECT l.board_id, b.project_id
         FROM lists l
+        JOIN boards b ON l.board_id = b.id
         WHERE l.id = :list_id
     """)
     
@@ -624,6 +639,7 @@ async def create_card(
         )
     
     board_id = list_record[0]
+    project_id = list_record[1]
     
     # Verificar acceso al tablero
     board_exists = await is_board_accessible(board_id, current_user, db)
@@ -740,9 +756,11 @@ async def create_card(
             assignee_email = user_details[0]
             assignee_name = f"{user_details[1]} {user_details[2]}".strip() if user_details[1] else assignee_email
     
+    # El asignado validado arriba (o el developer que crea la tarjeta) se guarda
+    # con la tarjeta; antes solo se devolvía en la respuesta y se perdía
     create_card_query = text("""
-        INSERT INTO cards (id, title, description, list_id, position, due_date, created_at, updated_at, is_active, cover_color)
-        VALUES (:id, :title, :description, :list_id, :position, :due_date, NOW(), NOW(), true, :cover_color)
+        INSERT INTO cards (id, title, description, list_id, position, due_date, assignee_id, created_at, updated_at, is_active, cover_color)
+        VALUES (:id, :title, :description, :list_id, :position, :due_date, :assignee_id, NOW(), NOW(), true, :cover_color)
         RETURNING id, title, description, list_id, position, due_date, created_at, updated_at, cover_color
     """)
     
@@ -753,12 +771,23 @@ async def create_card(
         "list_id": list_id,
         "position": position,
         "due_date": due_date,
+        "assignee_id": assignee_id,
         "cover_color": card_data.cover_color
     })
+    card_record = result.fetchone()
     
-    db.commit()
+    # Registrar la creación (y la asignación inicial) en la misma transacción
+    record_card_event(db, card_id, board_id, "created", to_list_id=list_id, actor_id=local_user_id)
+    if assignee_id:
+        record_card_event(db, card_id, board_id, "assigned", assignee_id=assignee_id, actor_id=local_user_id)
+    record_activity(
+        db, project_id, local_user_id, "card_created",
+        f"Tarjeta '{card_data.title}' creada",
+        {"board_id": board_id, "card_id": card_id, "list_id": list_id}
+    )
     
-    card_record = result.fetchone()
+    db.commit()
+    invalidate_project(project_id)
     
     return {
         "id": card_record[0],
@@ -858,8 +887,9 @@ async def update_card(
     
     # Verificar acceso al tablero
     list_query = text("""
-        SELECT l.board_id
+        SELECT l.board_id, b.project_id
         FROM lists l
+        JOIN boards b ON l.board_id = b.id
         WHERE l.id = :list_id
     """)
     
@@ -873,6 +903,7 @@ async def update_card(
         )
     
     board_id = list_record[0]
+    project_id = list_record[1]
     
     # Verificar acceso al tablero
     board_exists = await is_board_accessible(board_id, current_user, db)
@@ -1056,7 +1087,45 @@ async def update_card(
     """)
     
     result = db.execute(update_query, params)
+    
+    # Solo cambia la posición dentro de la misma lista (arrastrar para reordenar)
+    reorder_only = target_list_id == current_list_id and set(params) <= {"card_id", "position", "list_id"}
+    
+    # Registrar movimientos y cambios de asignación en la misma transacción
+    if target_list_id != current_list_id:
+        record_card_event(
+            db, card_id, board_id, "moved",
+            from_list_id=current_list_id, to_list_id=target_list_id, actor_id=current_user_id
+        )
+    if card_data.assignee_id is not None and card_data.assignee_id != previous_assignee_id:
+        record_card_event(
+            db, card_id, board_id, "assigned",
+            assignee_id=card_data.assignee_id or None, actor_id=current_user_id
+        )
+    
+    activity_data = {"board_id": board_id, "card_id": card_id}
+    if target_list_id != current_list_id:
+        record_activity(
+            db, project_id, current_user_id, "card_moved",
+            f"Tarjeta '{card_title}' movida de lista",
+            {**activity_data, "from_list_id": current_list_id, "to_list_id": target_list_id}
+        )
+    elif card_data.assignee_id is not None and card_data.assignee_id != previous_assignee_id:
+        record_activity(
+            db, project_id, current_user_id, "card_assigned",
+            f"Tarjeta '{card_title}' reasignada",
+            {**activity_data, "assignee_id": card_data.assignee_id or None}
+        )
+    elif not reorder_only:
+        record_activity(
+            db, project_id, current_user_id, "card_updated",
+            f"Tarjeta '{card_title}' actualizada", activity_data
+        )
+    
     db.commit()
+    # Reordenar dentro de la lista no afecta a ninguna caché por proyecto
+    if not reorder_only:
+        invalidate_project(project_id)
     
     updated_card = result.fetchone()
     
@@ -1092,7 +1161,9 @@ async def update_card(
                 content=notification_content,
                 notification_type="card_updated",
                 entity_id=card_id,
-                data=notification_data
+                data=notification_data,
+                # Las ediciones seguidas (autoguardado) actualizan la misma notificación
+                coalesce_seconds=settings.NOTIFICATION_COALESCE_SECONDS
             )
     
     # Si no tenemos el nombre y correo del asignado pero tenemos un assignee_id, obtenerlos
@@ -1134,9 +1205,10 @@ async def delete_card(
     
     # Verificar que la tarjeta existe y obtener el tablero
     card_query = text("""
-        SELECT c.id, l.board_id
+        SELECT c.id, l.board_id, b.project_id, c.title, c.list_id
         FROM cards c
         JOIN lists l ON c.list_id = l.id
+        JOIN boards b ON l.board_id = b.id
         WHERE c.id = :card_id
     """)
     
@@ -1166,7 +1238,25 @@ async def delete_card(
     """)
     
     db.execute(delete_query, {"card_id": card_id})
+    
+    # Notificaciones sobre la tarjeta (contención JSONB, resuelta con el índice GIN de data)
+    db.execute(text("""
+        DELETE FROM notifications
+        WHERE data @> jsonb_build_object('card_id', CAST(:card_id AS TEXT))
+    """), {"card_id": card_id})
+    
+    local_user_id = get_local_user_id(current_user, db)
+    # La tarjeta sale de su lista; su historial se conserva en el flujo acumulado
+    record_card_event(db, card_id, board_id, "deleted", from_list_id=card_record[4], actor_id=local_user_id)
+    if local_user_id:
+        record_activity(
+            db, card_record[2], local_user_id, "card_deleted",
+            f"Tarjeta '{card_record[3]}' eliminada",
+            {"board_id": board_id, "card_id": card_id}
+        )
+    
     db.commit()
+    invalidate_project(card_record[2])
     
     return {"message": "Tarjeta eliminada correctamente"}
 
@@ -1181,9 +1271,10 @@ async def add_comment(
     
     # Verificar que la tarjeta existe
     card_query = text("""
-        SELECT c.id, l.board_id, c.title, c.assignee_id
+        SELECT c.id, l.board_id, c.title, c.assignee_id, b.project_id
         FROM cards c
         JOIN lists l ON c.list_id = l.id
+        JOIN boards b ON l.board_id = b.id
         WHERE c.id = :card_id
     """)
     
@@ -1199,6 +1290,7 @@ async def add_comment(
     board_id = card_record[1]
     card_title = card_record[2]
     assignee_id = card_record[3]
+    project_id = card_record[4]
     
     # Verificar acceso al tablero
     board_exists = await is_board_accessible(board_id, current_user, db)
@@ -1213,22 +1305,20 @@ async def add_comment(
     user_name = None
     user_email = None
     
-    if current_user.sub_type == "local":
-        local_user_id = current_user.subject
-        
-        # Obtener datos del usuario actual
-        user_query = text("""
-            SELECT email, first_name, last_name 
-            FROM user_profiles 
-            WHERE id = :user_id
-        """)
-        
-        user_result = db.execute(user_query, {"user_id": local_user_id})
-        user_record = user_result.fetchone()
-        
-        if user_record:
-            user_email = user_record[0]
-            user_name = f"{user_record[1]} {user_record[2]}".strip() if user_record[1] else user_email
+    user_query = text("""
+        SELECT id, email, first_name, last_name 
+        FROM user_profiles 
+        WHERE auth_id = :auth_id OR email = :email
+        LIMIT 1
+    """)
+    
+    user_result = db.execute(user_query, {"auth_id": current_user.id, "email": current_user.email})
+    user_record = user_result.fetchone()
+    
+    if user_record:
+        local_user_id = user_record[0]
+        user_email = user_record[1]
+        user_name = f"{user_record[2]} {user_record[3]}".strip() if user_record[2] else user_email
     
     if not local_user_id:
         raise HTTPException(
@@ -1252,6 +1342,12 @@ async def add_comment(
         "content": comment_data.content
     })
     
+    record_activity(
+        db, project_id, local_user_id, "comment_added",
+        f"{user_name} comentó en la tarjeta '{card_title}'",
+        {"board_id": board_id, "card_id": card_id, "comment_id": comment_id}
+    )
+    
     # Crear notificación si hay un usuario asignado a la tarjeta y es diferente del usuario que comenta
     if assignee_id and assignee_id != local_user_id:
         notification_content = f"{user_name} ha comentado en la tarjeta '{card_title}' que te está asignada"
@@ -1487,6 +1583,25 @@ async def get_board_developers(
     # Añadir opción "Sin asignar" implícitamente en el frontend
     return developers
 
+@router.get("/{board_id}/flow-metrics")
+async def get_board_flow_metrics(
+    board_id: str,
+    days: int = Query(90, ge=1, le=3650, description="Periodo de tarjetas terminadas a considerar"),
+    start_list_id: Optional[str] = None,
+    done_list_id: Optional[str] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Lead time y cycle time del tablero (promedio y percentiles) según el registro de eventos"""
+    board_accessible = await is_board_accessible(board_id, current_user, db)
+    if not board_accessible:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permiso para acceder a este tablero"
+        )
+    
+    return FlowMetricsService(db).get_flow_metrics(board_id, days, start_list_id, done_list_id)
+
 async def is_board_accessible(board_id: str, current_user: AuthUser, db: Session) -> bool:
     """Verificar si un usuario tiene acceso a un tablero"""
     
@@ -1571,108 +1686,23 @@ async def get_board_sprint_info(
     db: Session = Depends(get_db)
 ):
     """Obtener información del sprint activo para un tablero Scrum"""
+    service = SprintSummaryService(db)
+    board = service.resolve_board(board_id, current_user)
+    summary = service.get_summary(board["project_id"], board["project_name"])
     
-    # Verificar acceso al tablero
-    board_accessible = await is_board_accessible(board_id, current_user, db)
-    if not board_accessible:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para ver este tablero"
-        )
-    
-    # Obtener proyecto del tablero
-    project_query = text("""
-        SELECT b.project_id, p.name as project_name
-        FROM boards b
-        JOIN projects p ON b.project_id = p.id
-        WHERE b.id = :board_id
-    """)
-    project_result = db.execute(project_query, {"board_id": board_id})
-    project_record = project_result.fetchone()
-    
-    if not project_record:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tablero no encontrado"
-        )
-    
-    project_id = project_record[0]
-    
-    # Obtener sprint activo del proyecto
-    sprint_query = text("""
-        SELECT 
-            s.id, s.name, s.goal, s.start_date, s.end_date, s.status,
-            COUNT(sb.story_id) as stories_count,
-            COUNT(CASE WHEN us.status = 'done' THEN 1 END) as completed_stories_count
-        FROM sprints s
-        LEFT JOIN sprint_backlog sb ON s.id = sb.sprint_id
-        LEFT JOIN user_stories us ON sb.story_id = us.id
-        WHERE s.project_id = :project_id AND s.status = 'active'
-        GROUP BY s.id, s.name, s.goal, s.start_date, s.end_date, s.status
-        ORDER BY s.start_date DESC
-        LIMIT 1
-    """)
-    
-    sprint_result = db.execute(sprint_query, {"project_id": project_id})
-    sprint_record = sprint_result.fetchone()
-    
-    if not sprint_record:
-        # No hay sprint activo, buscar el último sprint
-        last_sprint_query = text("""
-            SELECT 
-                s.id, s.name, s.goal, s.start_date, s.end_date, s.status,
-                COUNT(sb.story_id) as stories_count,
-                COUNT(CASE WHEN us.status = 'done' THEN 1 END) as completed_stories_count
-            FROM sprints s
-            LEFT JOIN sprint_backlog sb ON s.id = sb.sprint_id
-            LEFT JOIN user_stories us ON sb.story_id = us.id
-            WHERE s.project_id = :project_id
-            GROUP BY s.id, s.name, s.goal, s.start_date, s.end_date, s.status
-            ORDER BY s.created_at DESC
-            LIMIT 1
-        """)
-        
-        sprint_result = db.execute(last_sprint_query, {"project_id": project_id})
-        sprint_record = sprint_result.fetchone()
-        
-        if not sprint_record:
-            return {
-                "project_id": project_id,
-                "project_name": project_record[1],
-                "active_sprint": None,
-                "message": "No hay sprints creados para este proyecto"
-            }
-    
-    # Calcular días restantes
-    days_remaining = None
-    if sprint_record[4]:  # end_date
-        from datetime import datetime
-        end_date = sprint_record[4]
-        now = datetime.utcnow()
-        if end_date > now:
-            days_remaining = (end_date - now).days
-    
-    # Calcular progreso
-    progress_percentage = 0
-    if sprint_record[6] > 0:  # stories_count
-        progress_percentage = (sprint_record[7] / sprint_record[6]) * 100
+    if not summary["current_sprint"]:
+        return {
+            "project_id": summary["project_id"],
+            "project_name": summary["project_name"],
+            "active_sprint": None,
+            "message": "No hay sprints creados para este proyecto"
+        }
     
     return {
-        "project_id": project_id,
-        "project_name": project_record[1],
-        "active_sprint": {
-            "id": sprint_record[0],
-            "name": sprint_record[1],
-            "goal": sprint_record[2],
-            "start_date": sprint_record[3].isoformat() if sprint_record[3] else None,
-            "end_date": sprint_record[4].isoformat() if sprint_record[4] else None,
-            "status": sprint_record[5],
-            "days_remaining": days_remaining,
-            "stories_count": sprint_record[6],
-            "completed_stories_count": sprint_record[7],
-            "progress_percentage": round(progress_percentage, 1)
-        }
-    } 
+        "project_id": summary["project_id"],
+        "project_name": summary["project_name"],
+        "active_sprint": service.serialize_sprint(summary["current_sprint"])
+    }
 
 # Endpoints para funcionalidad básica de Sprints
 @router.post("/{board_id}/sprints")
@@ -1725,6 +1755,7 @@ async def create_sprint_for_board(
         "end_date": end_date
     })
     db.commit()
+    invalidate_project(project_id)
     
     return {
         "id": sprint_id,
@@ -1743,38 +1774,16 @@ async def get_board_sprints(
     db: Session = Depends(get_db)
 ):
     """Obtener sprints de un tablero"""
-    # Verificar acceso al tablero
-    board_accessible = await is_board_accessible(board_id, current_user, db)
-    if not board_accessible:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para este tablero"
-        )
+    service = SprintSummaryService(db)
+    board = service.resolve_board(board_id, current_user)
+    summary = service.get_summary(board["project_id"], board["project_name"])
     
-    sprints_query = text("""
-        SELECT s.id, s.name, s.goal, s.start_date, s.end_date, s.status,
-               EXTRACT(EPOCH FROM (s.end_date - NOW())) / 86400 as days_remaining
-        FROM sprints s
-        JOIN boards b ON s.project_id = b.project_id
-        WHERE b.id = :board_id
-        ORDER BY s.start_date DESC
-    """)
-    
-    sprints_result = db.execute(sprints_query, {"board_id": board_id}).fetchall()
-    
-    sprints = []
-    for sprint in sprints_result:
-        sprints.append({
-            "id": sprint[0],
-            "name": sprint[1],
-            "goal": sprint[2],
-            "start_date": sprint[3].isoformat() if sprint[3] else None,
-            "end_date": sprint[4].isoformat() if sprint[4] else None,
-            "status": sprint[5],
-            "days_remaining": max(0, int(sprint[6])) if sprint[6] else 0
-        })
-    
-    return {"sprints": sprints}
+    return {
+        "sprints": [
+            service.serialize_sprint(sprint, with_counts=False)
+            for sprint in summary["sprints"]
+        ]
+    }
 
 @router.get("/{board_id}/sprint-info")
 async def get_current_sprint_info(
@@ -1783,75 +1792,23 @@ async def get_current_sprint_info(
     db: Session = Depends(get_db)
 ):
     """Obtener información del sprint activo para mostrar en el tablero"""
-    # Verificar acceso al tablero
-    board_accessible = await is_board_accessible(board_id, current_user, db)
-    if not board_accessible:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes permiso para este tablero"
-        )
-    
-    # Obtener sprint activo
-    sprint_query = text("""
-        SELECT s.id, s.name, s.goal, s.start_date, s.end_date, s.status,
-               b.project_id, p.name as project_name,
-               EXTRACT(EPOCH FROM (s.end_date - NOW())) / 86400 as days_remaining,
-               COUNT(CASE WHEN c.list_id IN (
-                   SELECT l.id FROM lists l WHERE l.board_id = :board_id
-               ) THEN 1 END) as total_cards,
-               COUNT(CASE WHEN c.list_id IN (
-                   SELECT l.id FROM lists l WHERE l.board_id = :board_id AND l.title ILIKE '%complet%'
-               ) THEN 1 END) as completed_cards
-        FROM sprints s
-        JOIN boards b ON s.project_id = b.project_id
-        JOIN projects p ON b.project_id = p.id
-        LEFT JOIN lists l ON l.board_id = :board_id
-        LEFT JOIN cards c ON c.list_id = l.id
-        WHERE b.id = :board_id 
-        AND (s.status = 'active' OR (s.status = 'planning' AND s.start_date <= NOW() + INTERVAL '7 days'))
-        GROUP BY s.id, s.name, s.goal, s.start_date, s.end_date, s.status, b.project_id, p.name
-        ORDER BY s.start_date DESC
-        LIMIT 1
-    """)
-    
-    sprint_result = db.execute(sprint_query, {"board_id": board_id}).fetchone()
+    service = SprintSummaryService(db)
+    board = service.resolve_board(board_id, current_user)
+    summary = service.get_summary(board["project_id"], board["project_name"])
     
-    if not sprint_result:
-        # No hay sprint activo, obtener información del proyecto
-        project_query = text("""
-            SELECT b.project_id, p.name as project_name
-            FROM boards b
-            JOIN projects p ON b.project_id = p.id
-            WHERE b.id = :board_id
-        """)
-        project_result = db.execute(project_query, {"board_id": board_id}).fetchone()
-        
-        if project_result:
-            return {
-                "project_id": project_result[0],
-                "project_name": project_result[1],
-                "message": "No hay sprint activo. ¡Crea uno nuevo para comenzar!"
-            }
-        else:
-            raise HTTPException(status_code=404, detail="Tablero no encontrado")
+    current_sprint = summary["current_sprint"]
+    if not current_sprint or current_sprint["status"] not in ("active", "planning"):
+        return {
+            "project_id": summary["project_id"],
+            "project_name": summary["project_name"],
+            "message": "No hay sprint activo. ¡Crea uno nuevo para comenzar!"
+        }
     
-    total_cards = sprint_result[9] or 0
-    completed_cards = sprint_result[10] or 0
-    progress_percentage = (completed_cards / total_cards * 100) if total_cards > 0 else 0
+    active_sprint = service.serialize_sprint(current_sprint)
+    active_sprint["goal"] = active_sprint["goal"] or ""
     
     return {
-        "project_id": sprint_result[6],
-        "project_name": sprint_result[7],
-        "active_sprint": {
-            "id": sprint_result[0],
-            "name": sprint_result[1],
-            "goal": sprint_result[2] or "",
-            "start_date": sprint_result[3].isoformat() if sprint_result[3] else None,
-            "end_date": sprint_result[4].isoformat() if sprint_result[4] else None,
-            "status": sprint_result[5],
-            "days_remaining": max(0, int(sprint_result[8])) if sprint_result[8] else 0,
-            "stories_count": total_cards,
-            "completed_stories_count": completed_cards,
-            "progress_percentage": round(progress_percentage, 1)
-        }
-    } 
\ No newline at end of file
+        "project_id": summary["project_id"],
+        "project_name": summary["project_name"],
+        "active_sprint": active_sprint
+    }
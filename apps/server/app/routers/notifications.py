@@ -4,10 +4,13 @@ from app.database.db import get_db
 from app.core.auth import get_current_user, AuthUser
 from typing import List as TypeList, Optional
 from pydantic import BaseModel
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import text
 import uuid
-import json
-from app.services.email_service import email_service
+from app.services.email_dispatcher import email_dispatcher
+from app.services.email_service import notification_subject
+from app.core.metrics import NOTIFICATIONS_COALESCED, NOTIFICATIONS_CREATED
 
 router = APIRouter(
     prefix="/notifications",
@@ -31,19 +34,57 @@ async def create_notification(
     content: str,
     notification_type: str,
     entity_id: str,
-    data: Optional[dict] = None
+    data: Optional[dict] = None,
+    coalesce_seconds: Optional[float] = None
 ) -> str:
-    """Crear una notificación para un usuario y opcionalmente enviar por email"""
-    notification_id = str(uuid.uuid4())
+    """
+    Crear una notificación para un usuario y opcionalmente enviar por email.
+    
+    Con `coalesce_seconds`, si el usuario tiene una notificación no leída del
+    mismo tipo y entidad actualizada dentro de esa ventana, se actualiza su
+    contenido en lugar de crear otra (y no se envía un nuevo email); su
+    created_at se renueva para que vuelva al principio de la lista.
+    """
+    if coalesce_seconds:
+        # El lock de transacción serializa eventos simultáneos del mismo (usuario, entidad, tipo)
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {
+            "key": f"notification:{user_id}:{entity_id}:{notification_type}"
+        })
+        coalesced = db.execute(text("""
+            UPDATE notifications
+            SET content = :content, data = :data, created_at = NOW(), updated_at = NOW()
+            WHERE id = (
+                SELECT id FROM notifications
+                WHERE user_id = :user_id
+                AND entity_id = :entity_id
+                AND type = :type
+                AND read = false
+                AND is_active = true
+                AND updated_at >= NOW() - make_interval(secs => :window)
+                ORDER BY updated_at DESC
+                LIMIT 1
+            )
+            RETURNING id
+        """).bindparams(bindparam("data", type_=JSONB)), {
+            "user_id": user_id,
+            "entity_id": entity_id,
+            "type": notification_type,
+            "content": content,
+            "data": data,
+            "window": coalesce_seconds
+        }).fetchone()
+        if coalesced:
+            db.commit()
+            NOTIFICATIONS_COALESCED.labels(notification_type).inc()
+            return coalesced[0]
     
-    # Convertir data a JSON string, o None si data es None
-    data_json = json.dumps(data) if data is not None else None
+    notification_id = str(uuid.uuid4())
     
     # Crear notificación en la base de datos
     create_notification_query = text("""
         INSERT INTO notifications (id, user_id, content, type, entity_id, data, created_at, updated_at, is_active, read)
         VALUES (:id, :user_id, :content, :type, :entity_id, :data, NOW(), NOW(), true, false)
-    """)
+    """).bindparams(bindparam("data", type_=JSONB))
     
     db.execute(create_notification_query, {
         "id": notification_id,
@@ -51,10 +92,11 @@ async def create_notification(
         "content": content,
         "type": notification_type,
         "entity_id": entity_id,
-        "data": data_json
+        "data": data
     })
     
     db.commit()
+    NOTIFICATIONS_CREATED.labels(notification_type).inc()
     
     # Enviar email si las notificaciones por email están habilitadas para este usuario
     try:
@@ -71,25 +113,15 @@ async def create_notification(
             user_email = user_record[0]
             user_name = f"{user_record[1]} {user_record[2]}".strip() if user_record[1] else user_email
             
-            # Generar asunto del email
-            subject_map = {
-                "card_assigned": "📋 Te han asignado una nueva tarjeta",
-                "card_comment": "💬 Nuevo comentario en tu tarjeta",
-                "card_updated": "✏️ Tu tarjeta ha sido actualizada",
-                "project_invitation": "👥 Invitación a nuevo proyecto",
-                "project_obsolete": "⚠️ Proyecto marcado como obsoleto",
-            }
-            subject = subject_map.get(notification_type, "🔔 Nueva notificación")
-            
-            # Enviar email (no await para no bloquear la respuesta)
-            await email_service.send_notification_email(
-                to_email=user_email,
-                to_name=user_name,
-                notification_type=notification_type,
-                subject=subject,
-                content=content,
-                entity_data=data
-            )
+            # Encolar el email; se envía en segundo plano sin retener la respuesta
+            email_dispatcher.enqueue([{
+                "to_email": user_email,
+                "to_name": user_name,
+                "notification_type": notification_type,
+                "subject": notification_subject(notification_type),
+                "content": content,
+                "entity_data": data
+            }])
             
     except Exception as e:
         # Log del error pero no fallar la notificación
@@ -139,21 +171,13 @@ async def get_user_notifications(
     for row in result:
         notification_ids.append(row[0])
         
-        # Deserializar el campo data si existe
-        data_field = None
-        if row[5] is not None:  # row[5] es el campo data
-            try:
-                data_field = json.loads(row[5])
-            except (json.JSONDecodeError, TypeError):
-                data_field = None
-        
         notifications.append({
             "id": row[0],
             "user_id": row[1],
             "content": row[2],
             "type": row[3],
             "entity_id": row[4],
-            "data": data_field,
+            "data": row[5],  # JSONB, decodificado por el driver
             "created_at": row[6].isoformat(),
             "read": row[7]
         })
@@ -2,11 +2,12 @@
 Endpoints para gestión del ciclo de vida de proyectos
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
 from sqlmodel import Session
 from app.database.db import get_db
 from app.core.auth import get_current_user, AuthUser
 from app.services.project_lifecycle import ProjectLifecycleService
+from app.services.activity import get_project_activity
 from app.models.project import ProjectStatus, ProjectPriority
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
@@ -54,6 +55,7 @@ class ProjectHealthResponse(BaseModel):
     stats: Dict[str, Any]
     overdue_sprints: int
     overdue_milestones: int
+    on_time_probability: Optional[float] = None
 
 class ProjectSummaryResponse(BaseModel):
     id: str
@@ -350,6 +352,28 @@ async def get_project_health(
     
     return health_data
 
+@router.get("/{project_id}/activity")
+async def get_project_activity_feed(
+    project_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    activity_type: Optional[str] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Actividad del proyecto (ciclo de vida, tableros, tarjetas y comentarios), paginada por cursor"""
+    
+    user_id = await _get_user_id(current_user, db)
+    await _check_project_access(project_id, user_id, db)
+    
+    try:
+        return get_project_activity(db, project_id, limit, cursor, activity_type)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+
 @router.post("/{project_id}/update-completion")
 async def update_project_completion(
     project_id: str,
@@ -4,6 +4,7 @@ from app.database.db import get_db
 from app.models.project import Project, ProjectMember
 from app.models.user import UserProfile
 from app.core.auth import get_current_user, AuthUser
+from app.core.cache import invalidate_project
 from typing import List as TypeList, Optional
 from pydantic import BaseModel
 from sqlalchemy.sql import text
@@ -322,6 +323,7 @@ async def update_project(
         update_fields["project_id"] = project_id
         result = db.execute(update_query, update_fields)
         db.commit()
+        invalidate_project(project_id)
         
         updated_project = result.fetchone()
         
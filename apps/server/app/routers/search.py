@@ -0,0 +1,59 @@
+"""
+Endpoint de búsqueda de texto completo
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session
+from app.database.db import get_db
+from app.core.auth import get_current_user, AuthUser
+from app.services.search import search, SEARCH_TYPES
+from typing import List, Optional
+from sqlalchemy.sql import text
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"],
+    responses={404: {"description": "No encontrado"}},
+)
+
+@router.get("")
+async def search_content(
+    q: str = Query(..., min_length=2, max_length=200, description="Texto a buscar"),
+    type: Optional[List[str]] = Query(None, description="Tipos: card, comment, story"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Buscar en tarjetas, comentarios e historias de usuario accesibles para el usuario"""
+    
+    user_query = text("""
+        SELECT id, role FROM user_profiles 
+        WHERE auth_id = :auth_id OR email = :email
+        LIMIT 1
+    """)
+    user_record = db.execute(user_query, {"auth_id": current_user.id, "email": current_user.email}).fetchone()
+    
+    if not user_record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuario no encontrado"
+        )
+    
+    if type:
+        invalid = [t for t in type if t not in SEARCH_TYPES]
+        if invalid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Tipos de búsqueda inválidos: {', '.join(invalid)}"
+            )
+    
+    return search(
+        db,
+        q,
+        user_id=user_record[0],
+        user_role=user_record[1],
+        types=type,
+        limit=limit,
+        offset=offset
+    )
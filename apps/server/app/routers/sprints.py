@@ -4,6 +4,8 @@ from app.database.db import get_db
 from app.models.agile import Sprint, UserStory, SprintBacklogItem
 from app.models.project import Project
 from app.core.auth import get_current_user, AuthUser
+from app.core.cache import invalidate_project
+from app.services.sprint_metrics import SprintMetricsService
 from typing import List as TypeList, Optional
 from pydantic import BaseModel
 from sqlalchemy.sql import text
@@ -127,6 +129,7 @@ async def create_sprint(
     })
     
     db.commit()
+    invalidate_project(sprint_data.project_id)
     
     sprint_record = result.fetchone()
     
@@ -306,8 +309,9 @@ async def start_sprint(
         UPDATE sprints 
         SET status = 'completed', updated_at = NOW()
         WHERE project_id = :project_id AND status = 'active'
+        RETURNING id
     """)
-    db.execute(finalize_active_query, {"project_id": sprint_record[1]})
+    finalized_ids = [row[0] for row in db.execute(finalize_active_query, {"project_id": sprint_record[1]})]
     
     # Iniciar el sprint
     start_sprint_query = text("""
@@ -319,6 +323,10 @@ async def start_sprint(
     
     db.commit()
     
+    # Registrar la instantánea final de los sprints cerrados y la inicial del nuevo
+    SprintMetricsService(db).snapshot_sprints(finalized_ids + [sprint_id])
+    invalidate_project(sprint_record[1])
+    
     return {"message": "Sprint iniciado exitosamente"}
 
 @router.post("/{sprint_id}/complete")
@@ -360,6 +368,10 @@ async def complete_sprint(
     
     db.commit()
     
+    # Registrar la instantánea final del sprint para el historial de velocidad
+    SprintMetricsService(db).snapshot_sprints([sprint_id])
+    invalidate_project(sprint_record[1])
+    
     return {"message": "Sprint completado exitosamente"}
 
 @router.post("/{sprint_id}/stories/{story_id}")
@@ -419,4 +431,94 @@ async def add_story_to_sprint(
     
     db.commit()
     
-    return {"message": "Historia agregada al sprint exitosamente"} 
\ No newline at end of file
+    # Mantener al día la instantánea del sprint con el nuevo alcance
+    SprintMetricsService(db).snapshot_sprints([sprint_id])
+    invalidate_project(verify_record[1])
+    
+    return {"message": "Historia agregada al sprint exitosamente"}
+
+@router.get("/{sprint_id}/burndown")
+async def get_sprint_burndown(
+    sprint_id: str,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Obtener el burndown diario de un sprint a partir de las métricas precalculadas"""
+    
+    sprint_query = text("""
+        SELECT id, project_id, name, start_date, end_date, status
+        FROM sprints
+        WHERE id = :sprint_id
+    """)
+    sprint_record = db.execute(sprint_query, {"sprint_id": sprint_id}).fetchone()
+    
+    if not sprint_record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sprint no encontrado"
+        )
+    
+    await _check_project_access(sprint_record[1], current_user, db)
+    
+    return {
+        "sprint_id": sprint_record[0],
+        "name": sprint_record[2],
+        "start_date": sprint_record[3].isoformat() if sprint_record[3] else None,
+        "end_date": sprint_record[4].isoformat() if sprint_record[4] else None,
+        "status": sprint_record[5],
+        "series": SprintMetricsService(db).get_burndown(sprint_id)
+    }
+
+@router.get("/project/{project_id}/velocity")
+async def get_project_velocity(
+    project_id: str,
+    limit: int = 10,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Obtener la velocidad de los últimos sprints del proyecto"""
+    
+    await _check_project_access(project_id, current_user, db)
+    
+    sprints = SprintMetricsService(db).get_velocity(project_id, limit)
+    average_velocity = sum(s["velocity"] for s in sprints) / len(sprints) if sprints else 0.0
+    
+    return {
+        "project_id": project_id,
+        "sprints": sprints,
+        "average_velocity": round(average_velocity, 2)
+    }
+
+async def _check_project_access(project_id: str, current_user: AuthUser, db: Session):
+    """Verificar que el usuario actual tiene acceso al proyecto"""
+    user_query = text("""
+        SELECT id FROM user_profiles 
+        WHERE auth_id = :auth_id OR email = :email
+        LIMIT 1
+    """)
+    user_record = db.execute(user_query, {"auth_id": current_user.id, "email": current_user.email}).fetchone()
+    
+    if not user_record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuario no encontrado"
+        )
+    
+    permission_query = text("""
+        SELECT 1 FROM (
+            SELECT 1 FROM project_members 
+            WHERE project_id = :project_id AND user_id = :user_id
+            UNION
+            SELECT 1 FROM projects 
+            WHERE id = :project_id AND (owner_id = :user_id OR created_by = :user_id)
+            UNION
+            SELECT 1 FROM user_profiles 
+            WHERE id = :user_id AND role = 'admin'
+        ) access_check
+    """)
+    
+    if not db.execute(permission_query, {"project_id": project_id, "user_id": user_record[0]}).fetchone():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes acceso a este proyecto"
+        ) 
\ No newline at end of file
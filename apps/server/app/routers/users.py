@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlmodel import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from sqlalchemy.sql import text
+import logging
 import uuid
 
 from app.database.db import get_db
 from app.core.auth import get_current_user, AuthUser
+from app.services.user_search import search_users
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/users",
@@ -43,8 +47,7 @@ async def list_users(
 ):
     """Lista todos los usuarios registrados"""
     try:
-        # Imprimir información para debugging
-        print(f"Listando usuarios. Usuario actual: {current_user.email if current_user else 'No autenticado'}")
+        logger.debug("Listando usuarios para %s", current_user.email if current_user else "anónimo")
         
         # Obtener el rol y el ID del usuario actual de la base de datos local
         user_query = text("""
@@ -106,15 +109,48 @@ async def list_users(
             user_dict['name'] = f"{user_dict['first_name']} {user_dict['last_name']}"
             users.append(user_dict)
         
-        print(f"Total de usuarios encontrados: {row_count}")
+        logger.debug("Total de usuarios encontrados: %s", row_count)
         return users
     except Exception as e:
-        print(f"Error al listar usuarios: {str(e)}")
+        logger.exception("Error al listar usuarios: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al listar usuarios: {str(e)}"
         )
 
+@router.get("/search", response_model=List[UserResponse])
+async def search_users_endpoint(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefijo de email o nombre; desde 3 caracteres también fragmento o nombre similar"),
+    project_id: Optional[str] = None,
+    role: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_user)
+):
+    """Buscar usuarios visibles para el usuario actual (selectores de asignado y miembros)"""
+    user_query = text("""
+        SELECT id, role FROM user_profiles 
+        WHERE auth_id = :auth_id OR email = :email
+        LIMIT 1
+    """)
+    user_record = db.execute(user_query, {"auth_id": current_user.id, "email": current_user.email}).fetchone()
+    
+    if not user_record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuario no encontrado en la base de datos local"
+        )
+    
+    return search_users(
+        db,
+        q,
+        caller_id=user_record[0],
+        caller_role=user_record[1],
+        project_id=project_id,
+        role=role,
+        limit=limit
+    )
+
 # Endpoint sin autenticación para pruebas
 @router.get("/debug/list", response_model=List[UserResponse])
 async def debug_list_users(
@@ -0,0 +1,278 @@
+"""
+Flujo de actividad de proyectos (tabla project_activities).
+
+Las actividades se registran con `record_activity(db, ...)` antes del commit de
+la operación. Se conservan en la sesión y solo se encolan cuando esa
+transacción se confirma (se descartan si hace rollback). Un hilo en segundo
+plano las inserta por lotes con su propia conexión, fuera del camino del
+commit de la petición. La cola vive en memoria: si el proceso termina de forma
+abrupta, las actividades aún sin escribir se pierden aunque la operación ya se
+haya confirmado. Los ids son UUIDv7 y created_at se deriva del mismo
+instante, de modo que el orden por (created_at, id) es el orden de inserción.
+"""
+
+import base64
+import json
+import logging
+import queue
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.sql import text
+from sqlmodel import Session
+
+from app.core.ids import uuid7, uuid7_datetime
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "pending_activities"
+
+# Columnas que puede escribir el registrador (se intersectan con las de la tabla)
+_ACTIVITY_COLUMNS = (
+    "id", "project_id", "user_id", "activity_type", "description",
+    "extra_data", "created_at", "updated_at", "is_active"
+)
+
+
+def record_activity(
+    db: Session,
+    project_id: str,
+    user_id: str,
+    activity_type: str,
+    description: str,
+    extra_data: Optional[Dict[str, Any]] = None
+) -> None:
+    """Agregar una actividad que se publicará cuando se confirme la transacción de `db`"""
+    activity_id = uuid7()
+    created_at = uuid7_datetime(activity_id)
+    db.info.setdefault(_PENDING_KEY, []).append({
+        "id": activity_id,
+        "project_id": project_id,
+        "user_id": user_id,
+        "activity_type": activity_type,
+        "description": description,
+        "extra_data": json.dumps(extra_data) if extra_data is not None else None,
+        "created_at": created_at,
+        "updated_at": created_at,
+        "is_active": True
+    })
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _publish_pending(session: OrmSession) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        activity_recorder.enqueue(pending)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_pending(session: OrmSession) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class ActivityRecorder:
+    """Inserta actividades por lotes desde un hilo en segundo plano"""
+
+    def __init__(self, batch_size: int = 500, flush_interval: float = 1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._columns: Optional[Tuple[str, ...]] = None
+
+    def start(self) -> None:
+        """Iniciar el hilo de escritura (se inicia solo al encolar la primera actividad)"""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="activity-recorder", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Escribir lo pendiente y detener el hilo"""
+        if not self._thread or not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def enqueue(self, activities: List[Dict[str, Any]]) -> None:
+        if not self._thread or not self._thread.is_alive():
+            self.start()
+        for activity in activities:
+            self._queue.put(activity)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                if item is None:
+                    stopping = True
+                else:
+                    batch.append(item)
+                # Vaciar lo acumulado sin esperar, hasta completar el lote
+                while len(batch) < self.batch_size:
+                    item = self._queue.get_nowait()
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+            except queue.Empty:
+                pass
+
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    logger.error(f"Error registrando {len(batch)} actividad(es): {e}")
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Insertar el lote con una sola sentencia de varias filas"""
+        from app.database.db import engine
+
+        with engine.begin() as conn:
+            if self._columns is None:
+                existing = {
+                    row[0] for row in conn.execute(text("""
+                        SELECT column_name FROM information_schema.columns
+                        WHERE table_schema = current_schema()
+                          AND table_name = 'project_activities'
+                    """))
+                }
+                self._columns = tuple(c for c in _ACTIVITY_COLUMNS if c in existing)
+
+            values = []
+            params: Dict[str, Any] = {}
+            for i, activity in enumerate(batch):
+                values.append("(" + ", ".join(f":{c}_{i}" for c in self._columns) + ")")
+                for column in self._columns:
+                    params[f"{column}_{i}"] = activity[column]
+
+            conn.execute(
+                text(f"INSERT INTO project_activities ({', '.join(self._columns)}) VALUES {', '.join(values)}"),
+                params
+            )
+
+
+# Instancia global del registrador
+activity_recorder = ActivityRecorder()
+
+
+def encode_cursor(created_at: datetime, activity_id: str) -> str:
+    """Cursor opaco a partir de la última actividad devuelta"""
+    raw = f"{created_at.isoformat()}|{activity_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decodificar un cursor; lanza ValueError si es inválido"""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    created_at, activity_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+    return datetime.fromisoformat(created_at), activity_id
+
+
+def get_project_activity(
+    db: Session,
+    project_id: str,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    activity_type: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Página de actividad de un proyecto, de la más reciente a la más antigua.
+
+    La paginación por llave (created_at, id) usa el índice
+    (project_id, created_at, id) y permite descartar particiones antiguas.
+    """
+    filters = ["a.project_id = :project_id"]
+    params: Dict[str, Any] = {"project_id": project_id, "limit": limit + 1}
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        # La condición simple sobre created_at permite descartar particiones
+        filters.append("a.created_at <= :cursor_created_at")
+        filters.append("(a.created_at, a.id) < (:cursor_created_at, :cursor_id)")
+        params.update({"cursor_created_at": cursor_created_at, "cursor_id": cursor_id})
+    if activity_type:
+        filters.append("a.activity_type = :activity_type")
+        params["activity_type"] = activity_type
+
+    rows = db.execute(text(f"""
+        SELECT a.id::text, a.activity_type, a.description, a.extra_data, a.created_at,
+               a.user_id, up.first_name, up.last_name, up.email
+        FROM project_activities a
+        LEFT JOIN user_profiles up ON up.id = a.user_id
+        WHERE {' AND '.join(filters)}
+        ORDER BY a.created_at DESC, a.id DESC
+        LIMIT :limit
+    """), params).fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = []
+    for row in rows:
+        items.append({
+            "id": row[0],
+            "activity_type": row[1],
+            "description": row[2],
+            "data": json.loads(row[3]) if row[3] else None,
+            "created_at": row[4].isoformat() if row[4] else None,
+            "user_id": row[5],
+            "user_name": f"{row[6] or ''} {row[7] or ''}".strip() or row[8]
+        })
+
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(rows[-1][4], rows[-1][0]) if has_more and rows else None
+    }
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def ensure_activity_partitions(db: Session, months_ahead: int = 3) -> int:
+    """
+    Crear las particiones mensuales de project_activities para los próximos meses.
+
+    No hace nada si la tabla no está particionada (ver
+    migrations/partition_project_activities.py).
+    """
+    partitioned = db.execute(text("""
+        SELECT 1 FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        WHERE c.relname = 'project_activities'
+    """)).fetchone()
+    if not partitioned:
+        return 0
+
+    created = 0
+    month = date.today().replace(day=1)
+    for _ in range(months_ahead + 1):
+        next_month = _next_month(month)
+        name = f"project_activities_{month:%Y_%m}"
+        exists = db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+        if not exists:
+            db.execute(text(
+                f"CREATE TABLE {name} PARTITION OF project_activities "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+            ))
+            created += 1
+        month = next_month
+
+    db.commit()
+    return created
+
+
+def ensure_activity_partitions_job(db: Session) -> int:
+    """Tarea periódica: mantener creadas las particiones de los próximos meses"""
+    created = ensure_activity_partitions(db)
+    if created:
+        logger.info(f"Creadas {created} partición(es) de project_activities")
+    return created
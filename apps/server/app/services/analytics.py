@@ -0,0 +1,288 @@
+"""
+Servicio de analíticas de proyecto: burndown, tendencia de velocidad y
+diagrama de flujo acumulado (CFD) por lista de tablero.
+
+Las series se construyen con operaciones vectorizadas de NumPy sobre las
+instantáneas de sprint_metrics y el registro card_events, y se guardan en
+caché por proyecto hasta la siguiente modificación relevante.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from sqlmodel import Session
+from sqlalchemy.sql import text
+
+from app.core.cache import ProjectCache
+from app.services.sprint_metrics import SprintMetricsService
+
+# NumPy se importa dentro de las funciones que lo usan: cargarlo al importar el
+# módulo encarecía el arranque de cada worker aunque nadie pidiera analíticas
+if TYPE_CHECKING:
+    import numpy as np
+
+# Resultados completos por (proyecto, parámetros)
+analytics_cache = ProjectCache("analytics", ttl_seconds=900)
+
+# Sprints usados para la media móvil de velocidad
+VELOCITY_WINDOW = 3
+
+
+def _day_index(values: np.ndarray, start: date) -> np.ndarray:
+    """Convertir un arreglo datetime64[D] en índices de día desde `start`"""
+    import numpy as np
+
+    return (values - np.datetime64(start, "D")).astype(np.int64)
+
+
+class ProjectAnalyticsService:
+    """Calcula las series de analíticas de un proyecto"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_analytics(
+        self,
+        project_id: str,
+        days: int = 90,
+        velocity_sprints: int = 12
+    ) -> Dict[str, Any]:
+        """Analíticas completas del proyecto, servidas desde caché cuando es posible"""
+        cache_key = (days, velocity_sprints)
+        cached = analytics_cache.get(project_id, cache_key)
+        if cached is not None:
+            return cached
+
+        result = {
+            "project_id": project_id,
+            "generated_at": datetime.utcnow().isoformat(),
+            "burndown": self.get_burndown(project_id),
+            "velocity": self.get_velocity_trend(project_id, velocity_sprints),
+            "cumulative_flow": self.get_cumulative_flow(project_id, days)
+        }
+        analytics_cache.set(project_id, result, cache_key)
+        return result
+
+    def get_burndown(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Burndown del sprint activo (o del último) con una serie por día del sprint"""
+        import numpy as np
+
+        sprint = self.db.execute(text("""
+            SELECT id, name, status, start_date, end_date
+            FROM sprints
+            WHERE project_id = :project_id AND status IN ('active', 'completed')
+            ORDER BY (status = 'active') DESC, start_date DESC NULLS LAST
+            LIMIT 1
+        """), {"project_id": project_id}).fetchone()
+        if not sprint:
+            return None
+
+        rows = self.db.execute(text("""
+            SELECT recorded_at::date, total_stories, completed_stories
+            FROM sprint_metrics
+            WHERE sprint_id = :sprint_id
+            ORDER BY recorded_at ASC
+        """), {"sprint_id": sprint[0]}).fetchall()
+
+        summary = {
+            "sprint_id": sprint[0],
+            "name": sprint[1],
+            "status": sprint[2],
+            "start_date": sprint[3].isoformat() if sprint[3] else None,
+            "end_date": sprint[4].isoformat() if sprint[4] else None,
+            "dates": [],
+            "total": [],
+            "remaining": [],
+            "ideal": []
+        }
+        if not rows:
+            return summary
+
+        recorded = np.array([r[0] for r in rows], dtype="datetime64[D]")
+        total = np.array([r[1] or 0 for r in rows], dtype=np.int64)
+        remaining = total - np.array([r[2] or 0 for r in rows], dtype=np.int64)
+
+        start = sprint[3].date() if sprint[3] else rows[0][0]
+        end = min(sprint[4].date() if sprint[4] else rows[-1][0], date.today())
+        start = min(start, rows[0][0])
+        end = max(end, rows[-1][0])
+        n_days = (end - start).days + 1
+
+        # Rellenar hacia adelante: cada día toma la última instantánea disponible
+        positions = np.full(n_days, -1, dtype=np.int64)
+        positions[_day_index(recorded, start)] = np.arange(len(rows))
+        positions = np.maximum.accumulate(positions)
+        has_data = positions >= 0
+        positions = np.where(has_data, positions, 0)
+
+        total_series = np.where(has_data, total[positions], total[0])
+        remaining_series = np.where(has_data, remaining[positions], total[0])
+
+        sprint_days = n_days
+        if sprint[3] and sprint[4]:
+            sprint_days = max((sprint[4].date() - start).days + 1, 1)
+        ideal = np.linspace(total[0], 0, sprint_days)[:n_days]
+        ideal = np.pad(ideal, (0, n_days - len(ideal)), constant_values=0)
+
+        summary["dates"] = np.datetime_as_string(
+            np.datetime64(start, "D") + np.arange(n_days)
+        ).tolist()
+        summary["total"] = total_series.tolist()
+        summary["remaining"] = remaining_series.tolist()
+        summary["ideal"] = np.round(ideal, 2).tolist()
+        return summary
+
+    def get_velocity_trend(self, project_id: str, limit: int = 12) -> Dict[str, Any]:
+        """Velocidad por sprint con media móvil y pendiente de la tendencia"""
+        import numpy as np
+
+        sprints = SprintMetricsService(self.db).get_velocity(project_id, limit)
+        velocity = np.array([s["velocity"] for s in sprints], dtype=np.float64)
+
+        rolling: List[Optional[float]] = []
+        slope = 0.0
+        if len(velocity):
+            window = min(VELOCITY_WINDOW, len(velocity))
+            cumsum = np.cumsum(np.insert(velocity, 0, 0.0))
+            counts = np.minimum(np.arange(1, len(velocity) + 1), window)
+            starts = np.arange(1, len(velocity) + 1) - counts
+            rolling = np.round((cumsum[1:] - cumsum[starts]) / counts, 2).tolist()
+            if len(velocity) >= 2:
+                slope = float(np.polyfit(np.arange(len(velocity)), velocity, 1)[0])
+
+        return {
+            "sprints": [
+                {
+                    "sprint_id": s["sprint_id"],
+                    "name": s["name"],
+                    "status": s["status"],
+                    "end_date": s["end_date"],
+                    "velocity": s["velocity"],
+                    "completed_stories": s["completed_stories"]
+                }
+                for s in sprints
+            ],
+            "rolling_average": rolling,
+            "average_velocity": round(float(velocity.mean()), 2) if len(velocity) else 0.0,
+            "trend_slope": round(slope, 3)
+        }
+
+    def get_cumulative_flow(self, project_id: str, days: int = 90) -> List[Dict[str, Any]]:
+        """
+        Flujo acumulado por tablero: cantidad de tarjetas en cada lista por día.
+
+        Se reconstruye a partir de card_events (+1 al entrar a una lista, -1 al
+        salir o al eliminarse). Las tarjetas eliminadas conservan su historial
+        hasta el día en que se eliminaron. Las tarjetas anteriores al registro se
+        ubican en su lista inicial desde su fecha de creación, o desde el inicio
+        del registro del tablero si ya se eliminaron.
+        """
+        import numpy as np
+
+        lists = self.db.execute(text("""
+            SELECT b.id, b.name, l.id, l.name
+            FROM boards b
+            JOIN lists l ON l.board_id = b.id
+            WHERE b.project_id = :project_id
+            ORDER BY b.created_at, l.position
+        """), {"project_id": project_id}).fetchall()
+        if not lists:
+            return []
+
+        # Movimientos de tarjetas, incluidas las eliminadas. Las eliminadas antes de
+        # registrar el evento 'deleted' no tienen salida y se omiten.
+        events = self.db.execute(text("""
+            WITH deleted AS (
+                SELECT DISTINCT e.card_id
+                FROM card_events e
+                JOIN boards b ON b.id = e.board_id
+                WHERE b.project_id = :project_id AND e.event_type = 'deleted'
+            )
+            SELECT e.from_list_id, e.to_list_id, e.ts::date
+            FROM card_events e
+            JOIN boards b ON b.id = e.board_id
+            LEFT JOIN cards c ON c.id = e.card_id
+            LEFT JOIN deleted d ON d.card_id = e.card_id
+            WHERE b.project_id = :project_id AND e.event_type IN ('created', 'moved', 'deleted')
+              AND (c.id IS NOT NULL OR d.card_id IS NOT NULL)
+        """), {"project_id": project_id}).fetchall()
+
+        # Ubicación inicial de las tarjetas sin evento de creación: la lista de
+        # origen de su primer evento o, sin eventos, su lista actual. Las que ya se
+        # eliminaron existían antes del registro y se ubican desde su inicio.
+        seeds = self.db.execute(text("""
+            WITH project_events AS (
+                SELECT e.*
+                FROM card_events e
+                JOIN boards b ON b.id = e.board_id
+                WHERE b.project_id = :project_id AND e.event_type IN ('created', 'moved', 'deleted')
+            ),
+            first_events AS (
+                SELECT DISTINCT ON (card_id) card_id, board_id, event_type, from_list_id
+                FROM project_events
+                ORDER BY card_id, ts, id
+            ),
+            log_start AS (
+                SELECT board_id, MIN(ts)::date AS day
+                FROM project_events
+                GROUP BY board_id
+            ),
+            deleted AS (
+                SELECT DISTINCT card_id FROM project_events WHERE event_type = 'deleted'
+            )
+            SELECT CASE WHEN f.event_type IS NULL THEN c.list_id ELSE f.from_list_id END,
+                   c.created_at::date
+            FROM cards c
+            JOIN lists l ON c.list_id = l.id
+            JOIN boards b ON l.board_id = b.id
+            LEFT JOIN first_events f ON f.card_id = c.id
+            WHERE b.project_id = :project_id
+              AND (f.event_type IS NULL OR f.event_type <> 'created')
+            UNION ALL
+            SELECT f.from_list_id, s.day
+            FROM first_events f
+            JOIN deleted d ON d.card_id = f.card_id
+            JOIN log_start s ON s.board_id = f.board_id
+            LEFT JOIN cards c ON c.id = f.card_id
+            WHERE f.event_type <> 'created' AND c.id IS NULL
+        """), {"project_id": project_id}).fetchall()
+
+        end = date.today()
+        start = end - timedelta(days=days - 1)
+        list_index = {row[2]: i for i, row in enumerate(lists)}
+
+        # Matriz listas x días con las variaciones diarias; la suma acumulada da el inventario.
+        # Lo ocurrido antes del periodo se acumula en el primer día.
+        deltas = np.zeros((len(lists), days), dtype=np.int64)
+
+        def accumulate(list_ids: List[Optional[str]], days_: List[date], sign: int) -> None:
+            if not list_ids:
+                return
+            rows = np.array([list_index.get(list_id, -1) for list_id in list_ids], dtype=np.int64)
+            offsets = np.clip(_day_index(np.array(days_, dtype="datetime64[D]"), start), 0, None)
+            mask = (rows >= 0) & (offsets < days)
+            np.add.at(deltas, (rows[mask], offsets[mask]), sign)
+
+        accumulate([s[0] for s in seeds], [s[1] for s in seeds], 1)
+        accumulate([e[1] for e in events], [e[2] for e in events], 1)
+        accumulate([e[0] for e in events], [e[2] for e in events], -1)
+        counts = np.cumsum(deltas, axis=1)
+
+        dates = np.datetime_as_string(np.datetime64(start, "D") + np.arange(days)).tolist()
+
+        boards: Dict[str, Dict[str, Any]] = {}
+        for i, (board_id, board_name, list_id, list_name) in enumerate(lists):
+            board = boards.setdefault(board_id, {
+                "board_id": board_id,
+                "name": board_name,
+                "dates": dates,
+                "lists": []
+            })
+            board["lists"].append({
+                "list_id": list_id,
+                "name": list_name,
+                "counts": counts[i].tolist()
+            })
+        return list(boards.values())
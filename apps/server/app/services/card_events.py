@@ -0,0 +1,155 @@
+"""
+Registro de eventos de tarjetas (card_events) y métricas de flujo derivadas
+"""
+
+from typing import Any, Dict, Optional
+from sqlmodel import Session
+from sqlalchemy.sql import text
+
+_INSERT_EVENT_SQL = text("""
+    INSERT INTO card_events (card_id, board_id, event_type, from_list_id, to_list_id, assignee_id, actor_id, ts)
+    VALUES (:card_id, :board_id, :event_type, :from_list_id, :to_list_id, :assignee_id, :actor_id, NOW())
+""")
+
+# Percentiles reportados para lead time y cycle time
+FLOW_PERCENTILES = (0.5, 0.85, 0.95)
+
+
+def record_card_event(
+    db: Session,
+    card_id: str,
+    board_id: str,
+    event_type: str,
+    from_list_id: Optional[str] = None,
+    to_list_id: Optional[str] = None,
+    assignee_id: Optional[str] = None,
+    actor_id: Optional[str] = None
+) -> None:
+    """
+    Agregar un evento al registro sin confirmar la transacción.
+
+    Debe llamarse antes del commit que persiste el cambio de la tarjeta para
+    que ambos queden en la misma transacción.
+    """
+    db.execute(_INSERT_EVENT_SQL, {
+        "card_id": card_id,
+        "board_id": board_id,
+        "event_type": event_type,
+        "from_list_id": from_list_id,
+        "to_list_id": to_list_id,
+        "assignee_id": assignee_id,
+        "actor_id": actor_id
+    })
+
+
+class FlowMetricsService:
+    """Lead time y cycle time de un tablero calculados sobre card_events"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def resolve_lists(
+        self,
+        board_id: str,
+        start_list_id: Optional[str] = None,
+        done_list_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Determinar la lista de inicio de trabajo y la lista de terminado.
+
+        Por defecto la lista terminada es la de mayor posición y el trabajo
+        comienza en la primera lista "en progreso" (o la segunda del tablero).
+        """
+        rows = self.db.execute(text("""
+            SELECT id, name, position
+            FROM lists
+            WHERE board_id = :board_id
+            ORDER BY position
+        """), {"board_id": board_id}).fetchall()
+        if not rows:
+            return None
+
+        by_id = {row[0]: row for row in rows}
+        done = by_id.get(done_list_id) or rows[-1]
+        start = by_id.get(start_list_id)
+        if not start:
+            in_progress = [row for row in rows if "progres" in row[1].lower()]
+            start = in_progress[0] if in_progress else rows[min(1, len(rows) - 1)]
+
+        return {
+            "start_list_id": start[0],
+            "start_list_name": start[1],
+            "start_position": start[2],
+            "done_list_id": done[0],
+            "done_list_name": done[1]
+        }
+
+    def get_flow_metrics(
+        self,
+        board_id: str,
+        days: int = 90,
+        start_list_id: Optional[str] = None,
+        done_list_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Percentiles de lead time y cycle time (en días) de las tarjetas terminadas en el periodo"""
+        lists = self.resolve_lists(board_id, start_list_id, done_list_id)
+        if not lists:
+            return {"board_id": board_id, "days": days, "completed_cards": 0, "lead_time": None, "cycle_time": None}
+
+        # Una fila por tarjeta terminada: creación, inicio del trabajo y última entrada
+        # a la lista terminada. Las tarjetas anteriores al registro usan cards.created_at.
+        query = text("""
+            WITH spans AS (
+                SELECT
+                    e.card_id,
+                    COALESCE(MIN(e.ts) FILTER (WHERE e.event_type = 'created'), c.created_at) AS created_at,
+                    MIN(e.ts) FILTER (WHERE l.position >= :start_position) AS started_at,
+                    MAX(e.ts) FILTER (WHERE e.to_list_id = :done_list_id) AS done_at
+                FROM card_events e
+                JOIN cards c ON c.id = e.card_id AND c.list_id = :done_list_id
+                LEFT JOIN lists l ON l.id = e.to_list_id
+                WHERE e.board_id = :board_id
+                GROUP BY e.card_id, c.created_at
+            ),
+            durations AS (
+                SELECT
+                    EXTRACT(EPOCH FROM (done_at - created_at)) / 86400 AS lead_days,
+                    EXTRACT(EPOCH FROM (done_at - started_at)) / 86400 AS cycle_days
+                FROM spans
+                WHERE done_at >= NOW() - make_interval(days => :days)
+            )
+            SELECT
+                COUNT(*),
+                AVG(lead_days),
+                percentile_cont(CAST(:percentiles AS float8[])) WITHIN GROUP (ORDER BY lead_days),
+                COUNT(cycle_days),
+                AVG(cycle_days),
+                percentile_cont(CAST(:percentiles AS float8[])) WITHIN GROUP (ORDER BY cycle_days)
+            FROM durations
+        """)
+        row = self.db.execute(query, {
+            "board_id": board_id,
+            "done_list_id": lists["done_list_id"],
+            "start_position": lists["start_position"],
+            "days": days,
+            "percentiles": list(FLOW_PERCENTILES)
+        }).fetchone()
+
+        return {
+            "board_id": board_id,
+            "days": days,
+            "start_list": {"id": lists["start_list_id"], "name": lists["start_list_name"]},
+            "done_list": {"id": lists["done_list_id"], "name": lists["done_list_name"]},
+            "completed_cards": row[0] or 0,
+            "lead_time": self._summary(row[0], row[1], row[2]),
+            "cycle_time": self._summary(row[3], row[4], row[5])
+        }
+
+    @staticmethod
+    def _summary(count: Optional[int], average: Optional[float], percentiles) -> Optional[Dict[str, Any]]:
+        if not count:
+            return None
+        summary = {"count": count, "average_days": round(float(average), 2)}
+        for p, value in zip(FLOW_PERCENTILES, percentiles or []):
+            summary[f"p{int(p * 100)}_days"] = round(float(value), 2) if value is not None else None
+        return summary
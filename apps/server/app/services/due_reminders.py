@@ -0,0 +1,163 @@
+"""
+Recordatorios de vencimiento de tarjetas.
+
+Tarea periódica que avisa al asignado de cada tarjeta con dos umbrales:
+`card_due_soon` cuando faltan DUE_REMINDER_WINDOW_HOURS horas para el
+vencimiento y `card_overdue` cuando la fecha pasa. Las notificaciones se crean
+con `create_notification`, igual que las del tablero.
+
+La búsqueda es incremental: cada ejecución guarda hasta dónde llegó
+(scheduler_watermarks) y la siguiente solo lee, por el índice de due_date, las
+tarjetas que entraron en una ventana desde entonces, más las editadas en ese
+intervalo cuya nueva fecha ya está dentro de la ventana. El trabajo depende de
+lo que cambió entre ejecuciones, no del total de tarjetas. card_reminders
+registra cada aviso en la misma transacción que la notificación, así cada
+tarjeta recibe un aviso por umbral y fecha aunque una ejecución se repita.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlmodel import Session
+from sqlalchemy.sql import text
+
+from app.core.config import settings
+from app.core.metrics import DUE_REMINDERS_SENT
+from app.routers.notifications import create_notification
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_JOB = "card_due_reminders"
+
+# Tres rangos acotados por el tiempo transcurrido desde la última ejecución:
+# vencidas en (since, now], que entran en la ventana en (since + W, now + W] y
+# editadas desde `since` con la fecha ya dentro de la ventana
+_CANDIDATES_SQL = text("""
+    WITH candidates AS (
+        SELECT id, 'card_overdue' AS threshold FROM cards
+        WHERE due_date > :since AND due_date <= :now
+        UNION
+        SELECT id, 'card_due_soon' FROM cards
+        WHERE due_date > :since_window AND due_date <= :now_window
+        UNION
+        SELECT id, 'card_due_soon' FROM cards
+        WHERE due_date IS NOT NULL AND updated_at >= :since
+        AND due_date > :now AND due_date <= :since_window
+    )
+    SELECT c.id, c.title, c.due_date, c.assignee_id, l.board_id, t.threshold
+    FROM candidates t
+    JOIN cards c ON c.id = t.id
+    JOIN lists l ON l.id = c.list_id
+    WHERE c.is_active = true
+    AND c.assignee_id IS NOT NULL
+    AND NOT EXISTS (
+        SELECT 1 FROM card_reminders r
+        WHERE r.card_id = c.id AND r.threshold = t.threshold AND r.due_date = c.due_date
+    )
+    ORDER BY c.due_date
+""")
+
+# Reclamar el aviso; no devuelve fila si ya se envió
+_CLAIM_SQL = text("""
+    INSERT INTO card_reminders (card_id, threshold, due_date, created_at)
+    VALUES (:card_id, :threshold, :due_date, NOW())
+    ON CONFLICT DO NOTHING
+    RETURNING card_id
+""")
+
+
+def _get_watermark(db: Session) -> Optional[datetime]:
+    row = db.execute(text("""
+        SELECT scanned_until FROM scheduler_watermarks WHERE job = :job
+    """), {"job": WATERMARK_JOB}).fetchone()
+    return row[0] if row else None
+
+
+def _set_watermark(db: Session, scanned_until: datetime) -> None:
+    db.execute(text("""
+        INSERT INTO scheduler_watermarks (job, scanned_until, updated_at)
+        VALUES (:job, :scanned_until, NOW())
+        ON CONFLICT (job) DO UPDATE
+        SET scanned_until = EXCLUDED.scanned_until, updated_at = NOW()
+    """), {"job": WATERMARK_JOB, "scanned_until": scanned_until})
+    db.commit()
+
+
+def _reminder_content(threshold: str, title: str, due_date: datetime) -> str:
+    due = due_date.strftime("%d/%m/%Y %H:%M")
+    if threshold == "card_overdue":
+        return f'La tarjeta "{title}" venció el {due}'
+    return f'La tarjeta "{title}" vence el {due}'
+
+
+async def send_due_reminders(db: Session, window: timedelta, max_catchup: timedelta) -> int:
+    """
+    Crear los avisos de vencimiento pendientes desde la última ejecución.
+
+    La primera ejecución solo registra el punto de partida. Tras una parada más
+    larga que `max_catchup`, los vencimientos anteriores a ese margen se omiten.
+
+    Returns:
+        int: Número de notificaciones creadas
+    """
+    now = db.execute(text("SELECT LOCALTIMESTAMP")).scalar()
+    since = _get_watermark(db)
+    if since is None:
+        _set_watermark(db, now)
+        logger.info("Recordatorios de vencimiento: punto de partida registrado")
+        return 0
+    since = max(since, now - max_catchup)
+
+    candidates = db.execute(_CANDIDATES_SQL, {
+        "since": since,
+        "now": now,
+        "since_window": since + window,
+        "now_window": now + window,
+    }).fetchall()
+
+    sent = 0
+    for card_id, title, due_date, assignee_id, board_id, threshold in candidates:
+        try:
+            claimed = db.execute(_CLAIM_SQL, {
+                "card_id": card_id,
+                "threshold": threshold,
+                "due_date": due_date,
+            }).fetchone()
+            if not claimed:
+                db.rollback()
+                continue
+            # create_notification confirma la transacción: aviso y registro quedan juntos
+            await create_notification(
+                db=db,
+                user_id=assignee_id,
+                content=_reminder_content(threshold, title, due_date),
+                notification_type=threshold,
+                entity_id=card_id,
+                data={
+                    "card_id": card_id,
+                    "card_title": title,
+                    "board_id": board_id,
+                    "due_date": due_date.isoformat(),
+                }
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error creando recordatorio {threshold} para la tarjeta {card_id}: {e}")
+            continue
+        DUE_REMINDERS_SENT.labels(threshold).inc()
+        sent += 1
+
+    _set_watermark(db, now)
+    return sent
+
+
+async def send_due_reminders_job(db: Session) -> int:
+    """Tarea periódica: avisos de tarjetas por vencer y vencidas"""
+    sent = await send_due_reminders(
+        db,
+        window=timedelta(hours=settings.DUE_REMINDER_WINDOW_HOURS),
+        max_catchup=timedelta(hours=settings.DUE_REMINDER_MAX_CATCHUP_HOURS),
+    )
+    logger.info(f"Recordatorios de vencimiento creados: {sent}")
+    return sent
@@ -0,0 +1,136 @@
+"""
+Envío de emails de notificación en segundo plano.
+
+Las notificaciones encolan sus emails con `email_dispatcher.enqueue(...)` y la
+petición (o tarea programada) termina sin esperar a Mailjet. Tareas del event
+loop principal toman los emails de la cola y los envían en lotes de hasta
+EMAIL_BATCH_SIZE mensajes por llamada a la API v3.1. `enqueue` se puede llamar
+desde otro hilo (p. ej. tareas del planificador): los emails se pasan al loop
+principal con call_soon_threadsafe, así el cliente HTTP compartido solo se usa
+desde su propio loop.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import EMAIL_QUEUE_DEPTH, EMAIL_QUEUE_DROPPED
+from app.services.email_service import email_service
+
+logger = logging.getLogger(__name__)
+
+
+class EmailDispatcher:
+    """Cola acotada de emails atendida por tareas del event loop principal"""
+
+    def __init__(self, batch_size: int = 50, max_queue: int = 10000, workers: int = 2):
+        self.batch_size = max(1, min(batch_size, 50))  # Mailjet acepta hasta 50 mensajes por envío
+        self.max_queue = max_queue
+        self.workers = max(1, workers)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[Optional[Dict[str, Any]]]"] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+
+    async def start(self) -> None:
+        """Iniciar las tareas de envío en el loop actual"""
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"email-dispatcher-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Enviar lo pendiente (hasta `timeout` segundos) y detener las tareas"""
+        if not self._tasks:
+            return
+        for _ in self._tasks:
+            await self._queue.put(None)
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"{self._queue.qsize()} email(s) sin enviar al detener el despachador")
+        self._tasks = []
+        self._loop = None
+
+    def enqueue(self, emails: List[Dict[str, Any]]) -> None:
+        """
+        Encolar emails (argumentos de EmailService.build_message).
+
+        Seguro desde cualquier hilo; si el despachador no está iniciado o la
+        cola está llena, los emails se descartan y se registran en métricas.
+        """
+        if not emails or not email_service.enabled:
+            return
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            logger.warning(f"Despachador de emails no iniciado, se descartan {len(emails)} email(s)")
+            EMAIL_QUEUE_DROPPED.inc(len(emails))
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._put_many(emails)
+        else:
+            loop.call_soon_threadsafe(self._put_many, list(emails))
+
+    def _put_many(self, emails: List[Dict[str, Any]]) -> None:
+        dropped = 0
+        for email in emails:
+            try:
+                self._queue.put_nowait(email)
+            except asyncio.QueueFull:
+                dropped += 1
+        if dropped:
+            logger.error(f"Cola de emails llena, se descartan {dropped} email(s)")
+            EMAIL_QUEUE_DROPPED.inc(dropped)
+        EMAIL_QUEUE_DEPTH.set(self._queue.qsize())
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            # Completar el lote con lo que ya está en la cola, sin esperar
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            EMAIL_QUEUE_DEPTH.set(self._queue.qsize())
+
+            try:
+                await self._send(batch)
+            except Exception as e:
+                logger.error(f"Error enviando lote de {len(batch)} email(s): {e}")
+
+    async def _send(self, batch: List[Dict[str, Any]]) -> None:
+        messages = []
+        for email in batch:
+            try:
+                message = await email_service.build_message(**email)
+            except Exception as e:
+                logger.error(f"Error generando email para {email.get('to_email')}: {e}")
+                continue
+            messages.append((email["notification_type"], message))
+        await email_service.send_batch(messages)
+
+
+# Instancia global del despachador
+email_dispatcher = EmailDispatcher(
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    max_queue=settings.EMAIL_QUEUE_MAX,
+    workers=settings.EMAIL_DISPATCH_WORKERS,
+)
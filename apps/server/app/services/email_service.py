@@ -1,7 +1,10 @@
 import logging
-from typing import Optional, Dict, Any
-from mailjet_rest import Client
+from typing import Any, Dict, List, Optional, Tuple
 from app.core.config import settings
+from app.core.metrics import MAILJET_SEND_DURATION, MAILJET_SENDS
+from app.services.email_templates import email_templates
+from app.services.mailjet_transport import MailjetTransport
+import threading
 import time
 from pydantic import BaseModel
 
@@ -15,6 +18,21 @@ email_metrics = {
     "total_send_time": 0.0,
     "last_email_timestamp": None
 }
+_metrics_lock = threading.Lock()
+
+# Asunto del email según el tipo de notificación
+NOTIFICATION_SUBJECTS = {
+    "card_assigned": "📋 Te han asignado una nueva tarjeta",
+    "card_comment": "💬 Nuevo comentario en tu tarjeta",
+    "card_updated": "✏️ Tu tarjeta ha sido actualizada",
+    "card_due_soon": "⏰ Una de tus tarjetas está por vencer",
+    "card_overdue": "⏰ Una de tus tarjetas está vencida",
+    "project_invitation": "👥 Invitación a nuevo proyecto",
+    "project_obsolete": "⚠️ Proyecto marcado como obsoleto",
+}
+
+def notification_subject(notification_type: str) -> str:
+    return NOTIFICATION_SUBJECTS.get(notification_type, "🔔 Nueva notificación")
 
 class EmailTemplate(BaseModel):
     """Template de email"""
@@ -23,25 +41,24 @@ class EmailTemplate(BaseModel):
     text_content: Optional[str] = None
 
 class EmailService:
-    """Servicio para envío de emails con Mailjet"""
+    """Servicio para envío de emails con Mailjet (API v3.1, ver mailjet_transport)"""
     
     def __init__(self):
-        self.mailjet = None
-        self.enabled = settings.ENABLE_EMAIL_NOTIFICATIONS
+        self._transport: Optional[MailjetTransport] = None
+        self.enabled = bool(
+            settings.ENABLE_EMAIL_NOTIFICATIONS and settings.MAILJET_API_KEY and settings.MAILJET_SECRET_KEY
+        )
         
-        if self.enabled and settings.MAILJET_API_KEY and settings.MAILJET_SECRET_KEY:
-            try:
-                self.mailjet = Client(
-                    auth=(settings.MAILJET_API_KEY, settings.MAILJET_SECRET_KEY),
-                    version='v3.1'
-                )
-                logger.info("✅ Mailjet configurado correctamente")
-            except Exception as e:
-                logger.error(f"❌ Error configurando Mailjet: {e}")
-                self.enabled = False
-        else:
+        if not self.enabled:
             logger.info("ℹ️ Servicio de email deshabilitado o no configurado")
     
+    @property
+    def transport(self) -> Optional[MailjetTransport]:
+        """Transporte asíncrono de Mailjet, creado en el primer envío"""
+        if self._transport is None and self.enabled:
+            self._transport = MailjetTransport.from_settings()
+        return self._transport
+    
     async def send_notification_email(
         self,
         to_email: str,
@@ -65,177 +82,138 @@ class EmailService:
         Returns:
             bool: True si se envió correctamente, False en caso contrario
         """
-        if not self.enabled or not self.mailjet:
+        if not self.enabled or not self.transport:
             logger.debug("Servicio de email deshabilitado")
             return False
         
-        start_time = time.time()
-        
         try:
-            # Generar template HTML
-            html_content = self._generate_html_template(
+            message = await self.build_message(
+                to_email=to_email,
                 to_name=to_name,
                 notification_type=notification_type,
+                subject=subject,
                 content=content,
                 entity_data=entity_data
             )
-            
-            # Configurar mensaje
-            data = {
-                'Messages': [
-                    {
-                        "From": {
-                            "Email": settings.FROM_EMAIL,
-                            "Name": settings.FROM_NAME
-                        },
-                        "To": [
-                            {
-                                "Email": to_email,
-                                "Name": to_name
-                            }
-                        ],
-                        "Subject": subject,
-                        "TextPart": content,  # Versión texto plano
-                        "HTMLPart": html_content,  # Versión HTML
-                        "CustomID": f"{notification_type}_{int(time.time())}"
-                    }
-                ]
-            }
-            
-            # Enviar email
-            result = self.mailjet.send.create(data=data)
-            
-            # Calcular tiempo de envío
-            send_time = time.time() - start_time
-            
-            # Registrar métricas
-            self._update_metrics(
-                success=result.status_code == 200,
-                notification_type=notification_type,
-                send_time=send_time
-            )
-            
-            if result.status_code == 200:
-                logger.info(f"✅ Email enviado correctamente a {to_email} ({notification_type})")
-                return True
-            else:
-                logger.error(f"❌ Error enviando email: {result.status_code} - {result.json()}")
-                return False
-                
         except Exception as e:
-            send_time = time.time() - start_time
-            self._update_metrics(success=False, notification_type=notification_type, send_time=send_time)
-            logger.error(f"❌ Excepción enviando email a {to_email}: {e}")
+            self._update_metrics(success=False, notification_type=notification_type, send_time=0.0)
+            logger.error(f"❌ Error generando email para {to_email}: {e}")
             return False
+        
+        sent = await self.send_batch([(notification_type, message)])
+        return sent == 1
     
-    def _generate_html_template(
+    async def build_message(
         self,
+        to_email: str,
         to_name: str,
         notification_type: str,
+        subject: str,
         content: str,
         entity_data: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Generar template HTML para el email"""
-        
-        # Determinar color y icono según el tipo
-        type_config = {
-            "card_assigned": {"color": "#3B82F6", "icon": "📋", "title": "Nueva asignación"},
-            "card_comment": {"color": "#10B981", "icon": "💬", "title": "Nuevo comentario"},
-            "card_updated": {"color": "#F59E0B", "icon": "✏️", "title": "Tarjeta actualizada"},
-            "project_invitation": {"color": "#8B5CF6", "icon": "👥", "title": "Invitación a proyecto"},
-            "project_obsolete": {"color": "#EF4444", "icon": "⚠️", "title": "Proyecto marcado como obsoleto"},
-            "default": {"color": "#6B7280", "icon": "🔔", "title": "Notificación"}
+    ) -> Dict[str, Any]:
+        """Mensaje de la API v3.1 con la versión HTML y la de texto plano"""
+        # Generar HTML con la plantilla compilada (fuera del event loop si es grande)
+        html_content = await email_templates.render_async(
+            to_name=to_name,
+            notification_type=notification_type,
+            content=content,
+            entity_data=entity_data
+        )
+        return {
+            "From": {
+                "Email": settings.FROM_EMAIL,
+                "Name": settings.FROM_NAME
+            },
+            "To": [
+                {
+                    "Email": to_email,
+                    "Name": to_name
+                }
+            ],
+            "Subject": subject,
+            "TextPart": content,  # Versión texto plano
+            "HTMLPart": html_content,  # Versión HTML
+            "CustomID": f"{notification_type}_{int(time.time())}"
         }
+    
+    async def send_batch(self, messages: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Enviar hasta 50 mensajes (límite de Mailjet por petición) en una sola llamada.
         
-        config = type_config.get(notification_type, type_config["default"])
-        
-        # Generar enlace si hay datos de entidad
-        action_link = ""
-        if entity_data:
-            if "card_id" in entity_data and "board_id" in entity_data:
-                action_link = f'<p style="margin: 20px 0;"><a href="http://localhost:3000/boards/{entity_data["board_id"]}" style="background-color: {config["color"]}; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">Ver tarjeta</a></p>'
-        
-        html_template = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{config['title']}</title>
-        </head>
-        <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f8fafc;">
-            <div style="max-width: 600px; margin: 0 auto; background-color: white; border-radius: 8px; overflow: hidden; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);">
-                
-                <!-- Header -->
-                <div style="background-color: {config['color']}; color: white; padding: 24px; text-align: center;">
-                    <h1 style="margin: 0; font-size: 24px; font-weight: 600;">
-                        {config['icon']} {config['title']}
-                    </h1>
-                </div>
-                
-                <!-- Content -->
-                <div style="padding: 32px;">
-                    <h2 style="color: #1f2937; margin: 0 0 16px 0; font-size: 18px;">
-                        Hola {to_name},
-                    </h2>
-                    
-                    <p style="color: #4b5563; line-height: 1.6; margin: 0 0 24px 0; font-size: 16px;">
-                        {content}
-                    </p>
-                    
-                    {action_link}
-                    
-                    <hr style="border: none; height: 1px; background-color: #e5e7eb; margin: 24px 0;">
-                    
-                    <p style="color: #6b7280; font-size: 14px; margin: 0;">
-                        Este mensaje fue enviado automáticamente por el Sistema de Gestión de Proyectos Ágiles.
-                        <br>
-                        <a href="http://localhost:3000/profile" style="color: {config['color']};">Configurar preferencias de email</a>
-                    </p>
-                </div>
-                
-                <!-- Footer -->
-                <div style="background-color: #f9fafb; padding: 16px; text-align: center; border-top: 1px solid #e5e7eb;">
-                    <p style="color: #9ca3af; font-size: 12px; margin: 0;">
-                        © 2024 Sistema de Gestión de Proyectos Ágiles
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
+        Args:
+            messages: Pares (tipo de notificación, mensaje de build_message)
+            
+        Returns:
+            int: Número de mensajes aceptados por Mailjet
         """
+        if not messages:
+            return 0
+        if not self.enabled or not self.transport:
+            logger.debug("Servicio de email deshabilitado")
+            return 0
+        
+        start_time = time.time()
+        statuses: List[bool] = [False] * len(messages)
+        try:
+            # Enviar (asíncrono, con reintentos en fallos transitorios)
+            result = await self.transport.send({"Messages": [message for _, message in messages]})
+            statuses = result.message_statuses(len(messages))
+            if not result.ok:
+                logger.error(
+                    f"❌ Mailjet respondió {result.status_code}: {len(messages) - sum(statuses)} de "
+                    f"{len(messages)} email(s) rechazados - {result.body}"
+                )
+        except Exception as e:
+            logger.error(f"❌ Excepción enviando {len(messages)} email(s): {e}")
         
-        return html_template
+        # Registrar métricas (el tiempo del lote se reparte entre sus mensajes)
+        send_time = (time.time() - start_time) / len(messages)
+        for (notification_type, message), success in zip(messages, statuses):
+            self._update_metrics(success=success, notification_type=notification_type, send_time=send_time)
+            if success:
+                logger.info(f"✅ Email enviado correctamente a {message['To'][0]['Email']} ({notification_type})")
+        return sum(statuses)
     
     def _update_metrics(self, success: bool, notification_type: str, send_time: float):
-        """Actualizar métricas para Apitally"""
+        """Actualizar métricas para Apitally y Prometheus"""
         global email_metrics
         
-        if success:
-            email_metrics["emails_sent"] += 1
-        else:
-            email_metrics["emails_failed"] += 1
-        
-        # Contar por tipo
-        type_key = f"type_{notification_type}"
-        if type_key not in email_metrics["emails_sent_by_type"]:
-            email_metrics["emails_sent_by_type"][type_key] = 0
-        email_metrics["emails_sent_by_type"][type_key] += 1
+        MAILJET_SEND_DURATION.observe(send_time)
+        MAILJET_SENDS.labels("success" if success else "failure", notification_type).inc()
         
-        # Tiempo total
-        email_metrics["total_send_time"] += send_time
-        email_metrics["last_email_timestamp"] = time.time()
+        with _metrics_lock:
+            if success:
+                email_metrics["emails_sent"] += 1
+            else:
+                email_metrics["emails_failed"] += 1
+            
+            # Contar por tipo
+            type_key = f"type_{notification_type}"
+            if type_key not in email_metrics["emails_sent_by_type"]:
+                email_metrics["emails_sent_by_type"][type_key] = 0
+            email_metrics["emails_sent_by_type"][type_key] += 1
+            
+            # Tiempo total
+            email_metrics["total_send_time"] += send_time
+            email_metrics["last_email_timestamp"] = time.time()
     
     def get_metrics(self) -> Dict[str, Any]:
         """Obtener métricas para Apitally"""
+        with _metrics_lock:
+            snapshot = {
+                **email_metrics,
+                "emails_sent_by_type": dict(email_metrics["emails_sent_by_type"])
+            }
+        
         avg_send_time = 0
-        if email_metrics["emails_sent"] > 0:
-            avg_send_time = email_metrics["total_send_time"] / email_metrics["emails_sent"]
+        if snapshot["emails_sent"] > 0:
+            avg_send_time = snapshot["total_send_time"] / snapshot["emails_sent"]
         
         return {
-            **email_metrics,
+            **snapshot,
             "average_send_time": avg_send_time,
-            "success_rate": email_metrics["emails_sent"] / max(email_metrics["emails_sent"] + email_metrics["emails_failed"], 1) * 100
+            "success_rate": snapshot["emails_sent"] / max(snapshot["emails_sent"] + snapshot["emails_failed"], 1) * 100
         }
 
 # Instancia global del servicio
@@ -0,0 +1,104 @@
+"""
+Plantillas HTML de los emails de notificación.
+
+Las plantillas Jinja2 de app/templates/email se compilan una sola vez (al
+arrancar, con `load()`, o en el primer envío) y se guardan por tipo de
+notificación: un tipo usa `<tipo>.html` si existe y si no `notification.html`.
+Renderizar una plantilla compilada es barato; los renders grandes (contenido
+por encima de EMAIL_RENDER_OFFLOAD_BYTES) se hacen en un hilo con
+`render_async` para no ocupar el event loop.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from jinja2 import Template
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "email")
+
+# Color, icono y título del encabezado según el tipo de notificación
+TYPE_CONFIG: Dict[str, Dict[str, str]] = {
+    "card_assigned": {"color": "#3B82F6", "icon": "📋", "title": "Nueva asignación"},
+    "card_comment": {"color": "#10B981", "icon": "💬", "title": "Nuevo comentario"},
+    "card_updated": {"color": "#F59E0B", "icon": "✏️", "title": "Tarjeta actualizada"},
+    "card_due_soon": {"color": "#F97316", "icon": "⏰", "title": "Tarjeta por vencer"},
+    "card_overdue": {"color": "#DC2626", "icon": "⏰", "title": "Tarjeta vencida"},
+    "project_invitation": {"color": "#8B5CF6", "icon": "👥", "title": "Invitación a proyecto"},
+    "project_obsolete": {"color": "#EF4444", "icon": "⚠️", "title": "Proyecto marcado como obsoleto"},
+    "default": {"color": "#6B7280", "icon": "🔔", "title": "Notificación"},
+}
+
+
+class EmailTemplateRenderer:
+    """Plantillas compiladas y cacheadas por tipo de notificación"""
+
+    def __init__(self, templates_dir: str = TEMPLATES_DIR):
+        self.templates_dir = templates_dir
+        self._templates: Dict[str, "Template"] = {}
+        self._lock = threading.RLock()
+
+    def load(self) -> None:
+        """Compilar las plantillas de todos los tipos conocidos"""
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+        env = Environment(
+            loader=FileSystemLoader(self.templates_dir),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+        )
+        templates = {
+            notification_type: env.select_template([f"{notification_type}.html", "notification.html"])
+            for notification_type in TYPE_CONFIG
+        }
+        with self._lock:
+            self._templates = templates
+        logger.info("Plantillas de email compiladas: %s tipos", len(templates))
+
+    def _template(self, notification_type: str) -> "Template":
+        if not self._templates:
+            with self._lock:
+                if not self._templates:
+                    self.load()
+        return self._templates.get(notification_type) or self._templates["default"]
+
+    def render(
+        self,
+        to_name: str,
+        notification_type: str,
+        content: str,
+        entity_data: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """HTML del email (el contenido se escapa)"""
+        return self._template(notification_type).render(
+            config=TYPE_CONFIG.get(notification_type, TYPE_CONFIG["default"]),
+            to_name=to_name,
+            content=content,
+            entity_data=entity_data or {},
+            frontend_url=settings.FRONTEND_URL.rstrip("/"),
+            year=datetime.now().year,
+        )
+
+    async def render_async(
+        self,
+        to_name: str,
+        notification_type: str,
+        content: str,
+        entity_data: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Como `render`, pero los contenidos grandes se renderizan en un hilo"""
+        if len(content) > settings.EMAIL_RENDER_OFFLOAD_BYTES:
+            return await asyncio.to_thread(self.render, to_name, notification_type, content, entity_data)
+        return self.render(to_name, notification_type, content, entity_data)
+
+
+# Instancia global de las plantillas
+email_templates = EmailTemplateRenderer()
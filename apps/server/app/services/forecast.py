@@ -0,0 +1,274 @@
+"""
+Pronóstico de finalización del backlog por simulación Monte Carlo.
+
+Se muestrea el throughput histórico (historias terminadas por sprint según
+sprint_metrics, o por semana según user_stories si no hay suficientes sprints)
+y se simulan miles de escenarios de forma vectorizada con NumPy.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from sqlmodel import Session
+from sqlalchemy.sql import text
+
+from app.core.cache import ProjectCache
+
+# NumPy se importa dentro de las funciones que lo usan: cargarlo al importar el
+# módulo encarecía el arranque de cada worker aunque nadie pidiera analíticas
+if TYPE_CHECKING:
+    import numpy as np
+
+# Pronósticos por (proyecto, parámetros, huella del estado)
+forecast_cache = ProjectCache("forecast", ttl_seconds=3600)
+
+FORECAST_PERCENTILES = (50, 70, 85, 95)
+
+# Sprints terminados necesarios para usar throughput por sprint
+MIN_SPRINT_SAMPLES = 3
+
+# Semanas de historia usadas cuando no hay suficientes sprints
+FALLBACK_WEEKS = 12
+
+# Límite de periodos simulados (evita bucles sin fin con throughput muy bajo)
+MAX_PERIODS = 520
+
+# Escenarios por pronóstico (máximo del endpoint y valor por omisión)
+MAX_TRIALS = 20000
+
+# Periodos por bloque al simular cerca del final de cada escenario
+SIMULATION_BLOCK = 16
+
+# Máximo de muestras por escenario en un salto sumado directamente (acota la memoria)
+MAX_DIRECT_STEPS = 256
+
+
+def simulate_periods(
+    throughput: np.ndarray,
+    remaining: int,
+    trials: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Simular cuántos periodos se necesitan para terminar `remaining` elementos.
+
+    Cada periodo suma un valor muestreado de `throughput`. En lugar de avanzar
+    un periodo por iteración, cada escenario salta los periodos en los que aún
+    no puede terminar aunque entregue el máximo observado: la suma de esos
+    periodos se muestrea de una vez (distribución exacta, sin aproximaciones) y
+    los periodos en cero se agregan con una binomial negativa. Cerca del final
+    se avanza en bloques de SIMULATION_BLOCK periodos con una suma acumulada
+    para ubicar el periodo exacto en que termina cada escenario.
+
+    Los escenarios que no terminan en MAX_PERIODS (o que ya no pueden
+    terminar) devuelven MAX_PERIODS + 1.
+    """
+    import numpy as np
+
+    periods = np.full(trials, MAX_PERIODS + 1, dtype=np.int64)
+    max_step = int(throughput.max())
+    if max_step * MAX_PERIODS < remaining:
+        return periods
+
+    # Los saltos se cuentan en periodos con entrega; los periodos en cero
+    # intermedios siguen una binomial negativa
+    nonzero = throughput[throughput > 0]
+    hit_prob = nonzero.size / throughput.size
+    values, counts = np.unique(nonzero, return_counts=True)
+    probs = counts / counts.sum()
+    # Probabilidades condicionales para muestrear la multinomial con binomiales encadenadas
+    chain_probs = probs / np.cumsum(probs[::-1])[::-1]
+    # Con saltos cortos es más barato sumar muestras que encadenar binomiales
+    binomial_min_jump = 30 * (values.size - 1)
+
+    active = np.arange(trials)
+    done = np.zeros(trials, dtype=np.int64)
+    elapsed = np.zeros(trials, dtype=np.int64)
+
+    while active.size:
+        jump = (remaining - done - 1) // max_step
+        finished = np.zeros(active.size, dtype=bool)
+
+        far = np.flatnonzero(jump >= SIMULATION_BLOCK)
+        if far.size:
+            steps = jump[far]
+            common = int(steps.min())
+            if common < binomial_min_jump:
+                steps = np.full(far.size, min(common, MAX_DIRECT_STEPS))
+                draws = rng.integers(0, nonzero.size, size=(far.size, int(steps[0])))
+                gained = nonzero[draws].sum(axis=1)
+            else:
+                left = steps.copy()
+                gained = np.zeros(far.size, dtype=np.int64)
+                for value, p in zip(values[:-1], chain_probs[:-1]):
+                    drawn = rng.binomial(left, p)
+                    gained += drawn * value
+                    left -= drawn
+                gained += left * values[-1]
+            done[far] += gained
+            elapsed[far] += steps
+            if hit_prob < 1:
+                elapsed[far] += rng.negative_binomial(steps, hit_prob)
+
+        near = np.flatnonzero(jump < SIMULATION_BLOCK)
+        if near.size:
+            draws = throughput[rng.integers(0, throughput.size, size=(near.size, SIMULATION_BLOCK))]
+            totals = done[near, None] + np.cumsum(draws, axis=1)
+            reached = totals >= remaining
+            hit = reached[:, -1]
+            periods[active[near[hit]]] = elapsed[near[hit]] + reached[hit].argmax(axis=1) + 1
+            finished[near[hit]] = True
+            done[near] = totals[:, -1]
+            elapsed[near] += SIMULATION_BLOCK
+
+        # Se descartan los que terminaron y los que ya no pueden terminar a tiempo
+        keep = ~finished & (done + max_step * (MAX_PERIODS - elapsed) >= remaining)
+        active, done, elapsed = active[keep], done[keep], elapsed[keep]
+
+    periods[periods > MAX_PERIODS] = MAX_PERIODS + 1
+    return periods
+
+
+class ForecastService:
+    """Pronóstico de fechas de finalización del backlog restante de un proyecto"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_forecast(self, project_id: str, trials: int = MAX_TRIALS) -> Dict[str, Any]:
+        """Percentiles de fecha de finalización, servidos desde caché mientras el estado no cambie"""
+        state = self._state_fingerprint(project_id)
+        cache_key = (trials, state)
+        cached = forecast_cache.get(project_id, cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._run_forecast(project_id, trials, state)
+        forecast_cache.set(project_id, result, cache_key)
+        return result
+
+    def get_cached_forecast(self, project_id: str, trials: int = MAX_TRIALS) -> Optional[Dict[str, Any]]:
+        """Pronóstico en caché para el estado actual del proyecto, sin simular (None si no hay)"""
+        return forecast_cache.get(project_id, (trials, self._state_fingerprint(project_id)))
+
+    def _state_fingerprint(self, project_id: str) -> str:
+        """Huella del estado del backlog y de los sprints; cambia cuando el pronóstico debe recalcularse"""
+        row = self.db.execute(text("""
+            SELECT
+                (SELECT COUNT(*) FROM user_stories WHERE project_id = :project_id),
+                (SELECT COUNT(*) FROM user_stories WHERE project_id = :project_id AND status = 'done'),
+                (SELECT MAX(updated_at) FROM user_stories WHERE project_id = :project_id),
+                (SELECT MAX(m.recorded_at) FROM sprint_metrics m
+                 JOIN sprints s ON s.id = m.sprint_id WHERE s.project_id = :project_id),
+                (SELECT MAX(updated_at) FROM sprints WHERE project_id = :project_id),
+                (SELECT planned_end_date FROM projects WHERE id = :project_id)
+        """), {"project_id": project_id}).fetchone()
+        return hashlib.sha1(repr(tuple(row)).encode()).hexdigest()
+
+    def _sprint_throughput(self, project_id: str) -> Tuple[List[int], float]:
+        """Historias terminadas por sprint completado y duración mediana de sprint en días"""
+        import numpy as np
+
+        rows = self.db.execute(text("""
+            SELECT m.completed_stories,
+                   EXTRACT(EPOCH FROM (s.end_date - s.start_date)) / 86400
+            FROM sprints s
+            JOIN LATERAL (
+                SELECT completed_stories
+                FROM sprint_metrics
+                WHERE sprint_id = s.id
+                ORDER BY recorded_at DESC
+                LIMIT 1
+            ) m ON true
+            WHERE s.project_id = :project_id AND s.status = 'completed'
+        """), {"project_id": project_id}).fetchall()
+
+        samples = [row[0] or 0 for row in rows]
+        durations = [float(row[1]) for row in rows if row[1]]
+        period_days = float(np.median(durations)) if durations else 14.0
+        return samples, max(period_days, 1.0)
+
+    def _weekly_throughput(self, project_id: str) -> List[int]:
+        """Historias terminadas por semana en las últimas FALLBACK_WEEKS semanas (incluye semanas en cero)"""
+        rows = self.db.execute(text("""
+            SELECT w.week, COUNT(us.id)
+            FROM generate_series(
+                date_trunc('week', NOW()) - make_interval(weeks => :weeks),
+                date_trunc('week', NOW()) - INTERVAL '1 week',
+                INTERVAL '1 week'
+            ) AS w(week)
+            LEFT JOIN user_stories us
+              ON us.project_id = :project_id
+             AND us.status = 'done'
+             AND us.updated_at >= w.week AND us.updated_at < w.week + INTERVAL '1 week'
+            GROUP BY w.week
+            ORDER BY w.week
+        """), {"project_id": project_id, "weeks": FALLBACK_WEEKS}).fetchall()
+        return [row[1] for row in rows]
+
+    def _run_forecast(self, project_id: str, trials: int, state: str) -> Dict[str, Any]:
+        import numpy as np
+
+        backlog = self.db.execute(text("""
+            SELECT COUNT(*) FILTER (WHERE status <> 'done'),
+                   COALESCE(SUM(story_points) FILTER (WHERE status <> 'done'), 0)
+            FROM user_stories
+            WHERE project_id = :project_id
+        """), {"project_id": project_id}).fetchone()
+        planned_end = self.db.execute(
+            text("SELECT planned_end_date FROM projects WHERE id = :project_id"),
+            {"project_id": project_id}
+        ).scalar()
+
+        remaining = backlog[0] or 0
+        samples, period_days = self._sprint_throughput(project_id)
+        basis = "sprint"
+        if len(samples) < MIN_SPRINT_SAMPLES:
+            samples, period_days, basis = self._weekly_throughput(project_id), 7.0, "weekly"
+
+        now = datetime.utcnow()
+        result: Dict[str, Any] = {
+            "project_id": project_id,
+            "generated_at": now.isoformat(),
+            "remaining_stories": remaining,
+            "remaining_points": backlog[1] or 0,
+            "throughput_basis": basis,
+            "period_days": round(period_days, 1),
+            "samples": samples,
+            "trials": trials,
+            "percentiles": [],
+            "on_time_probability": None
+        }
+
+        if remaining == 0:
+            result["percentiles"] = [
+                {"percentile": p, "periods": 0, "date": now.date().isoformat()} for p in FORECAST_PERCENTILES
+            ]
+            result["on_time_probability"] = 1.0 if planned_end else None
+            return result
+        if not samples or max(samples) == 0:
+            # Sin historial de entregas no hay base para pronosticar
+            return result
+
+        # Semilla derivada del estado: mismo estado, mismo resultado
+        rng = np.random.default_rng(int(state[:16], 16))
+        throughput = np.asarray(samples, dtype=np.int64)
+        periods = simulate_periods(throughput, remaining, trials, rng)
+
+        period_values = np.percentile(periods, FORECAST_PERCENTILES, method="higher")
+        for p, value in zip(FORECAST_PERCENTILES, period_values):
+            value = int(value)
+            result["percentiles"].append({
+                "percentile": p,
+                "periods": value if value <= MAX_PERIODS else None,
+                "date": (now + timedelta(days=value * period_days)).date().isoformat() if value <= MAX_PERIODS else None
+            })
+
+        if planned_end:
+            periods_available = (planned_end - now).total_seconds() / 86400 / period_days
+            result["on_time_probability"] = round(float(np.mean(periods <= periods_available)), 3)
+
+        return result
@@ -0,0 +1,127 @@
+"""
+Transporte asíncrono para la API de envío v3.1 de Mailjet.
+
+Reemplaza a `mailjet_rest.Client.send.create`, que hacía una llamada bloqueante
+con requests dentro de corrutinas. Los envíos usan el cliente HTTP compartido
+(app/core/http.py) con un timeout por intento, y se reintentan con backoff
+exponencial solo cuando es seguro: errores de conexión (la petición no llegó),
+429 (respetando Retry-After) y 503. Ni un timeout de lectura ni 502/504 se
+reintentan porque Mailjet pudo haber aceptado el mensaje detrás del gateway.
+"""
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.http import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Códigos con los que Mailjet no procesó el envío; 502/504 no garantizan que
+# el gateway no lo haya reenviado, y reintentarlos podría duplicar emails
+RETRYABLE_STATUS = {429, 503}
+
+
+@dataclass
+class MailjetResult:
+    """Respuesta de POST /v3.1/send"""
+    status_code: int
+    body: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200
+
+    def message_statuses(self, count: int) -> List[bool]:
+        """
+        Aceptación de cada mensaje según `Messages[].Status`.
+
+        Con algún mensaje inválido Mailjet responde 400 pero envía los demás, así
+        que el detalle se lee también en respuestas que no son 200.
+        """
+        results = self.body.get("Messages") if isinstance(self.body, dict) else None
+        if not isinstance(results, list):
+            return [False] * count
+        return [
+            i < len(results) and isinstance(results[i], dict) and results[i].get("Status") == "success"
+            for i in range(count)
+        ]
+
+
+class MailjetTransport:
+    """Cliente de POST /v3.1/send sobre el pool HTTP compartido"""
+
+    def __init__(
+        self,
+        api_key: str,
+        secret_key: str,
+        api_url: str = "https://api.mailjet.com/",
+        timeout: float = 10.0,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+    ):
+        self.auth = (api_key, secret_key)
+        self.send_url = f"{api_url.rstrip('/')}/v3.1/send"
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+
+    @classmethod
+    def from_settings(cls) -> "MailjetTransport":
+        return cls(
+            settings.MAILJET_API_KEY,
+            settings.MAILJET_SECRET_KEY,
+            api_url=settings.MAILJET_API_URL,
+            timeout=settings.MAILJET_TIMEOUT,
+            max_retries=settings.MAILJET_MAX_RETRIES,
+        )
+
+    def _delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), 30.0)
+            except ValueError:
+                pass
+        # Backoff exponencial con jitter para no sincronizar reintentos entre workers
+        return self.backoff * (2 ** (attempt - 1)) * (0.5 + random.random())
+
+    async def send(self, payload: Dict[str, Any]) -> MailjetResult:
+        """
+        Enviar un lote de mensajes ({"Messages": [...]}).
+
+        Devuelve la última respuesta de Mailjet; lanza httpx.HTTPError si el
+        último intento falló sin respuesta.
+        """
+        client = get_http_client()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await client.post(
+                    self.send_url, json=payload, auth=self.auth, timeout=self.timeout
+                )
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                if attempt > self.max_retries:
+                    raise
+                delay = self._delay(attempt)
+                logger.warning("Mailjet sin conexión (%s), reintento %s en %.2fs", e, attempt, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code in RETRYABLE_STATUS and attempt <= self.max_retries:
+                delay = self._delay(attempt, response.headers.get("retry-after"))
+                logger.warning("Mailjet respondió %s, reintento %s en %.2fs", response.status_code, attempt, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            try:
+                body = response.json()
+            except ValueError:
+                body = {"raw": response.text}
+            return MailjetResult(status_code=response.status_code, body=body, attempts=attempt)
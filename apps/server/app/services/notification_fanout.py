@@ -0,0 +1,91 @@
+"""
+Notificaciones dirigidas a todos los miembros de un proyecto.
+
+En lugar de crear la notificación y enviar el email miembro por miembro, una
+sola sentencia INSERT ... SELECT desde project_members crea todas las filas y
+devuelve los destinatarios; sus emails se encolan en el despachador, que los
+envía en lotes fuera de la petición. El costo para quien llama es una consulta,
+tenga el proyecto 5 o 5000 miembros.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Session
+
+from app.core.metrics import NOTIFICATIONS_CREATED
+from app.services.email_dispatcher import email_dispatcher
+from app.services.email_service import notification_subject
+
+logger = logging.getLogger(__name__)
+
+
+def fanout_project_notification(
+    db: Session,
+    project_id: str,
+    content: str,
+    notification_type: str,
+    entity_id: str,
+    data: Optional[Dict[str, Any]] = None,
+    exclude_user_id: Optional[str] = None,
+) -> int:
+    """
+    Notificar a los miembros activos del proyecto y encolar sus emails.
+
+    Args:
+        exclude_user_id: Miembro que no recibe la notificación (p. ej. quien hizo el cambio)
+
+    Returns:
+        int: Número de notificaciones creadas
+    """
+    result = db.execute(text("""
+        WITH recipients AS (
+            SELECT DISTINCT up.id, up.email, up.first_name, up.last_name, up.email_notifications
+            FROM project_members pm
+            JOIN user_profiles up ON up.id = pm.user_id
+            WHERE pm.project_id = :project_id
+            AND pm.is_active = true
+            AND up.is_active = true
+            AND (CAST(:exclude_user_id AS VARCHAR) IS NULL OR up.id <> :exclude_user_id)
+        ),
+        inserted AS (
+            INSERT INTO notifications (id, user_id, content, type, entity_id, data, created_at, updated_at, is_active, read)
+            SELECT gen_random_uuid()::text, r.id, :content, :type, :entity_id, :data, NOW(), NOW(), true, false
+            FROM recipients r
+            RETURNING user_id
+        )
+        SELECT r.email, r.first_name, r.last_name, r.email_notifications
+        FROM recipients r
+        JOIN inserted i ON i.user_id = r.id
+    """).bindparams(bindparam("data", type_=JSONB)), {
+        "project_id": project_id,
+        "exclude_user_id": exclude_user_id,
+        "content": content,
+        "type": notification_type,
+        "entity_id": entity_id,
+        "data": data,
+    })
+    recipients = result.fetchall()
+    db.commit()
+
+    if not recipients:
+        return 0
+    NOTIFICATIONS_CREATED.labels(notification_type).inc(len(recipients))
+
+    subject = notification_subject(notification_type)
+    email_dispatcher.enqueue([
+        {
+            "to_email": email,
+            "to_name": f"{first_name} {last_name}".strip() if first_name else email,
+            "notification_type": notification_type,
+            "subject": subject,
+            "content": content,
+            "entity_data": data,
+        }
+        for email, first_name, last_name, email_notifications in recipients
+        if email_notifications
+    ])
+    logger.info(f"{len(recipients)} notificación(es) '{notification_type}' para el proyecto {project_id}")
+    return len(recipients)
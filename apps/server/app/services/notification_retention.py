@@ -0,0 +1,104 @@
+"""
+Retención de notificaciones.
+
+Tarea periódica que borra las notificaciones leídas con más de
+NOTIFICATION_RETENTION_READ_DAYS días y las no leídas con más de
+NOTIFICATION_RETENTION_UNREAD_DAYS (0 desactiva cada regla). Se borra en lotes
+pequeños, cada uno en su propia transacción y con FOR UPDATE SKIP LOCKED para no
+esperar filas que otra transacción está modificando, con una pausa entre lotes
+y un tiempo máximo por ejecución; lo que quede se borra en la siguiente.
+"""
+
+import logging
+import time
+from typing import Dict
+
+from sqlmodel import Session
+from sqlalchemy.sql import text
+
+from app.core.config import settings
+from app.core.metrics import (
+    NOTIFICATION_PURGE_BATCHES,
+    NOTIFICATION_PURGE_LAST_RUN,
+    NOTIFICATION_PURGE_PENDING,
+    NOTIFICATIONS_PURGED,
+)
+
+logger = logging.getLogger(__name__)
+
+# Un lote: las filas más antiguas de la regla, sin bloquearse con las que están en uso
+_PURGE_BATCH_SQL = text("""
+    WITH doomed AS (
+        SELECT id FROM notifications
+        WHERE read = :read
+        AND created_at < NOW() - make_interval(days => :days)
+        ORDER BY created_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    DELETE FROM notifications n
+    USING doomed d
+    WHERE n.id = d.id
+""")
+
+
+def purge_notifications(
+    db: Session,
+    read_days: int,
+    unread_days: int,
+    batch_size: int = 1000,
+    pause_seconds: float = 0.1,
+    max_seconds: float = 60.0,
+) -> Dict[str, int]:
+    """
+    Borrar las notificaciones vencidas por lotes.
+
+    Returns:
+        Dict[str, int]: Filas borradas por regla ("read", "unread")
+    """
+    deadline = time.monotonic() + max_seconds
+    purged = {"read": 0, "unread": 0}
+    pending = False
+
+    for state, read, days in (("read", True, read_days), ("unread", False, unread_days)):
+        if days <= 0:
+            continue
+        while True:
+            if time.monotonic() >= deadline:
+                pending = True
+                break
+            deleted = db.execute(_PURGE_BATCH_SQL, {
+                "read": read,
+                "days": days,
+                "batch_size": batch_size,
+            }).rowcount
+            db.commit()
+            if deleted:
+                purged[state] += deleted
+                NOTIFICATIONS_PURGED.labels(state).inc(deleted)
+                NOTIFICATION_PURGE_BATCHES.inc()
+            if deleted < batch_size:
+                break
+            # Pausa entre lotes para no saturar la base de datos ni la replicación
+            time.sleep(pause_seconds)
+        if pending:
+            break
+
+    NOTIFICATION_PURGE_PENDING.set(1 if pending else 0)
+    NOTIFICATION_PURGE_LAST_RUN.set(time.time())
+    return purged
+
+
+def purge_notifications_job(db: Session) -> int:
+    """Tarea periódica: aplicar la política de retención de notificaciones"""
+    purged = purge_notifications(
+        db,
+        read_days=settings.NOTIFICATION_RETENTION_READ_DAYS,
+        unread_days=settings.NOTIFICATION_RETENTION_UNREAD_DAYS,
+        batch_size=settings.NOTIFICATION_PURGE_BATCH_SIZE,
+        pause_seconds=settings.NOTIFICATION_PURGE_PAUSE_MS / 1000,
+        max_seconds=settings.NOTIFICATION_PURGE_MAX_SECONDS,
+    )
+    total = purged["read"] + purged["unread"]
+    logger.info(f"Notificaciones purgadas: {purged['read']} leídas, {purged['unread']} no leídas")
+    return total
@@ -2,16 +2,18 @@
 Servicio para gestión del ciclo de vida de proyectos ágiles
 """
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from sqlmodel import Session, select
 from sqlalchemy.sql import text
-import json
-import uuid
 
-from app.models.project import Project, ProjectStatus, ProjectMilestone, ProjectActivity
+from app.models.project import Project, ProjectStatus, ProjectMilestone
 from app.models.agile import Sprint, UserStory, Task
 from app.models.user import UserProfile
+from app.services.forecast import ForecastService
+from app.services.activity import record_activity
+from app.services.notification_fanout import fanout_project_notification
 
 
 class ProjectLifecycleService:
@@ -43,7 +45,7 @@ class ProjectLifecycleService:
             user_id=user_id,
             activity_type="project_started",
             description=f"Proyecto iniciado el {project.start_date.strftime('%Y-%m-%d')}",
-            extra_data=json.dumps(activity_data)
+            extra_data=activity_data
         )
         
         self.db.commit()
@@ -82,7 +84,7 @@ class ProjectLifecycleService:
             user_id=user_id,
             activity_type="project_completed",
             description=f"Proyecto completado exitosamente el {project.actual_end_date.strftime('%Y-%m-%d')}",
-            extra_data=json.dumps(activity_data)
+            extra_data=activity_data
         )
         
         self.db.commit()
@@ -105,7 +107,7 @@ class ProjectLifecycleService:
             user_id=user_id,
             activity_type="project_paused",
             description=f"Proyecto pausado el {datetime.utcnow().strftime('%Y-%m-%d')}",
-            extra_data=json.dumps({"reason": reason}) if reason else None
+            extra_data={"reason": reason} if reason else None
         )
         
         self.db.commit()
@@ -151,7 +153,7 @@ class ProjectLifecycleService:
             user_id=user_id,
             activity_type="project_cancelled",
             description=f"Proyecto cancelado el {datetime.utcnow().strftime('%Y-%m-%d')}",
-            extra_data=json.dumps({"reason": reason})
+            extra_data={"reason": reason}
         )
         
         self.db.commit()
@@ -197,7 +199,7 @@ class ProjectLifecycleService:
             user_id=user_id,
             activity_type="project_marked_obsolete",
             description=f"Proyecto marcado como obsoleto el {datetime.utcnow().strftime('%Y-%m-%d')}",
-            extra_data=json.dumps({"reason": reason})
+            extra_data={"reason": reason}
         )
         
         # Enviar notificaciones a todos los miembros del proyecto
@@ -257,8 +259,13 @@ class ProjectLifecycleService:
         self.db.commit()
         return completion_percentage
     
-    async def get_project_health_status(self, project_id: str) -> Dict[str, Any]:
-        """Obtener estado de salud del proyecto"""
+    async def get_project_health_status(self, project_id: str, run_forecast: bool = True) -> Dict[str, Any]:
+        """
+        Obtener estado de salud del proyecto.
+
+        El pronóstico Monte Carlo se ejecuta en un hilo para no bloquear el
+        event loop; con `run_forecast=False` solo se usa el que esté en caché.
+        """
         project = await self._get_project(project_id)
         if not project:
             return {}
@@ -294,6 +301,22 @@ class ProjectLifecycleService:
             risk_level = "high" if risk_level != "high" else risk_level
             risk_factors.append(f"{len(overdue_milestones)} hito(s) atrasado(s)")
         
+        # Riesgo según el pronóstico Monte Carlo del backlog restante
+        on_time_probability = None
+        if project.planned_end_date and not is_overdue:
+            forecast_service = ForecastService(self.db)
+            if run_forecast:
+                forecast = await asyncio.to_thread(forecast_service.get_forecast, project_id)
+            else:
+                forecast = forecast_service.get_cached_forecast(project_id) or {}
+            on_time_probability = forecast.get("on_time_probability")
+            if on_time_probability is not None and on_time_probability < 0.5:
+                risk_level = "high"
+                risk_factors.append(f"Probabilidad de terminar a tiempo: {on_time_probability:.0%}")
+            elif on_time_probability is not None and on_time_probability < 0.85:
+                risk_level = "medium" if risk_level == "low" else risk_level
+                risk_factors.append(f"Probabilidad de terminar a tiempo: {on_time_probability:.0%}")
+        
         return {
             "project_id": project_id,
             "status": project.status,
@@ -304,7 +327,8 @@ class ProjectLifecycleService:
             "risk_factors": risk_factors,
             "stats": stats,
             "overdue_sprints": len(overdue_sprints),
-            "overdue_milestones": len(overdue_milestones)
+            "overdue_milestones": len(overdue_milestones),
+            "on_time_probability": on_time_probability
         }
     
     async def get_projects_requiring_attention(self) -> List[Dict[str, Any]]:
@@ -326,7 +350,8 @@ class ProjectLifecycleService:
         projects = []
         
         for row in result.fetchall():
-            project_health = await self.get_project_health_status(row[0])
+            # Sin simular un pronóstico por proyecto: solo el que ya esté en caché
+            project_health = await self.get_project_health_status(row[0], run_forecast=False)
             projects.append({
                 "id": row[0],
                 "name": row[1],
@@ -440,20 +465,11 @@ class ProjectLifecycleService:
         user_id: str,
         activity_type: str,
         description: str,
-        extra_data: Optional[str] = None
+        extra_data: Optional[Dict[str, Any]] = None
     ):
         """Registrar actividad del proyecto"""
-        activity = ProjectActivity(
-            id=str(uuid.uuid4()),
-            project_id=project_id,
-            user_id=user_id,
-            activity_type=activity_type,
-            description=description,
-            extra_data=extra_data
-        )
-        
-        self.db.add(activity)
-        # No hacemos commit aquí, lo hace el método que llama 
+        # Se escribe en segundo plano cuando el método que llama hace commit
+        record_activity(self.db, project_id, user_id, activity_type, description, extra_data)
     
     async def _calculate_completion_percentage(self, project_id: str) -> float:
         """Calcular porcentaje de completación basado en user stories completadas"""
@@ -488,44 +504,24 @@ class ProjectLifecycleService:
             project_name = project_data[0]
             client_name = project_data[1]
             
-            # Obtener todos los miembros activos del proyecto
-            members_query = text("""
-                SELECT DISTINCT up.id, up.email, up.first_name, up.last_name, up.email_notifications
-                FROM user_profiles up
-                JOIN project_members pm ON up.id = pm.user_id
-                WHERE pm.project_id = :project_id 
-                AND pm.is_active = true
-                AND up.is_active = true
-            """)
-            
-            members_result = self.db.execute(members_query, {"project_id": project_id})
-            members = members_result.fetchall()
+            content = f"El proyecto '{project_name}' ha sido marcado como obsoleto."
+            if client_name:
+                content += f" Cliente: {client_name}."
+            content += f" Razón: {reason}. Ya no se podrán crear nuevos tableros en este proyecto."
             
-            # Crear notificación y enviar email a cada miembro
-            for member in members:
-                member_id, email, first_name, last_name, email_notifications = member
-                
-                # Crear contenido de notificación
-                member_name = f"{first_name} {last_name}".strip() if first_name else email
-                content = f"El proyecto '{project_name}' ha sido marcado como obsoleto."
-                if client_name:
-                    content += f" Cliente: {client_name}."
-                content += f" Razón: {reason}. Ya no se podrán crear nuevos tableros en este proyecto."
-                
-                # Crear notificación in-app
-                from app.routers.notifications import create_notification
-                await create_notification(
-                    db=self.db,
-                    user_id=member_id,
-                    content=content,
-                    notification_type="project_obsolete",
-                    entity_id=project_id,
-                    data={
-                        "project_name": project_name,
-                        "client_name": client_name,
-                        "reason": reason
-                    }
-                )
+            # Una notificación por miembro activo con un solo INSERT; los emails se envían en segundo plano
+            fanout_project_notification(
+                db=self.db,
+                project_id=project_id,
+                content=content,
+                notification_type="project_obsolete",
+                entity_id=project_id,
+                data={
+                    "project_name": project_name,
+                    "client_name": client_name,
+                    "reason": reason
+                }
+            )
                 
         except Exception as e:
             # Log el error pero no fallar la operación principal
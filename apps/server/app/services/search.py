@@ -0,0 +1,138 @@
+"""
+Búsqueda de texto completo sobre tarjetas, comentarios e historias de usuario.
+
+Usa las columnas `search_vector` (ver migrations/add_search_vectors.py) con la
+consulta del usuario interpretada en español e inglés. Los resultados se
+limitan a los tableros y proyectos a los que el usuario tiene acceso.
+"""
+
+from typing import Any, Dict, List, Optional
+from sqlmodel import Session
+from sqlalchemy.sql import text
+
+SEARCH_TYPES = ("card", "comment", "story")
+
+# Mismas reglas que is_board_accessible: admin, product owner creador del
+# proyecto, miembro o asignado a alguna tarjeta del tablero. Las historias
+# requieren acceso al proyecto; los proyectos y tableros archivados no aparecen.
+_SEARCH_SQL = """
+    WITH q AS (
+        SELECT websearch_to_tsquery('spanish', :q) || websearch_to_tsquery('english', :q) AS query
+    ),
+    member_projects AS (
+        SELECT p.id
+        FROM projects p
+        WHERE p.is_active
+          AND (
+              :user_role = 'admin'
+              OR (:user_role = 'product_owner' AND p.created_by = :user_id)
+              OR EXISTS (
+                  SELECT 1 FROM project_members pm
+                  WHERE pm.project_id = p.id AND pm.user_id = :user_id
+              )
+          )
+    ),
+    accessible_boards AS (
+        SELECT b.id, b.project_id
+        FROM boards b
+        JOIN projects p ON p.id = b.project_id AND p.is_active
+        WHERE b.is_active
+          AND (
+              b.project_id IN (SELECT id FROM member_projects)
+              OR EXISTS (
+                  SELECT 1 FROM cards c
+                  JOIN lists l ON c.list_id = l.id
+                  WHERE l.board_id = b.id AND c.assignee_id = :user_id
+              )
+          )
+    ),
+    hits AS (
+        SELECT 'card' AS type, c.id, c.id AS card_id, ab.id AS board_id, ab.project_id,
+               ts_rank_cd(c.search_vector, q.query) AS rank, c.updated_at
+        FROM cards c
+        JOIN lists l ON c.list_id = l.id
+        JOIN accessible_boards ab ON ab.id = l.board_id, q
+        WHERE 'card' = ANY(:types) AND c.search_vector @@ q.query
+
+        UNION ALL
+
+        SELECT 'comment', cm.id, c.id, ab.id, ab.project_id,
+               ts_rank_cd(cm.search_vector, q.query), cm.updated_at
+        FROM comments cm
+        JOIN cards c ON cm.card_id = c.id
+        JOIN lists l ON c.list_id = l.id
+        JOIN accessible_boards ab ON ab.id = l.board_id, q
+        WHERE 'comment' = ANY(:types) AND cm.search_vector @@ q.query
+
+        UNION ALL
+
+        SELECT 'story', us.id, NULL, NULL, us.project_id,
+               ts_rank_cd(us.search_vector, q.query), us.updated_at
+        FROM user_stories us
+        JOIN member_projects mp ON mp.id = us.project_id, q
+        WHERE 'story' = ANY(:types) AND us.search_vector @@ q.query
+    ),
+    page AS (
+        SELECT * FROM hits
+        ORDER BY rank DESC, updated_at DESC, id
+        LIMIT :limit OFFSET :offset
+    )
+    -- Títulos y fragmentos solo para la página devuelta
+    SELECT page.type, page.id, page.card_id, page.board_id, page.project_id, page.rank,
+           COALESCE(c.title, us.title) AS title,
+           ts_headline(
+               'spanish',
+               COALESCE(cm.content, c.description, us.description, ''),
+               q.query,
+               'MaxFragments=1, MaxWords=25, MinWords=8, StartSel=<mark>, StopSel=</mark>'
+           ) AS snippet
+    FROM page
+    CROSS JOIN q
+    LEFT JOIN comments cm ON page.type = 'comment' AND cm.id = page.id
+    LEFT JOIN cards c ON page.card_id = c.id
+    LEFT JOIN user_stories us ON page.type = 'story' AND us.id = page.id
+    ORDER BY page.rank DESC, page.updated_at DESC, page.id
+"""
+
+
+def search(
+    db: Session,
+    query: str,
+    user_id: str,
+    user_role: str,
+    types: Optional[List[str]] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> Dict[str, Any]:
+    """Resultados ordenados por relevancia, paginados por desplazamiento"""
+    rows = db.execute(text(_SEARCH_SQL), {
+        "q": query,
+        "user_id": user_id,
+        "user_role": user_role,
+        "types": list(types or SEARCH_TYPES),
+        "limit": limit + 1,
+        "offset": offset
+    }).fetchall()
+
+    has_more = len(rows) > limit
+    results = [
+        {
+            "type": row[0],
+            "id": row[1],
+            "card_id": row[2],
+            "board_id": row[3],
+            "project_id": row[4],
+            "rank": round(float(row[5]), 4),
+            "title": row[6],
+            "snippet": row[7]
+        }
+        for row in rows[:limit]
+    ]
+
+    return {
+        "query": query,
+        "results": results,
+        "limit": limit,
+        "offset": offset,
+        "next_offset": offset + limit if has_more else None
+    }
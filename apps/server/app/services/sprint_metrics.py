@@ -0,0 +1,193 @@
+"""
+Servicio de métricas de sprint precalculadas (tabla sprint_metrics)
+"""
+
+from typing import List, Optional, Dict, Any
+from sqlmodel import Session
+from sqlalchemy import bindparam
+from sqlalchemy.sql import text
+import logging
+
+from app.core.cache import invalidate_all
+
+logger = logging.getLogger(__name__)
+
+# Agregados de las historias del backlog de cada sprint objetivo
+_METRICS_COLUMNS = """
+        COUNT(us.id) AS total_stories,
+        COUNT(CASE WHEN us.status = 'done' THEN 1 END) AS completed_stories,
+        COALESCE(SUM(CASE WHEN us.status = 'done' THEN us.story_points ELSE 0 END), 0) AS velocity,
+        AVG(CASE WHEN us.status = 'done'
+                 THEN EXTRACT(EPOCH FROM (us.updated_at - us.created_at)) / 86400 END) AS avg_completion_time"""
+
+# Inserta una fila por sprint y día. Las filas del día actual se reemplazan para
+# que varias ejecuciones en el mismo día dejen solo la instantánea más reciente.
+_SNAPSHOT_SQL = """
+    WITH target AS (
+        SELECT s.id FROM sprints s WHERE {target_filter}
+    ),
+    replaced AS (
+        DELETE FROM sprint_metrics m
+        USING target t
+        WHERE m.sprint_id = t.id AND m.recorded_at >= CURRENT_DATE
+    )
+    INSERT INTO sprint_metrics (
+        id, sprint_id, total_stories, completed_stories, velocity,
+        avg_completion_time, recorded_at, created_at, updated_at, is_active
+    )
+    SELECT
+        gen_random_uuid()::text,
+        t.id,""" + _METRICS_COLUMNS + """,
+        NOW(), NOW(), NOW(), true
+    FROM target t
+    LEFT JOIN sprint_backlog sb ON sb.sprint_id = t.id
+    LEFT JOIN user_stories us ON us.id = sb.story_id
+    GROUP BY t.id
+"""
+
+# Métricas vigentes de cada sprint `s` de una consulta: su última instantánea o,
+# si aún no tiene, las calculadas al momento sin guardarlas (esa agregación solo
+# se ejecuta para los sprints sin instantánea). Uso:
+#   SELECT ..., {LATEST_METRICS_COLUMNS} FROM sprints s {LATEST_METRICS_JOIN} WHERE ...
+LATEST_METRICS_JOIN = """
+    LEFT JOIN LATERAL (
+        SELECT total_stories, completed_stories, velocity, avg_completion_time, recorded_at
+        FROM sprint_metrics
+        WHERE sprint_id = s.id
+        ORDER BY recorded_at DESC
+        LIMIT 1
+    ) snap ON true
+    LEFT JOIN LATERAL (
+        SELECT""" + _METRICS_COLUMNS + """
+        FROM sprint_backlog sb
+        JOIN user_stories us ON us.id = sb.story_id
+        WHERE sb.sprint_id = s.id AND snap.recorded_at IS NULL
+    ) live ON true
+"""
+
+LATEST_METRICS_COLUMNS = """
+    COALESCE(snap.total_stories, live.total_stories, 0) AS total_stories,
+    COALESCE(snap.completed_stories, live.completed_stories, 0) AS completed_stories,
+    COALESCE(snap.velocity, live.velocity, 0) AS velocity,
+    CASE WHEN snap.recorded_at IS NULL THEN live.avg_completion_time
+         ELSE snap.avg_completion_time END AS avg_completion_time,
+    COALESCE(snap.recorded_at, NOW()) AS recorded_at"""
+
+
+class SprintMetricsService:
+    """Genera y consulta instantáneas diarias de métricas por sprint"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def snapshot_active_sprints(self) -> int:
+        """Registrar la instantánea del día para todos los sprints activos en una sola sentencia"""
+        result = self.db.execute(text(_SNAPSHOT_SQL.format(target_filter="s.status = 'active'")))
+        self.db.commit()
+        return result.rowcount
+
+    def snapshot_sprints(self, sprint_ids: List[str]) -> int:
+        """Registrar la instantánea del día para sprints concretos (inicio, cierre, cambios de backlog)"""
+        if not sprint_ids:
+            return 0
+        query = text(_SNAPSHOT_SQL.format(target_filter="s.id IN :sprint_ids")).bindparams(
+            bindparam("sprint_ids", expanding=True)
+        )
+        result = self.db.execute(query, {"sprint_ids": list(sprint_ids)})
+        self.db.commit()
+        return result.rowcount
+
+    def get_latest_metrics(self, sprint_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtener la instantánea más reciente de un sprint.
+
+        Si el sprint aún no tiene instantáneas, las métricas se calculan al
+        momento sin guardarlas: una lectura no escribe; las instantáneas las
+        registran la tarea periódica y los cambios de ciclo de vida del sprint.
+        """
+        row = self.db.execute(text(f"""
+            SELECT {LATEST_METRICS_COLUMNS}
+            FROM sprints s
+            {LATEST_METRICS_JOIN}
+            WHERE s.id = :sprint_id
+        """), {"sprint_id": sprint_id}).fetchone()
+
+        if not row:
+            return None
+
+        return {
+            "total_stories": row[0] or 0,
+            "completed_stories": row[1] or 0,
+            "velocity": row[2] or 0.0,
+            "avg_completion_time": row[3],
+            "recorded_at": row[4]
+        }
+
+    def get_burndown(self, sprint_id: str) -> List[Dict[str, Any]]:
+        """Serie diaria de historias pendientes de un sprint"""
+        query = text("""
+            SELECT recorded_at, total_stories, completed_stories, velocity
+            FROM sprint_metrics
+            WHERE sprint_id = :sprint_id
+            ORDER BY recorded_at ASC
+        """)
+        result = self.db.execute(query, {"sprint_id": sprint_id})
+
+        return [
+            {
+                "date": row[0].date().isoformat(),
+                "total_stories": row[1] or 0,
+                "completed_stories": row[2] or 0,
+                "remaining_stories": (row[1] or 0) - (row[2] or 0),
+                "completed_points": row[3] or 0.0
+            }
+            for row in result
+        ]
+
+    def get_velocity(self, project_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Velocidad de los últimos sprints del proyecto según su última instantánea"""
+        query = text("""
+            SELECT s.id, s.name, s.status, s.start_date, s.end_date,
+                   m.total_stories, m.completed_stories, m.velocity, m.avg_completion_time
+            FROM sprints s
+            JOIN LATERAL (
+                SELECT total_stories, completed_stories, velocity, avg_completion_time
+                FROM sprint_metrics
+                WHERE sprint_id = s.id
+                ORDER BY recorded_at DESC
+                LIMIT 1
+            ) m ON true
+            WHERE s.project_id = :project_id AND s.status IN ('active', 'completed')
+            ORDER BY s.start_date DESC NULLS LAST
+            LIMIT :limit
+        """)
+        result = self.db.execute(query, {"project_id": project_id, "limit": limit})
+
+        sprints = [
+            {
+                "sprint_id": row[0],
+                "name": row[1],
+                "status": row[2],
+                "start_date": row[3].isoformat() if row[3] else None,
+                "end_date": row[4].isoformat() if row[4] else None,
+                "total_stories": row[5] or 0,
+                "completed_stories": row[6] or 0,
+                "velocity": row[7] or 0.0,
+                "avg_completion_time": row[8]
+            }
+            for row in result
+        ]
+        # Orden cronológico para graficar
+        sprints.reverse()
+        return sprints
+
+
+def snapshot_sprint_metrics_job(db: Session) -> int:
+    """Tarea periódica: instantánea de métricas de todos los sprints activos"""
+    count = SprintMetricsService(db).snapshot_active_sprints()
+    # Las series derivadas de las instantáneas deben recalcularse. Solo se vacían
+    # las cachés de este proceso: los demás workers ven las nuevas instantáneas
+    # cuando expira el TTL de sus entradas.
+    invalidate_all()
+    logger.info(f"Métricas registradas para {count} sprint(s) activo(s)")
+    return count
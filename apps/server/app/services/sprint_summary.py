@@ -0,0 +1,162 @@
+"""
+Resumen de sprints por proyecto para las vistas de tablero.
+
+Los endpoints /boards/{id}/sprint, /sprint-info y /sprints comparten este
+servicio: el acceso y el proyecto del tablero se resuelven en una sola consulta,
+y el sprint activo (o el último) junto con la lista de sprints se calculan una
+vez por proyecto y se guardan en caché hasta el siguiente cambio de sprints o
+historias. Los conteos de historias salen de la última instantánea de
+sprint_metrics de cada sprint (ver app/services/sprint_metrics.py).
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlmodel import Session
+from sqlalchemy.sql import text
+
+from app.core.auth import AuthUser
+from app.core.cache import ProjectCache
+from app.services.sprint_metrics import LATEST_METRICS_COLUMNS, LATEST_METRICS_JOIN
+
+sprint_summary_cache = ProjectCache("sprint_summary", ttl_seconds=300)
+
+
+def _days_remaining(end_date: Optional[datetime]) -> int:
+    """Días completos restantes hasta el fin del sprint (0 si ya terminó)"""
+    if not end_date:
+        return 0
+    return max(0, (end_date - datetime.utcnow()).days)
+
+
+class SprintSummaryService:
+    """Resumen del sprint activo o último de un proyecto, con caché por proyecto"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def resolve_board(self, board_id: str, current_user: AuthUser) -> Dict[str, Any]:
+        """
+        Obtener el proyecto del tablero verificando el acceso del usuario.
+
+        Aplica las mismas reglas que is_board_accessible (admin, creador del
+        proyecto, miembro o asignado a una tarjeta del tablero) en una consulta.
+        """
+        row = self.db.execute(text("""
+            SELECT b.project_id, p.name,
+                   COALESCE(
+                       up.role = 'admin'
+                       OR (up.role = 'product_owner' AND p.created_by = up.id)
+                       OR EXISTS (
+                           SELECT 1 FROM project_members pm
+                           WHERE pm.project_id = b.project_id AND pm.user_id = up.id
+                       )
+                       OR EXISTS (
+                           SELECT 1 FROM cards c
+                           JOIN lists l ON c.list_id = l.id
+                           WHERE l.board_id = b.id AND c.assignee_id = up.id
+                       ),
+                       false
+                   ) AS has_access
+            FROM boards b
+            JOIN projects p ON b.project_id = p.id
+            LEFT JOIN LATERAL (
+                SELECT id, role FROM user_profiles
+                WHERE auth_id = :auth_id OR email = :email
+                LIMIT 1
+            ) up ON true
+            WHERE b.id = :board_id
+        """), {
+            "board_id": board_id,
+            "auth_id": current_user.id,
+            "email": current_user.email
+        }).fetchone()
+
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tablero no encontrado"
+            )
+        if not row[2]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="No tienes permiso para este tablero"
+            )
+
+        return {"project_id": row[0], "project_name": row[1]}
+
+    def get_summary(self, project_id: str, project_name: Optional[str] = None) -> Dict[str, Any]:
+        """Sprint activo (o el último) con conteos de historias y la lista de sprints del proyecto"""
+        cached = sprint_summary_cache.get(project_id)
+        if cached is None:
+            cached = self._load(project_id, project_name)
+            sprint_summary_cache.set(project_id, cached)
+        return cached
+
+    def _load(self, project_id: str, project_name: Optional[str]) -> Dict[str, Any]:
+        # Última instantánea de cada sprint del proyecto (calculada al momento si no tiene)
+        rows = self.db.execute(text(f"""
+            SELECT s.id, s.name, s.goal, s.start_date, s.end_date, s.status, s.created_at,
+                   {LATEST_METRICS_COLUMNS}
+            FROM sprints s
+            {LATEST_METRICS_JOIN}
+            WHERE s.project_id = :project_id
+            ORDER BY s.start_date DESC NULLS LAST, s.created_at DESC
+        """), {"project_id": project_id}).fetchall()
+
+        if project_name is None:
+            project_name = self.db.execute(
+                text("SELECT name FROM projects WHERE id = :project_id"),
+                {"project_id": project_id}
+            ).scalar()
+
+        sprints = [
+            {
+                "id": row[0],
+                "name": row[1],
+                "goal": row[2],
+                "start_date": row[3],
+                "end_date": row[4],
+                "status": row[5],
+                "created_at": row[6],
+                "stories_count": row[7] or 0,
+                "completed_stories_count": row[8] or 0
+            }
+            for row in rows
+        ]
+
+        # Activo más reciente; si no hay, el último creado
+        active = [s for s in sprints if s["status"] == "active"]
+        current = active[0] if active else max(sprints, key=lambda s: s["created_at"], default=None)
+
+        return {
+            "project_id": project_id,
+            "project_name": project_name,
+            "current_sprint": current,
+            "sprints": sprints
+        }
+
+    @staticmethod
+    def serialize_sprint(sprint: Optional[Dict[str, Any]], with_counts: bool = True) -> Optional[Dict[str, Any]]:
+        """Formatear un sprint del resumen para la respuesta (días restantes al momento de la consulta)"""
+        if not sprint:
+            return None
+        data = {
+            "id": sprint["id"],
+            "name": sprint["name"],
+            "goal": sprint["goal"],
+            "start_date": sprint["start_date"].isoformat() if sprint["start_date"] else None,
+            "end_date": sprint["end_date"].isoformat() if sprint["end_date"] else None,
+            "status": sprint["status"],
+            "days_remaining": _days_remaining(sprint["end_date"])
+        }
+        if with_counts:
+            total = sprint["stories_count"]
+            completed = sprint["completed_stories_count"]
+            data.update({
+                "stories_count": total,
+                "completed_stories_count": completed,
+                "progress_percentage": round(completed / total * 100, 1) if total > 0 else 0
+            })
+        return data
@@ -0,0 +1,125 @@
+"""
+Búsqueda incremental (typeahead) de usuarios por email y nombre.
+
+Se apoya en índices de trigramas (pg_trgm, ver
+migrations/add_user_trigram_indexes.py) sobre lower(email) y sobre
+FULL_NAME_EXPR; las consultas deben usar exactamente esas expresiones. Los
+términos de menos de MIN_TRIGRAM_LENGTH caracteres no forman un trigrama y el
+índice GIN no los resuelve: se buscan solo como prefijo, con los índices btree
+text_pattern_ops de migrations/add_user_prefix_indexes.py.
+"""
+
+from typing import Any, Dict, List, Optional
+from sqlmodel import Session
+from sqlalchemy.sql import text
+
+# Expresión indexada del nombre completo
+FULL_NAME_EXPR = "lower(coalesce(first_name, '') || ' ' || coalesce(last_name, ''))"
+
+# Longitud mínima para buscar por fragmento y similitud con pg_trgm
+MIN_TRIGRAM_LENGTH = 3
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_users(
+    db: Session,
+    query: str,
+    caller_id: str,
+    caller_role: str,
+    project_id: Optional[str] = None,
+    role: Optional[str] = None,
+    limit: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Mejores coincidencias visibles para el usuario.
+
+    - admin: usuarios que creó o sin creador (igual que GET /users).
+    - product_owner: todos los usuarios, para poder agregarlos a proyectos.
+    - resto: usuarios con los que comparte algún proyecto.
+    Con `project_id` se limita a los miembros (y el creador) de ese proyecto.
+    Los términos cortos solo coinciden como prefijo del email o del nombre.
+    """
+    term = query.strip().lower()
+    escaped = _escape_like(term)
+    if len(term) < MIN_TRIGRAM_LENGTH:
+        filters = [f"(lower(up.email) LIKE :prefix OR {FULL_NAME_EXPR} LIKE :prefix)"]
+        similarity_order = ""
+    else:
+        filters = [
+            f"(lower(up.email) LIKE :pattern OR {FULL_NAME_EXPR} LIKE :pattern OR {FULL_NAME_EXPR} % :term)"
+        ]
+        similarity_order = (
+            f"GREATEST(similarity(lower(up.email), :term), similarity({FULL_NAME_EXPR}, :term)) DESC,"
+        )
+    params: Dict[str, Any] = {
+        "term": term,
+        "prefix": f"{escaped}%",
+        "pattern": f"%{escaped}%",
+        "caller_id": caller_id,
+        "limit": limit
+    }
+
+    if caller_role == "admin":
+        filters.append("(up.creator_id = :caller_id OR up.creator_id IS NULL)")
+    elif caller_role != "product_owner":
+        filters.append("""
+            up.id IN (
+                SELECT pm.user_id FROM project_members pm
+                WHERE pm.project_id IN (
+                    SELECT project_id FROM project_members WHERE user_id = :caller_id
+                    UNION
+                    SELECT id FROM projects WHERE created_by = :caller_id
+                )
+                UNION
+                SELECT p.created_by FROM projects p
+                JOIN project_members pm ON pm.project_id = p.id AND pm.user_id = :caller_id
+            )
+        """)
+
+    if project_id:
+        filters.append("""
+            up.id IN (
+                SELECT user_id FROM project_members WHERE project_id = :project_id
+                UNION
+                SELECT created_by FROM projects WHERE id = :project_id
+            )
+        """)
+        params["project_id"] = project_id
+
+    if role:
+        filters.append("""
+            (up.role = :role OR EXISTS (
+                SELECT 1 FROM project_members pmr
+                WHERE pmr.user_id = up.id AND pmr.role = :role
+                  AND (CAST(:role_project_id AS varchar) IS NULL OR pmr.project_id = :role_project_id)
+            ))
+        """)
+        params["role"] = role
+        params["role_project_id"] = project_id
+
+    rows = db.execute(text(f"""
+        SELECT up.id, up.email, up.first_name, up.last_name, up.role, up.avatar_url
+        FROM user_profiles up
+        WHERE {' AND '.join(filters)}
+        ORDER BY (lower(up.email) LIKE :prefix) DESC,
+                 ({FULL_NAME_EXPR} LIKE :prefix) DESC,
+                 {similarity_order}
+                 up.email
+        LIMIT :limit
+    """), params).fetchall()
+
+    return [
+        {
+            "id": row[0],
+            "email": row[1],
+            "first_name": row[2] or "",
+            "last_name": row[3] or "",
+            "name": f"{row[2] or ''} {row[3] or ''}".strip() or row[1],
+            "role": row[4],
+            "avatar_url": row[5]
+        }
+        for row in rows
+    ]
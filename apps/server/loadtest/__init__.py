@@ -0,0 +1,8 @@
+"""
+Pruebas de carga de la API.
+
+- loadtest.fakes: sustitutos locales de Supabase Auth (GoTrue) y Mailjet.
+- loadtest.runner: prepara datos vía API, ejecuta los escenarios y guarda
+  p50/p95/p99 y throughput en un JSON por commit.
+- loadtest.compare: compara dos archivos de resultados.
+"""
@@ -0,0 +1,125 @@
+"""
+Simulacro de caída de Supabase Auth contra el GoTrue falso.
+
+Arranca el GoTrue de loadtest.fakes en el mismo proceso, le inyecta errores y
+latencia con POST /__faults y comprueba el circuit breaker de
+app/core/supabase.py:
+
+1. un token validado se guarda en la caché de tokens verificados;
+2. con GoTrue devolviendo 503 el circuito se abre tras SUPABASE_BREAKER_FAILURES
+   fallos y el token en caché se sigue aceptando;
+3. con el circuito abierto un token desconocido falla de inmediato;
+4. con GoTrue lento la llamada de prueba respeta SUPABASE_AUTH_TIMEOUT;
+5. cuando GoTrue se recupera el circuito vuelve a cerrarse.
+
+    python -m loadtest.auth_outage
+
+Termina con código 1 si alguna comprobación falla.
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import time
+from typing import List
+
+import httpx
+import uvicorn
+
+from loadtest.fakes import create_gotrue_app, make_token
+
+FAILURES = 3
+RESET_SECONDS = 1.0
+AUTH_TIMEOUT = 0.5
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run() -> List[str]:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = uvicorn.Server(uvicorn.Config(create_gotrue_app(), host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    # La configuración se lee al importar la app
+    os.environ.update({
+        "SUPABASE_URL": base_url,
+        "SUPABASE_KEY": "loadtest",
+        "SUPABASE_AUTH_TIMEOUT": str(AUTH_TIMEOUT),
+        "SUPABASE_BREAKER_FAILURES": str(FAILURES),
+        "SUPABASE_BREAKER_RESET_SECONDS": str(RESET_SECONDS),
+    })
+    from app.core.http import close_http_client
+    from app.core.supabase import AuthServiceUnavailable, auth_breaker, validate_jwt_token
+
+    failures: List[str] = []
+
+    def check(condition: bool, message: str) -> None:
+        print(f"{'✅' if condition else '❌'} {message}")
+        if not condition:
+            failures.append(message)
+
+    async def set_faults(control: httpx.AsyncClient, **faults) -> None:
+        await control.post(f"{base_url}/__faults", json=faults)
+
+    async def unavailable(token: str) -> bool:
+        try:
+            await validate_jwt_token(token)
+        except AuthServiceUnavailable:
+            return True
+        return False
+
+    known = make_token("known@loadtest.local")
+    unknown = make_token("unknown@loadtest.local")
+
+    async with httpx.AsyncClient() as control:
+        try:
+            check(await validate_jwt_token(known) is not None, "token válido con GoTrue sano")
+            check(auth_breaker.state == "closed", "circuito cerrado")
+
+            await set_faults(control, error_rate=1.0, error_status=503)
+            cached = [await validate_jwt_token(known) for _ in range(FAILURES)]
+            check(all(result is not None for result in cached), "token verificado aceptado desde la caché con GoTrue en 503")
+            check(auth_breaker.state == "open", f"circuito abierto tras {FAILURES} fallos")
+
+            start = time.perf_counter()
+            rejected = await unavailable(unknown)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            check(rejected and elapsed_ms < 50, f"token desconocido rechazado sin llamar a GoTrue ({elapsed_ms:.1f} ms)")
+            check(await validate_jwt_token(known) is not None, "token en caché aceptado con el circuito abierto")
+
+            await set_faults(control, error_rate=0.0, latency_ms=AUTH_TIMEOUT * 4000)
+            await asyncio.sleep(RESET_SECONDS)
+            start = time.perf_counter()
+            rejected = await unavailable(unknown)
+            elapsed = time.perf_counter() - start
+            check(rejected and elapsed < AUTH_TIMEOUT * 2, f"llamada de prueba cortada por el timeout ({elapsed:.2f} s)")
+            check(auth_breaker.state == "open", "circuito reabierto tras la prueba fallida")
+
+            await set_faults(control, latency_ms=0.0)
+            await asyncio.sleep(RESET_SECONDS)
+            check(await validate_jwt_token(unknown) is not None, "token nuevo validado tras la recuperación")
+            check(auth_breaker.state == "closed", "circuito cerrado tras la recuperación")
+        finally:
+            await close_http_client()
+            server.should_exit = True
+            await server_task
+
+    return failures
+
+
+def main():
+    failures = asyncio.run(run())
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
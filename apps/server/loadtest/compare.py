@@ -0,0 +1,70 @@
+"""
+Comparar dos corridas de loadtest.runner.
+
+    python -m loadtest.compare loadtest/results/abc123.json loadtest/results/def456.json --threshold 10
+
+Muestra la variación de p50/p95/p99 y throughput por escenario y paso. Sale
+con código 1 si algún p95 empeora más que --threshold por ciento, para usarlo
+como verificación en CI.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+
+def _delta(base: float, new: float) -> float:
+    return (new - base) / base * 100 if base else 0.0
+
+
+def compare(base: Dict, new: Dict, threshold: float) -> List[str]:
+    """Imprimir la tabla y devolver los nombres con regresión de p95"""
+    regressions = []
+    print(f"base: {base['commit']} ({base['timestamp']})")
+    print(f"new:  {new['commit']} ({new['timestamp']})\n")
+    header = f"{'escenario/paso':<36} {'p50 Δ%':>8} {'p95 Δ%':>8} {'p99 Δ%':>8} {'rps Δ%':>8}"
+    print(header)
+    print("-" * len(header))
+
+    sections = [("TOTAL", base["total"], new["total"])]
+    for key in ("scenarios", "steps"):
+        for name, stats in new.get(key, {}).items():
+            if name in base.get(key, {}):
+                sections.append((name, base[key][name], stats))
+
+    for name, b, n in sections:
+        p95 = _delta(b["p95_ms"], n["p95_ms"])
+        flag = ""
+        if p95 > threshold:
+            regressions.append(name)
+            flag = "  <-- regresión"
+        print(f"{name:<36} {_delta(b['p50_ms'], n['p50_ms']):>+8.1f} {p95:>+8.1f} "
+              f"{_delta(b['p99_ms'], n['p99_ms']):>+8.1f} "
+              f"{_delta(b['throughput_rps'], n['throughput_rps']):>+8.1f}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Comparar resultados de pruebas de carga")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regresión de p95 tolerada (%%)")
+    args = parser.parse_args(argv)
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    if base.get("config") != new.get("config"):
+        print("⚠️ Las corridas usan configuraciones distintas; la comparación puede no ser válida\n")
+
+    regressions = compare(base, new, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regresión(es) de p95 mayores a {args.threshold}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Sustitutos locales de Supabase Auth (GoTrue) y Mailjet para pruebas de carga.
+
+El API se arranca apuntando a ellos:
+
+    SUPABASE_URL=http://127.0.0.1:9999
+    SUPABASE_KEY=loadtest
+    MAILJET_API_URL=http://127.0.0.1:9998/
+    MAILJET_API_KEY=loadtest MAILJET_SECRET_KEY=loadtest ENABLE_EMAIL_NOTIFICATIONS=true
+
+Los tokens tienen la forma `lt.<rol>.<email>`: el GoTrue falso los acepta sin
+estado y devuelve siempre el mismo id para el mismo email, así varios procesos
+del runner comparten usuarios. Ejecutar con:
+
+    python -m loadtest.fakes --gotrue-port 9999 --mailjet-port 9998 --latency-ms 15
+
+Ambos aceptan latencia y errores en caliente con POST /__faults (FaultInjector),
+p. ej. para simular una caída de Supabase Auth (ver loadtest.auth_outage) o
+probar los reintentos de envío a Mailjet.
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import uuid
+from typing import Any, Dict, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+TOKEN_PREFIX = "lt"
+USER_NAMESPACE = uuid.UUID("5a0c7d0e-8c1b-4c4e-9a51-2b8f0f7c6d10")
+
+
+def make_token(email: str, role: str = "member") -> str:
+    """Token aceptado por el GoTrue falso"""
+    return f"{TOKEN_PREFIX}.{role}.{email}"
+
+
+def user_for_token(token: str) -> Optional[Dict[str, Any]]:
+    """Usuario de Supabase equivalente al token, o None si no tiene el formato esperado"""
+    prefix, _, rest = token.partition(".")
+    role, _, email = rest.partition(".")
+    if prefix != TOKEN_PREFIX or not role or "@" not in email:
+        return None
+    local, _, _ = email.partition("@")
+    return {
+        "id": str(uuid.uuid5(USER_NAMESPACE, email)),
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": email,
+        "app_metadata": {"provider": "email", "providers": ["email"]},
+        "user_metadata": {"first_name": local, "last_name": "Loadtest", "role": role},
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def _bearer(request: Request) -> str:
+    header = request.headers.get("authorization", "")
+    return header[7:] if header.lower().startswith("bearer ") else ""
+
+
+class FaultInjector:
+    """
+    Latencia y errores configurables de un servicio falso.
+
+    Se fijan al arrancar o en caliente con POST /__faults
+    ({"latency_ms": 3000, "error_rate": 1.0, "error_status": 503}); GET /__faults
+    devuelve la configuración vigente.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, error_rate: float = 0.0, error_status: int = 503):
+        self.faults: Dict[str, Any] = {
+            "latency_ms": latency_ms, "error_rate": error_rate, "error_status": error_status
+        }
+        self._rng = random.Random()
+
+    async def __call__(self) -> Optional[JSONResponse]:
+        """Esperar la latencia configurada y devolver una respuesta de error si toca"""
+        await asyncio.sleep(self.faults["latency_ms"] / 1000)
+        if self.faults["error_rate"] and self._rng.random() < self.faults["error_rate"]:
+            status = self.faults["error_status"]
+            return JSONResponse({"code": status, "msg": "injected fault"}, status_code=status)
+        return None
+
+    async def configure(self, request: Request):
+        if request.method == "POST":
+            body = await request.json()
+            for key in self.faults:
+                if key in body:
+                    self.faults[key] = type(self.faults[key])(body[key])
+        return JSONResponse(self.faults)
+
+    def route(self) -> Route:
+        return Route("/__faults", self.configure, methods=["GET", "POST"])
+
+
+def create_gotrue_app(latency_ms: float = 0.0, error_rate: float = 0.0, error_status: int = 503) -> Starlette:
+    """Subconjunto de /auth/v1 que usa el API, con fallas inyectables (FaultInjector)"""
+    inject = FaultInjector(latency_ms, error_rate, error_status)
+
+    async def get_user(request: Request):
+        fault = await inject()
+        if fault:
+            return fault
+        user = user_for_token(_bearer(request))
+        if not user:
+            return JSONResponse({"code": 401, "msg": "invalid JWT"}, status_code=401)
+        return JSONResponse(user)
+
+    async def token(request: Request):
+        fault = await inject()
+        if fault:
+            return fault
+        body = await request.json()
+        email = body.get("email", "")
+        if "@" not in email or not body.get("password"):
+            return JSONResponse({"error": "invalid_grant"}, status_code=400)
+        role = "admin" if email.startswith("admin") else "member"
+        return JSONResponse({
+            "access_token": make_token(email, role),
+            "token_type": "bearer",
+            "expires_in": 3600,
+            "user": user_for_token(make_token(email, role)),
+        })
+
+    async def admin_user(request: Request):
+        fault = await inject()
+        if fault:
+            return fault
+        user_id = request.path_params["user_id"]
+        return JSONResponse({"id": user_id, "email": f"{user_id}@loadtest.local", "user_metadata": {}})
+
+    async def admin_create_user(request: Request):
+        fault = await inject()
+        if fault:
+            return fault
+        body = await request.json()
+        role = (body.get("user_metadata") or {}).get("role", "member")
+        return JSONResponse(user_for_token(make_token(body.get("email", ""), role)), status_code=201)
+
+    return Starlette(routes=[
+        Route("/auth/v1/user", get_user, methods=["GET"]),
+        Route("/auth/v1/token", token, methods=["POST"]),
+        Route("/auth/v1/admin/users", admin_create_user, methods=["POST"]),
+        Route("/auth/v1/admin/users/{user_id}", admin_user, methods=["GET", "PUT"]),
+        inject.route(),
+    ])
+
+
+def create_mailjet_app(latency_ms: float = 0.0, error_rate: float = 0.0, error_status: int = 503) -> Starlette:
+    """
+    POST /v3.1/send con respuesta de éxito y fallas inyectables (FaultInjector);
+    GET /stats devuelve los mensajes aceptados y los intentos recibidos.
+    """
+    inject = FaultInjector(latency_ms, error_rate, error_status)
+    counter = itertools.count(1)
+    stats = {"messages": 0, "requests": 0}
+
+    async def send(request: Request):
+        stats["requests"] += 1
+        fault = await inject()
+        if fault:
+            return fault
+        body = await request.json()
+        messages = body.get("Messages", [])
+        stats["messages"] += len(messages)
+        return JSONResponse({
+            "Messages": [
+                {
+                    "Status": "success",
+                    "CustomID": message.get("CustomID", ""),
+                    "To": [
+                        {"Email": to.get("Email"), "MessageID": next(counter)}
+                        for to in message.get("To", [])
+                    ],
+                }
+                for message in messages
+            ]
+        })
+
+    async def get_stats(request: Request):
+        return JSONResponse(stats)
+
+    return Starlette(routes=[
+        Route("/v3.1/send", send, methods=["POST"]),
+        Route("/stats", get_stats, methods=["GET"]),
+        inject.route(),
+    ])
+
+
+async def serve(host: str, gotrue_port: int, mailjet_port: int, latency_ms: float,
+                gotrue_error_rate: float = 0.0, mailjet_error_rate: float = 0.0) -> None:
+    gotrue = create_gotrue_app(latency_ms, error_rate=gotrue_error_rate)
+    mailjet = create_mailjet_app(latency_ms, error_rate=mailjet_error_rate)
+    servers = [
+        uvicorn.Server(uvicorn.Config(gotrue, host=host, port=gotrue_port, log_level="warning")),
+        uvicorn.Server(uvicorn.Config(mailjet, host=host, port=mailjet_port, log_level="warning")),
+    ]
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GoTrue y Mailjet falsos para pruebas de carga")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--gotrue-port", type=int, default=9999)
+    parser.add_argument("--mailjet-port", type=int, default=9998)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Latencia artificial por respuesta, para acercarse a la del servicio real")
+    parser.add_argument("--gotrue-error-rate", type=float, default=0.0,
+                        help="Fracción de respuestas 503 del GoTrue falso (también con POST /__faults)")
+    parser.add_argument("--mailjet-error-rate", type=float, default=0.0,
+                        help="Fracción de respuestas 503 del Mailjet falso")
+    args = parser.parse_args()
+    asyncio.run(serve(
+        args.host, args.gotrue_port, args.mailjet_port, args.latency_ms,
+        args.gotrue_error_rate, args.mailjet_error_rate
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Comprobación del transporte asíncrono de Mailjet contra el Mailjet falso.
+
+Arranca el Mailjet de loadtest.fakes en el mismo proceso y verifica con
+app/services/mailjet_transport.py que:
+
+1. un envío normal devuelve 200 en un intento;
+2. ante 503 se reintenta MAILJET_MAX_RETRIES veces y se devuelve el último error;
+3. un 400 no se reintenta;
+4. con latencia mayor a MAILJET_TIMEOUT el envío falla sin reintentar.
+
+    python -m loadtest.mailjet_retries
+
+Termina con código 1 si alguna comprobación falla.
+"""
+
+import asyncio
+import os
+import socket
+import sys
+from typing import List
+
+import httpx
+import uvicorn
+
+from loadtest.fakes import create_mailjet_app
+
+MAX_RETRIES = 2
+TIMEOUT = 0.5
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run() -> List[str]:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = uvicorn.Server(uvicorn.Config(create_mailjet_app(), host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    # La configuración se lee al importar la app
+    os.environ.update({
+        "MAILJET_API_URL": f"{base_url}/",
+        "MAILJET_API_KEY": "loadtest",
+        "MAILJET_SECRET_KEY": "loadtest",
+        "MAILJET_TIMEOUT": str(TIMEOUT),
+        "MAILJET_MAX_RETRIES": str(MAX_RETRIES),
+    })
+    from app.core.http import close_http_client
+    from app.services.mailjet_transport import MailjetTransport
+
+    transport = MailjetTransport.from_settings()
+    transport.backoff = 0.01
+    payload = {"Messages": [{
+        "From": {"Email": "noreply@loadtest.local", "Name": "Loadtest"},
+        "To": [{"Email": "member@loadtest.local", "Name": "Member"}],
+        "Subject": "Prueba",
+        "TextPart": "Prueba",
+    }]}
+
+    failures: List[str] = []
+
+    def check(condition: bool, message: str) -> None:
+        print(f"{'✅' if condition else '❌'} {message}")
+        if not condition:
+            failures.append(message)
+
+    async with httpx.AsyncClient(base_url=base_url) as control:
+        async def requests_received() -> int:
+            return (await control.get("/stats")).json()["requests"]
+
+        try:
+            result = await transport.send(payload)
+            check(result.ok and result.attempts == 1, "envío aceptado en un intento")
+
+            await control.post("/__faults", json={"error_rate": 1.0, "error_status": 503})
+            before = await requests_received()
+            result = await transport.send(payload)
+            sent = await requests_received() - before
+            check(result.status_code == 503 and sent == MAX_RETRIES + 1,
+                  f"503 reintentado {MAX_RETRIES} veces ({sent} peticiones)")
+
+            await control.post("/__faults", json={"error_status": 400})
+            before = await requests_received()
+            result = await transport.send(payload)
+            sent = await requests_received() - before
+            check(result.status_code == 400 and sent == 1, "400 sin reintentos")
+
+            await control.post("/__faults", json={"error_rate": 0.0, "latency_ms": TIMEOUT * 3000})
+            before = await requests_received()
+            try:
+                await transport.send(payload)
+                timed_out = False
+            except httpx.ReadTimeout:
+                timed_out = True
+            sent = await requests_received() - before
+            check(timed_out and sent == 1, "timeout de lectura sin reintentos (Mailjet pudo aceptar el mensaje)")
+        finally:
+            await close_http_client()
+            server.should_exit = True
+            await server_task
+
+    return failures
+
+
+def main():
+    failures = asyncio.run(run())
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Ejecutor de pruebas de carga.
+
+Con el API corriendo contra Postgres local y los servicios falsos de
+loadtest.fakes:
+
+    python -m loadtest.runner --base-url http://127.0.0.1:8000 --users 20 --duration 60
+
+Guarda en loadtest/results/<commit>.json la latencia p50/p95/p99 (ms), el
+throughput y los errores por escenario y por paso. Con --scenario se puede
+ejecutar uno solo; por defecto se usa la mezcla DEFAULT_WEIGHTS.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+from loadtest.scenarios import DEFAULT_WEIGHTS, SCENARIOS, LoadContext, VirtualUser, prepare
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre valores ya ordenados"""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], errors: int, duration: float) -> Dict[str, float]:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / duration, 2) if duration else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def _virtual_user(ctx: LoadContext, user: VirtualUser, names: List[str], weights: List[int],
+                        deadline: float, think_time: float) -> None:
+    while time.perf_counter() < deadline:
+        name = ctx.rng.choices(names, weights)[0]
+        try:
+            await SCENARIOS[name](ctx, user)
+        except httpx.HTTPError:
+            pass
+        if think_time:
+            await asyncio.sleep(ctx.rng.uniform(0, think_time))
+
+
+async def run(args) -> Dict:
+    weights = {args.scenario: 1} if args.scenario else DEFAULT_WEIGHTS
+    limits = httpx.Limits(max_connections=args.users * 2, max_keepalive_connections=args.users * 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        ctx = LoadContext(
+            client=client,
+            api_prefix=args.api_prefix,
+            rng=random.Random(args.seed),
+            admin=VirtualUser("admin@loadtest.local", "admin"),
+        )
+        await prepare(ctx, developers=max(1, args.users), cards_per_list=args.cards_per_list)
+
+        # Calentamiento sin registrar (pool de conexiones, cachés)
+        ctx.recording = False
+        await asyncio.gather(*(
+            _virtual_user(ctx, dev, list(weights), list(weights.values()), time.perf_counter() + args.warmup, 0)
+            for dev in ctx.developers
+        ))
+        ctx.recording = True
+
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            _virtual_user(ctx, dev, list(weights), list(weights.values()), deadline, args.think_time)
+            for dev in ctx.developers
+        ))
+        elapsed = time.perf_counter() - start
+
+    steps = {
+        name: summarize(values, ctx.errors.get(name, 0), elapsed)
+        for name, values in sorted(ctx.latencies.items())
+    }
+    scenarios: Dict[str, Dict] = {}
+    for scenario in weights:
+        prefix = f"{scenario}:"
+        values = [v for name, vs in ctx.latencies.items() if name.startswith(prefix) for v in vs]
+        errors = sum(count for name, count in ctx.errors.items() if name.startswith(prefix))
+        scenarios[scenario] = summarize(values, errors, elapsed)
+
+    all_values = [v for vs in ctx.latencies.values() for v in vs]
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "base_url": args.base_url,
+            "users": args.users,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "think_time_s": args.think_time,
+            "cards_per_list": args.cards_per_list,
+            "seed": args.seed,
+            "weights": weights,
+        },
+        "total": summarize(all_values, sum(ctx.errors.values()), elapsed),
+        "scenarios": scenarios,
+        "steps": steps,
+    }
+
+
+def print_report(results: Dict) -> None:
+    header = f"{'escenario/paso':<36} {'req':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print("-" * len(header))
+    rows = [("TOTAL", results["total"])] + list(results["scenarios"].items()) + list(results["steps"].items())
+    for name, s in rows:
+        print(f"{name:<36} {s['requests']:>7} {s['errors']:>5} {s['throughput_rps']:>8} "
+              f"{s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Pruebas de carga del API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--api-prefix", default="/api")
+    parser.add_argument("--users", type=int, default=10, help="Usuarios virtuales concurrentes")
+    parser.add_argument("--duration", type=float, default=60, help="Segundos de medición")
+    parser.add_argument("--warmup", type=float, default=5, help="Segundos de calentamiento sin registrar")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pausa aleatoria máxima entre iteraciones")
+    parser.add_argument("--cards-per-list", type=int, default=20)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), help="Ejecutar solo este escenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Archivo de resultados (por defecto loadtest/results/<commit>.json)")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    print_report(results)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResultados guardados en {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Escenarios de carga y preparación de datos a través del API.
+
+Cada escenario es una corrutina `(ctx, user) -> None` que ejecuta una
+iteración; las peticiones se registran con `ctx.request(...)` bajo el nombre
+"<escenario>:<paso>" para poder ver qué llamada domina la latencia.
+"""
+
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from loadtest.fakes import make_token
+
+
+@dataclass
+class VirtualUser:
+    email: str
+    role: str
+    local_id: Optional[str] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {make_token(self.email, self.role)}"}
+
+
+@dataclass
+class LoadContext:
+    """Datos compartidos por los escenarios y acumulador de latencias"""
+
+    client: httpx.AsyncClient
+    api_prefix: str
+    rng: random.Random
+    admin: VirtualUser
+    developers: List[VirtualUser] = field(default_factory=list)
+    project_id: Optional[str] = None
+    board_id: Optional[str] = None
+    list_ids: List[str] = field(default_factory=list)
+    cards: Dict[str, str] = field(default_factory=dict)  # card_id -> list_id
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    recording: bool = True
+
+    async def request(self, name: str, user: VirtualUser, method: str, path: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, f"{self.api_prefix}{path}", headers=user.headers, **kwargs)
+        except httpx.HTTPError:
+            if self.recording:
+                self.errors[name] += 1
+            raise
+        elapsed = time.perf_counter() - start
+        if self.recording:
+            self.latencies[name].append(elapsed)
+            if response.status_code >= 400:
+                self.errors[name] += 1
+        return response
+
+
+async def prepare(ctx: LoadContext, developers: int, cards_per_list: int) -> None:
+    """Crear el proyecto, el tablero, los miembros y las tarjetas de la corrida"""
+    ctx.recording = False
+    suffix = ctx.rng.randrange(16 ** 6)
+
+    # El primer request de cada usuario lo crea en user_profiles
+    await ctx.request("setup", ctx.admin, "GET", "/auth/me")
+    ctx.developers = [VirtualUser(f"dev{i}@loadtest.local", "developer") for i in range(developers)]
+    for dev in ctx.developers:
+        (await ctx.request("setup", dev, "GET", "/auth/me")).raise_for_status()
+
+    project = await ctx.request("setup", ctx.admin, "POST", "/projects/", json={
+        "name": f"Loadtest {suffix:06x}",
+        "description": "Proyecto generado por loadtest.runner"
+    })
+    project.raise_for_status()
+    ctx.project_id = project.json()["id"]
+
+    for dev in ctx.developers:
+        (await ctx.request("setup", ctx.admin, "POST", f"/projects/{ctx.project_id}/members",
+                           params={"member_email": dev.email, "role": "developer"})).raise_for_status()
+    members = (await ctx.request("setup", ctx.admin, "GET", f"/projects/{ctx.project_id}/members")).json()
+    local_ids = {member["email"]: member["user_id"] for member in members}
+    for dev in ctx.developers:
+        dev.local_id = local_ids.get(dev.email)
+
+    board = await ctx.request("setup", ctx.admin, "POST", "/boards/", json={
+        "name": "Tablero de carga",
+        "project_id": ctx.project_id,
+        "template": "kanban"
+    })
+    board.raise_for_status()
+    ctx.board_id = board.json()["id"]
+
+    lists = (await ctx.request("setup", ctx.admin, "GET", f"/boards/{ctx.board_id}/lists")).json()
+    ctx.list_ids = [item["id"] for item in lists]
+    for list_id in ctx.list_ids:
+        for position in range(cards_per_list):
+            assignee = ctx.rng.choice(ctx.developers) if ctx.developers else None
+            card = await ctx.request("setup", ctx.admin, "POST", f"/boards/lists/{list_id}/cards", json={
+                "title": f"Tarjeta {position}",
+                "description": "Generada para pruebas de carga",
+                "position": position,
+                "assignee_id": assignee.local_id if assignee else None
+            })
+            card.raise_for_status()
+            ctx.cards[card.json()["id"]] = list_id
+
+    ctx.recording = True
+
+
+async def board_open(ctx: LoadContext, user: VirtualUser) -> None:
+    """Abrir el tablero: detalle, listas y tarjetas de cada lista"""
+    await ctx.request("board_open:board", user, "GET", f"/boards/{ctx.board_id}")
+    await ctx.request("board_open:lists", user, "GET", f"/boards/{ctx.board_id}/lists")
+    for list_id in ctx.list_ids:
+        await ctx.request("board_open:cards", user, "GET", f"/boards/lists/{list_id}/cards")
+
+
+async def card_move(ctx: LoadContext, user: VirtualUser) -> None:
+    """Arrastrar una tarjeta a otra lista"""
+    card_id = ctx.rng.choice(list(ctx.cards))
+    targets = [list_id for list_id in ctx.list_ids if list_id != ctx.cards[card_id]] or ctx.list_ids
+    target = ctx.rng.choice(targets)
+    response = await ctx.request("card_move:update", user, "PUT", f"/boards/cards/{card_id}", json={
+        "list_id": target,
+        "position": ctx.rng.randrange(20)
+    })
+    if response.status_code == 200:
+        ctx.cards[card_id] = target
+
+
+async def comment_burst(ctx: LoadContext, user: VirtualUser) -> None:
+    """Varios comentarios seguidos sobre la misma tarjeta y relectura del hilo"""
+    card_id = ctx.rng.choice(list(ctx.cards))
+    for i in range(5):
+        await ctx.request("comment_burst:add", user, "POST", f"/boards/cards/{card_id}/comments", json={
+            "content": f"Comentario de carga {i}"
+        })
+    await ctx.request("comment_burst:list", user, "GET", f"/boards/cards/{card_id}/comments")
+
+
+async def notification_polling(ctx: LoadContext, user: VirtualUser) -> None:
+    """Sondeo periódico de notificaciones del cliente web"""
+    await ctx.request("notification_polling:list", user, "GET", "/notifications/")
+
+
+async def admin_project_listing(ctx: LoadContext, user: VirtualUser) -> None:
+    """Vista de administración: proyectos y tableros"""
+    await ctx.request("admin_project_listing:projects", ctx.admin, "GET", "/projects/")
+    await ctx.request("admin_project_listing:boards", ctx.admin, "GET", "/boards/")
+
+
+SCENARIOS: Dict[str, Callable[[LoadContext, VirtualUser], Awaitable[Any]]] = {
+    "board_open": board_open,
+    "card_move": card_move,
+    "comment_burst": comment_burst,
+    "notification_polling": notification_polling,
+    "admin_project_listing": admin_project_listing,
+}
+
+# Mezcla por defecto: lecturas dominantes, escrituras frecuentes
+DEFAULT_WEIGHTS: Dict[str, int] = {
+    "board_open": 30,
+    "card_move": 20,
+    "comment_burst": 10,
+    "notification_polling": 30,
+    "admin_project_listing": 10,
+}
@@ -0,0 +1,70 @@
+"""Recordatorios de vencimiento de tarjetas
+
+- idx_cards_due_date: rangos de due_date que la tarea de recordatorios recorre
+  en cada ejecución (solo tarjetas con fecha de vencimiento).
+- idx_cards_due_updated_at: tarjetas con fecha editadas desde la última
+  ejecución, cuya nueva fecha ya cae dentro de la ventana de aviso.
+- card_reminders: un registro por tarjeta, umbral y fecha de vencimiento; su
+  clave primaria garantiza que cada aviso se cree una sola vez.
+- scheduler_watermarks: hasta dónde llegó cada tarea incremental.
+"""
+
+import logging
+from sqlalchemy import text
+from app.database.db import engine
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_migration():
+    """Crear índices y tablas si no existen"""
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_cards_due_date
+                ON cards (due_date)
+                WHERE due_date IS NOT NULL
+            """))
+
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_cards_due_updated_at
+                ON cards (updated_at)
+                WHERE due_date IS NOT NULL
+            """))
+
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS card_reminders (
+                    card_id VARCHAR NOT NULL REFERENCES cards(id) ON DELETE CASCADE,
+                    threshold VARCHAR(20) NOT NULL,
+                    due_date TIMESTAMP NOT NULL,
+                    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    PRIMARY KEY (card_id, threshold, due_date)
+                )
+            """))
+
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS scheduler_watermarks (
+                    job VARCHAR PRIMARY KEY,
+                    scanned_until TIMESTAMP NOT NULL,
+                    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+                )
+            """))
+
+            transaction.commit()
+            logger.info("Migration successful: card due-date reminder tables and indexes")
+            return True
+        except Exception as e:
+            transaction.rollback()
+            logger.error(f"Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        logger.info("Card due reminders migration completed successfully")
+    else:
+        logger.error("Card due reminders migration failed")
@@ -0,0 +1,65 @@
+import logging
+from sqlalchemy import text
+from app.database.db import engine
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def run_migration():
+    """Crear la tabla card_events (registro de movimientos de tarjetas) si no existe"""
+
+    check_table_query = text("""
+        SELECT EXISTS (
+            SELECT FROM information_schema.tables
+            WHERE table_schema = 'public'
+            AND table_name = 'card_events'
+        );
+    """)
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            table_exists = connection.execute(check_table_query).fetchone()[0]
+
+            if not table_exists:
+                # Registro de solo inserción, sin claves foráneas para conservar el historial
+                connection.execute(text("""
+                    CREATE TABLE card_events (
+                        id BIGSERIAL PRIMARY KEY,
+                        card_id VARCHAR NOT NULL,
+                        board_id VARCHAR NOT NULL,
+                        event_type VARCHAR(20) NOT NULL,
+                        from_list_id VARCHAR,
+                        to_list_id VARCHAR,
+                        assignee_id VARCHAR,
+                        actor_id VARCHAR,
+                        ts TIMESTAMP NOT NULL DEFAULT NOW()
+                    )
+                """))
+
+                connection.execute(text("""
+                    CREATE INDEX idx_card_events_board_ts ON card_events(board_id, ts);
+                """))
+
+                connection.execute(text("""
+                    CREATE INDEX idx_card_events_card_ts ON card_events(card_id, ts);
+                """))
+
+                logger.info("Migration successful: Created card_events table with indexes")
+            else:
+                logger.info("Table card_events already exists, skipping migration")
+
+            transaction.commit()
+            return True
+        except Exception as e:
+            transaction.rollback()
+            logger.error(f"Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        logger.info("Card events table migration completed successfully")
+    else:
+        logger.error("Card events table migration failed")
@@ -4,10 +4,9 @@ Migración para agregar el campo email_notifications a la tabla user_profiles
 """
 
 import sys
-import os
-from sqlalchemy import create_engine, text
-from sqlalchemy.exc import SQLAlchemyError
 import logging
+from sqlalchemy import text
+from app.database.db import engine
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -15,17 +14,9 @@ logger = logging.getLogger(__name__)
 
 def run_migration():
     """Run the migration to add email_notifications column if it doesn't exist"""
-    # Importar configuración
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from app.core.config import settings
-    
-    try:
-        # Crear conexión a la base de datos
-        engine = create_engine(settings.DATABASE_URL)
-        
-        with engine.connect() as connection:
-            transaction = connection.begin()
-            
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
             # Verificar si la columna ya existe
             check_column_query = text("""
                 SELECT column_name 
@@ -49,10 +40,10 @@ def run_migration():
                 
             transaction.commit()
             return True
-    except Exception as e:
-        transaction.rollback()
-        logger.error(f"Migration failed: {str(e)}")
-        return False
+        except Exception as e:
+            transaction.rollback()
+            logger.error(f"Migration failed: {str(e)}")
+            return False
 
 if __name__ == "__main__":
     success = run_migration()
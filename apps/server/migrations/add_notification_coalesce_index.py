@@ -0,0 +1,42 @@
+"""Índice parcial para agrupar notificaciones repetidas
+
+create_notification con `coalesce_seconds` busca la notificación no leída más
+reciente del mismo (usuario, entidad, tipo) para actualizarla en lugar de
+insertar otra. El índice solo cubre las no leídas, que son las que se agrupan.
+"""
+
+import logging
+from sqlalchemy import text
+from app.database.db import engine
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_migration():
+    """Crear el índice si no existe"""
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_notifications_unread_coalesce
+                ON notifications (user_id, entity_id, type, updated_at DESC)
+                WHERE read = false
+            """))
+
+            transaction.commit()
+            logger.info("Migration successful: partial index for notification coalescing")
+            return True
+        except Exception as e:
+            transaction.rollback()
+            logger.error(f"Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        logger.info("Notification coalesce index migration completed successfully")
+    else:
+        logger.error("Notification coalesce index migration failed")
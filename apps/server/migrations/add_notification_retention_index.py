@@ -0,0 +1,42 @@
+"""Índice para la purga de notificaciones por antigüedad
+
+La tarea de retención (app/services/notification_retention.py) recorre las
+notificaciones leídas o no leídas más antiguas que el límite configurado, en
+orden de created_at; el índice (read, created_at) le permite leer solo las
+filas a borrar en cada lote.
+"""
+
+import logging
+from sqlalchemy import text
+from app.database.db import engine
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_migration():
+    """Crear el índice si no existe"""
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_notifications_read_created_at
+                ON notifications (read, created_at)
+            """))
+
+            transaction.commit()
+            logger.info("Migration successful: retention index on notifications")
+            return True
+        except Exception as e:
+            transaction.rollback()
+            logger.error(f"Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        logger.info("Notification retention index migration completed successfully")
+    else:
+        logger.error("Notification retention index migration failed")
@@ -1,7 +1,6 @@
 import logging
-from sqlalchemy import create_engine, text
-from sqlalchemy.exc import SQLAlchemyError
-from app.core.config import settings
+from sqlalchemy import text
+from app.database.db import engine
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -10,9 +9,6 @@ logger = logging.getLogger(__name__)
 def run_migration():
     """Run the migration to create the notifications table if it doesn't exist"""
     
-    # Crear el engine de la base de datos
-    engine = create_engine(settings.DATABASE_URL)
-    
     # Query para verificar si la tabla existe
     check_table_query = text("""
         SELECT EXISTS (
@@ -0,0 +1,70 @@
+"""Agregar columnas tsvector generadas e índices GIN para la búsqueda de texto completo
+
+Cada tabla obtiene una columna `search_vector` generada (STORED) que combina
+las configuraciones 'spanish' e 'english', con el título con más peso que la
+descripción. Postgres la mantiene en cada escritura.
+"""
+
+import logging
+from sqlalchemy import text
+from app.database.db import engine
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _weighted(column: str, weight: str) -> str:
+    return (
+        f"setweight(to_tsvector('spanish', coalesce({column}, '')), '{weight}') || "
+        f"setweight(to_tsvector('english', coalesce({column}, '')), '{weight}')"
+    )
+
+
+SEARCH_VECTORS = {
+    "cards": _weighted("title", "A") + " || " + _weighted("description", "B"),
+    "user_stories": _weighted("title", "A") + " || " + _weighted("description", "B"),
+    "comments": _weighted("content", "B"),
+}
+
+
+def run_migration():
+    """Crear las columnas search_vector y sus índices si no existen"""
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            for table, expression in SEARCH_VECTORS.items():
+                exists = connection.execute(text("""
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = :table AND column_name = 'search_vector'
+                """), {"table": table}).fetchone()
+
+                if exists:
+                    logger.info(f"Column {table}.search_vector already exists, skipping")
+                    continue
+
+                connection.execute(text(f"""
+                    ALTER TABLE {table}
+                    ADD COLUMN search_vector tsvector
+                    GENERATED ALWAYS AS ({expression}) STORED
+                """))
+                connection.execute(text(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{table}_search_vector
+                    ON {table} USING GIN (search_vector)
+                """))
+                logger.info(f"Added {table}.search_vector with GIN index")
+
+            transaction.commit()
+            return True
+        except Exception as e:
+            transaction.rollback()
+            logger.error(f"Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        logger.info("Search vectors migration completed successfully")
+    else:
+        logger.error("Search vectors migration failed")
@@ -0,0 +1,47 @@
+"""Índices btree (text_pattern_ops) para la búsqueda de usuarios por prefijo
+
+Los índices de trigramas (add_user_trigram_indexes.py) no sirven para términos
+de menos de 3 caracteres; GET /users/search busca esos términos solo como
+prefijo de lower(email) y del nombre completo, que estos índices resuelven con
+un recorrido de rango.
+"""
+
+import logging
+from sqlalchemy import text
+from app.database.db import engine
+from app.services.user_search import FULL_NAME_EXPR
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_migration():
+    """Crear los índices si no existen"""
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_user_profiles_email_prefix
+                ON user_profiles (lower(email) text_pattern_ops)
+            """))
+            connection.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS idx_user_profiles_name_prefix
+                ON user_profiles (({FULL_NAME_EXPR}) text_pattern_ops)
+            """))
+
+            transaction.commit()
+            logger.info("Migration successful: prefix indexes on user_profiles")
+            return True
+        except Exception as e:
+            transaction.rollback()
+            logger.error(f"Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        logger.info("User prefix indexes migration completed successfully")
+    else:
+        logger.error("User prefix indexes migration failed")
@@ -0,0 +1,49 @@
+"""Habilitar pg_trgm y crear índices de trigramas para la búsqueda de usuarios
+
+Los índices cubren las mismas expresiones que usa GET /users/search
+(app/services/user_search.py), por lo que LIKE '%texto%' y la similitud
+por trigramas se resuelven con el índice en lugar de recorrer la tabla.
+"""
+
+import logging
+from sqlalchemy import text
+from app.database.db import engine
+from app.services.user_search import FULL_NAME_EXPR
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_migration():
+    """Crear la extensión y los índices si no existen"""
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            # Requiere permisos para crear extensiones (owner de la base de datos)
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_user_profiles_email_trgm
+                ON user_profiles USING GIN (lower(email) gin_trgm_ops)
+            """))
+            connection.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS idx_user_profiles_name_trgm
+                ON user_profiles USING GIN (({FULL_NAME_EXPR}) gin_trgm_ops)
+            """))
+
+            transaction.commit()
+            logger.info("Migration successful: pg_trgm indexes on user_profiles")
+            return True
+        except Exception as e:
+            transaction.rollback()
+            logger.error(f"Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        logger.info("User trigram indexes migration completed successfully")
+    else:
+        logger.error("User trigram indexes migration failed")
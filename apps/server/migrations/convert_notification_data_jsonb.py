@@ -0,0 +1,60 @@
+"""Convertir notifications.data a JSONB y crear su índice GIN
+
+La columna guardaba la salida de json.dumps en TEXT y cada lectura hacía
+json.loads por fila. Como JSONB el driver decodifica el valor y el índice GIN
+(jsonb_path_ops) resuelve consultas de contención como
+`data @> '{"card_id": "..."}'` (notificaciones sobre una tarjeta).
+
+ALTER COLUMN ... TYPE reescribe la tabla con un lock exclusivo: aplicar en una
+ventana de mantenimiento si la tabla es grande.
+"""
+
+import logging
+from sqlalchemy import text
+from app.database.db import engine
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_migration():
+    """Cambiar el tipo de la columna (si aún no es JSONB) y crear el índice"""
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            data_type = connection.execute(text("""
+                SELECT data_type FROM information_schema.columns
+                WHERE table_name = 'notifications' AND column_name = 'data'
+            """)).scalar()
+
+            if data_type != "jsonb":
+                # Los valores vacíos pasan a NULL; el resto es salida de json.dumps
+                connection.execute(text("""
+                    ALTER TABLE notifications
+                    ALTER COLUMN data TYPE JSONB USING NULLIF(btrim(data::text), '')::jsonb
+                """))
+                logger.info(f"Column notifications.data converted from {data_type} to jsonb")
+            else:
+                logger.info("Column notifications.data is already jsonb")
+
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_notifications_data
+                ON notifications USING GIN (data jsonb_path_ops)
+            """))
+
+            transaction.commit()
+            logger.info("Migration successful: notifications.data is JSONB with GIN index")
+            return True
+        except Exception as e:
+            transaction.rollback()
+            logger.error(f"Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        logger.info("Notification data JSONB migration completed successfully")
+    else:
+        logger.error("Notification data JSONB migration failed")
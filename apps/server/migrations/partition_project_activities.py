@@ -0,0 +1,117 @@
+"""Convertir project_activities en una tabla particionada por mes (created_at)
+
+- Renombra la tabla actual, crea la tabla particionada con clave primaria
+  (id, created_at) e índice (project_id, created_at, id).
+- Crea una partición por mes desde la actividad más antigua hasta tres meses
+  adelante, más una partición DEFAULT de respaldo.
+- Copia las filas existentes y elimina la tabla anterior.
+
+Las particiones de meses futuros las mantiene la tarea periódica
+`activity_partitions` (app/services/activity.py).
+"""
+
+import logging
+from datetime import date
+from sqlalchemy import text
+from app.database.db import engine
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MONTHS_AHEAD = 3
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def run_migration():
+    """Particionar project_activities si aún no lo está"""
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            partitioned = connection.execute(text("""
+                SELECT 1 FROM pg_partitioned_table pt
+                JOIN pg_class c ON c.oid = pt.partrelid
+                WHERE c.relname = 'project_activities'
+            """)).fetchone()
+            if partitioned:
+                logger.info("project_activities is already partitioned, skipping migration")
+                transaction.commit()
+                return True
+
+            exists = connection.execute(text("SELECT to_regclass('project_activities')")).scalar()
+            if exists:
+                connection.execute(text("ALTER TABLE project_activities RENAME TO project_activities_old"))
+
+            connection.execute(text("""
+                CREATE TABLE project_activities (
+                    id VARCHAR NOT NULL,
+                    project_id VARCHAR NOT NULL REFERENCES projects(id),
+                    user_id VARCHAR NOT NULL REFERENCES user_profiles(id),
+                    activity_type VARCHAR NOT NULL,
+                    description VARCHAR NOT NULL,
+                    extra_data VARCHAR,
+                    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+                    PRIMARY KEY (id, created_at)
+                ) PARTITION BY RANGE (created_at)
+            """))
+            connection.execute(text("""
+                CREATE INDEX idx_project_activities_feed
+                ON project_activities (project_id, created_at DESC, id DESC)
+            """))
+
+            first_month = date.today().replace(day=1)
+            if exists:
+                oldest = connection.execute(text("SELECT MIN(created_at) FROM project_activities_old")).scalar()
+                if oldest:
+                    first_month = min(first_month, oldest.date().replace(day=1))
+
+            last_month = date.today().replace(day=1)
+            for _ in range(MONTHS_AHEAD):
+                last_month = _next_month(last_month)
+
+            month = first_month
+            while month <= last_month:
+                next_month = _next_month(month)
+                connection.execute(text(
+                    f"CREATE TABLE project_activities_{month:%Y_%m} PARTITION OF project_activities "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+                ))
+                month = next_month
+
+            connection.execute(text(
+                "CREATE TABLE project_activities_default PARTITION OF project_activities DEFAULT"
+            ))
+
+            if exists:
+                copied = connection.execute(text("""
+                    INSERT INTO project_activities (
+                        id, project_id, user_id, activity_type, description,
+                        extra_data, created_at, updated_at, is_active
+                    )
+                    SELECT id::text, project_id, user_id, activity_type, description,
+                           extra_data, COALESCE(created_at, NOW()), COALESCE(updated_at, created_at, NOW()), true
+                    FROM project_activities_old
+                """)).rowcount
+                connection.execute(text("DROP TABLE project_activities_old"))
+                logger.info(f"Copied {copied} activities into the partitioned table")
+
+            transaction.commit()
+            logger.info("Migration successful: project_activities partitioned by month")
+            return True
+        except Exception as e:
+            transaction.rollback()
+            logger.error(f"Migration failed: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    success = run_migration()
+    if success:
+        logger.info("Project activities partitioning completed successfully")
+    else:
+        logger.error("Project activities partitioning failed")
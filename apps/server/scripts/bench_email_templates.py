@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmark del render de emails de notificación.
+
+Compara, por email:
+- la implementación anterior (f-string armada en cada llamada);
+- la plantilla Jinja2 compilada y cacheada de app/services/email_templates.py;
+- compilar la plantilla en cada email (lo que la caché evita).
+
+Con --content-kb se mide también un contenido grande y el tiempo que el event
+loop queda ocupado al renderizarlo en línea frente a `render_async`, que lo
+delega a un hilo a partir de EMAIL_RENDER_OFFLOAD_BYTES.
+
+Uso:
+    python scripts/bench_email_templates.py [--iterations 5000] [--content-kb 256]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+from app.services.email_templates import TEMPLATES_DIR, email_templates  # noqa: E402
+
+CONTENT = "Juan Pérez te asignó la tarjeta 'Integrar pasarela de pagos' en el tablero Sprint 12."
+ENTITY_DATA = {"card_id": "c-1", "board_id": "b-1"}
+
+
+def legacy_render(
+    to_name: str,
+    notification_type: str,
+    content: str,
+    entity_data: Optional[Dict[str, Any]] = None
+) -> str:
+    """Implementación anterior (f-string por email), copiada como referencia"""
+
+    # Determinar color y icono según el tipo
+    type_config = {
+        "card_assigned": {"color": "#3B82F6", "icon": "📋", "title": "Nueva asignación"},
+        "card_comment": {"color": "#10B981", "icon": "💬", "title": "Nuevo comentario"},
+        "card_updated": {"color": "#F59E0B", "icon": "✏️", "title": "Tarjeta actualizada"},
+        "project_invitation": {"color": "#8B5CF6", "icon": "👥", "title": "Invitación a proyecto"},
+        "project_obsolete": {"color": "#EF4444", "icon": "⚠️", "title": "Proyecto marcado como obsoleto"},
+        "default": {"color": "#6B7280", "icon": "🔔", "title": "Notificación"}
+    }
+
+    config = type_config.get(notification_type, type_config["default"])
+
+    # Generar enlace si hay datos de entidad
+    action_link = ""
+    if entity_data:
+        if "card_id" in entity_data and "board_id" in entity_data:
+            action_link = f'<p style="margin: 20px 0;"><a href="http://localhost:3000/boards/{entity_data["board_id"]}" style="background-color: {config["color"]}; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">Ver tarjeta</a></p>'
+
+    html_template = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>{config['title']}</title>
+    </head>
+    <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f8fafc;">
+        <div style="max-width: 600px; margin: 0 auto; background-color: white; border-radius: 8px; overflow: hidden; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);">
+
+            <!-- Header -->
+            <div style="background-color: {config['color']}; color: white; padding: 24px; text-align: center;">
+                <h1 style="margin: 0; font-size: 24px; font-weight: 600;">
+                    {config['icon']} {config['title']}
+                </h1>
+            </div>
+
+            <!-- Content -->
+            <div style="padding: 32px;">
+                <h2 style="color: #1f2937; margin: 0 0 16px 0; font-size: 18px;">
+                    Hola {to_name},
+                </h2>
+
+                <p style="color: #4b5563; line-height: 1.6; margin: 0 0 24px 0; font-size: 16px;">
+                    {content}
+                </p>
+
+                {action_link}
+
+                <hr style="border: none; height: 1px; background-color: #e5e7eb; margin: 24px 0;">
+
+                <p style="color: #6b7280; font-size: 14px; margin: 0;">
+                    Este mensaje fue enviado automáticamente por el Sistema de Gestión de Proyectos Ágiles.
+                    <br>
+                    <a href="http://localhost:3000/profile" style="color: {config['color']};">Configurar preferencias de email</a>
+                </p>
+            </div>
+
+            <!-- Footer -->
+            <div style="background-color: #f9fafb; padding: 16px; text-align: center; border-top: 1px solid #e5e7eb;">
+                <p style="color: #9ca3af; font-size: 12px; margin: 0;">
+                    © 2024 Sistema de Gestión de Proyectos Ágiles
+                </p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+    return html_template
+
+
+def _per_call_compile(to_name: str, notification_type: str, content: str,
+                      entity_data: Optional[Dict[str, Any]] = None) -> str:
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    env = Environment(loader=FileSystemLoader(TEMPLATES_DIR), autoescape=select_autoescape(["html"]))
+    return env.get_template("notification.html").render(
+        config={"color": "#3B82F6", "icon": "📋", "title": "Nueva asignación"},
+        to_name=to_name, content=content, entity_data=entity_data or {},
+        frontend_url="http://localhost:3000", year=2025,
+    )
+
+
+def _bench(name: str, render: Callable[..., str], iterations: int, content: str) -> None:
+    render("Ana López", "card_assigned", content, ENTITY_DATA)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render("Ana López", "card_assigned", content, ENTITY_DATA)
+    per_call_us = (time.perf_counter() - start) / iterations * 1_000_000
+    print(f"{name:<34} {per_call_us:10.1f} µs/email")
+
+
+async def _loop_blocked_ms(render: Callable[[], Any]) -> float:
+    """Mayor retraso de un tick de 1 ms del event loop mientras se renderiza"""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst = max(worst, (time.perf_counter() - start) * 1000 - 1)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    result = render()
+    if asyncio.iscoroutine(result):
+        await result
+    done = True
+    await task
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo de renderizar un email de notificación")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--content-kb", type=int, default=256, help="Tamaño del contenido grande (0 para omitir)")
+    args = parser.parse_args()
+
+    email_templates.load()
+    print(f"Email típico ({args.iterations} renders)")
+    _bench("f-string (anterior)", legacy_render, args.iterations, CONTENT)
+    _bench("Jinja2 compilada y cacheada", email_templates.render, args.iterations, CONTENT)
+    _bench("Jinja2 compilando en cada email", _per_call_compile, max(1, args.iterations // 10), CONTENT)
+
+    if args.content_kb:
+        large = (CONTENT + " ") * (args.content_kb * 1024 // (len(CONTENT) + 1))
+        iterations = max(1, args.iterations // 100)
+        print(f"\nContenido de {args.content_kb} KB ({iterations} renders)")
+        _bench("f-string (anterior)", legacy_render, iterations, large)
+        _bench("Jinja2 compilada y cacheada", email_templates.render, iterations, large)
+
+        inline = asyncio.run(_loop_blocked_ms(
+            lambda: email_templates.render("Ana López", "card_assigned", large, ENTITY_DATA)
+        ))
+        offloaded = asyncio.run(_loop_blocked_ms(
+            lambda: email_templates.render_async("Ana López", "card_assigned", large, ENTITY_DATA)
+        ))
+        print(f"{'event loop bloqueado, en línea':<34} {inline:10.2f} ms")
+        print(f"{'event loop bloqueado, render_async':<34} {offloaded:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
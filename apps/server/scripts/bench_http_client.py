@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la validación de tokens contra Supabase Auth.
+
+Compara el patrón anterior (un httpx.AsyncClient nuevo por validación: contexto
+SSL, conexión TCP y handshake TLS cada vez) con el cliente compartido de
+app/core/http.py, que reutiliza conexiones keep-alive. Por defecto arranca el
+GoTrue falso de loadtest.fakes en el mismo proceso; como es HTTP plano en
+loopback, la diferencia medida es un mínimo: contra el Supabase real (--url y
+--token) se suma el handshake TLS que el pool evita.
+
+Uso:
+    python scripts/bench_http_client.py [--requests 500] [--concurrency 10] [--latency-ms 0]
+    python scripts/bench_http_client.py --url https://<proyecto>.supabase.co --key <anon> --token <jwt>
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import socket
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+async def _run(name: str, call: Callable[[], Awaitable[bool]], requests: int, concurrency: int) -> None:
+    latencies: List[float] = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            ok = await call()
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<24} media {statistics.mean(latencies):7.2f} ms  "
+        f"p50 {_percentile(latencies, 50):7.2f} ms  p95 {_percentile(latencies, 95):7.2f} ms  "
+        f"{requests / elapsed:8.1f} req/s  fallos {failures}"
+    )
+
+
+async def main_async(args) -> None:
+    server = None
+    server_task = None
+    if not args.url:
+        import uvicorn
+        from loadtest.fakes import create_gotrue_app, make_token
+
+        port = _free_port()
+        server = uvicorn.Server(uvicorn.Config(
+            create_gotrue_app(args.latency_ms), host="127.0.0.1", port=port, log_level="warning"
+        ))
+        server_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        args.url = f"http://127.0.0.1:{port}"
+        args.key = "loadtest"
+        args.token = make_token("bench@loadtest.local")
+
+    # La configuración se lee al importar, así que se fija antes de importar la app
+    os.environ["SUPABASE_URL"] = args.url
+    os.environ["SUPABASE_KEY"] = args.key
+
+    import httpx
+    from app.core.http import close_http_client, start_http_client
+    from app.core.supabase import validate_jwt_token
+
+    url = f"{args.url}/auth/v1/user"
+    headers = {"apikey": args.key, "Authorization": f"Bearer {args.token}"}
+
+    async def per_call_client() -> bool:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url, headers=headers)
+            return response.status_code == 200
+
+    async def pooled_client() -> bool:
+        return await validate_jwt_token(args.token) is not None
+
+    await start_http_client()
+    try:
+        # Calentar ambos caminos (imports, primera conexión del pool)
+        await per_call_client()
+        await pooled_client()
+
+        print(f"{args.requests} validaciones contra {args.url}, concurrencia {args.concurrency}")
+        await _run("cliente por llamada", per_call_client, args.requests, args.concurrency)
+        await _run("cliente compartido", pooled_client, args.requests, args.concurrency)
+    finally:
+        await close_http_client()
+        if server is not None:
+            server.should_exit = True
+            await server_task
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia por validación: cliente por llamada vs. compartido")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latencia del GoTrue falso")
+    parser.add_argument("--url", default="", help="Supabase real (por defecto, GoTrue falso local)")
+    parser.add_argument("--key", default="")
+    parser.add_argument("--token", default="")
+    args = parser.parse_args()
+    if args.url and not (args.key and args.token):
+        parser.error("--url requiere --key y --token")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark del costo de logging por petición.
+
+Compara, por llamada, el patrón anterior (print() del payload de Supabase en
+cada validación de token) con el logging actual: QueueHandler + listener en
+otro hilo, JSON y DEBUG muestreado o deshabilitado. La salida va a un archivo
+con buffer de línea, como stdout en un contenedor. En las rutas calientes
+los mensajes ahora son DEBUG, así que con LOG_LEVEL=INFO el costo es el del
+caso "DEBUG deshabilitado"; la cola no reduce el costo de CPU de INFO, pero
+evita que el event loop espere cuando stdout se bloquea.
+
+Uso:
+    python scripts/bench_logging.py [--iterations 20000]
+"""
+
+import argparse
+import logging
+import os
+import queue
+import sys
+import tempfile
+import time
+from logging.handlers import QueueListener
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+from app.core.logging_config import (  # noqa: E402
+    DebugSamplingFilter,
+    JsonFormatter,
+    TEXT_FORMAT,
+    _RecordQueueHandler,
+)
+
+# Respuesta típica de /auth/v1/user (la que antes se imprimía completa)
+PAYLOAD = {
+    "data": {
+        "user": {
+            "id": "6f0b1c52-3f43-4c1e-9f61-8a2e4c1d9b10",
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": "developer@example.com",
+            "app_metadata": {"provider": "email", "providers": ["email"]},
+            "user_metadata": {"first_name": "Ana", "last_name": "López", "role": "developer"},
+            "identities": [{"id": "6f0b1c52", "provider": "email", "last_sign_in_at": "2024-05-01T10:00:00Z"}],
+            "created_at": "2024-01-10T08:30:00Z",
+            "updated_at": "2024-05-01T10:00:00Z",
+        }
+    }
+}
+
+
+def _fresh_logger(name: str) -> logging.Logger:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers.clear()
+    logger.propagate = False
+    return logger
+
+
+def bench_print(out, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        print(f"Validando token JWT con respuesta: {PAYLOAD}", file=out)
+        print(f"Extrayendo información de usuario de: {type(PAYLOAD)}", file=out)
+    return time.perf_counter() - start
+
+
+def bench_sync_handler(out, n: int) -> float:
+    logger = _fresh_logger("sync")
+    handler = logging.StreamHandler(out)
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    start = time.perf_counter()
+    for _ in range(n):
+        logger.info("Token validado para %s", "developer@example.com")
+    return time.perf_counter() - start
+
+
+def _queued_logger(out, name: str, level: int, sample_rate: float):
+    logger = _fresh_logger(name)
+    stream = logging.StreamHandler(out)
+    stream.setFormatter(JsonFormatter())
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _RecordQueueHandler(log_queue)
+    handler.addFilter(DebugSamplingFilter(sample_rate))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    listener = QueueListener(log_queue, stream)
+    listener.start()
+    return logger, listener
+
+
+def bench_queue_info(out, n: int) -> float:
+    logger, listener = _queued_logger(out, "queue_info", logging.INFO, 1.0)
+    start = time.perf_counter()
+    for _ in range(n):
+        logger.info("Token validado para %s", "developer@example.com")
+    elapsed = time.perf_counter() - start
+    listener.stop()
+    return elapsed
+
+
+def bench_queue_debug_sampled(out, n: int) -> float:
+    logger, listener = _queued_logger(out, "queue_debug", logging.DEBUG, 0.1)
+    start = time.perf_counter()
+    for _ in range(n):
+        logger.debug("validate_jwt_token: código %s", 200)
+    elapsed = time.perf_counter() - start
+    listener.stop()
+    return elapsed
+
+
+def bench_debug_disabled(out, n: int) -> float:
+    logger, listener = _queued_logger(out, "disabled", logging.INFO, 0.1)
+    start = time.perf_counter()
+    for _ in range(n):
+        logger.debug("validate_jwt_token: código %s", 200)
+    elapsed = time.perf_counter() - start
+    listener.stop()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo por llamada de print() frente al logging en cola")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    cases = [
+        ("print() del payload (anterior)", bench_print),
+        ("logging síncrono a stdout", bench_sync_handler),
+        ("cola + JSON, INFO", bench_queue_info),
+        ("cola + JSON, DEBUG muestreado 10%", bench_queue_debug_sampled),
+        ("DEBUG deshabilitado", bench_debug_disabled),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        print(f"{'caso':<38} {'µs/petición':>12} {'vs print':>9}")
+        for label, func in cases:
+            with open(os.path.join(tmp, "out.log"), "w", buffering=1) as out:
+                elapsed = func(out, args.iterations)
+            per_call = elapsed / args.iterations * 1e6
+            baseline = baseline or per_call
+            print(f"{label:<38} {per_call:>12.2f} {baseline / per_call:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Verificar el costo de importar la aplicación.
+
+Ejecuta `python -X importtime -c "import app.main"` en un proceso nuevo y falla
+(código 1) si:
+- el tiempo acumulado de `app.main` supera el presupuesto (--budget-ms), o
+- se importó alguno de los módulos que deben cargarse solo en el primer uso
+  (NumPy y supabase-py).
+
+Se toma la mejor de --runs mediciones para reducir el ruido de la máquina. La
+misma comprobación corre en pytest (tests/test_import_time.py).
+
+Uso:
+    python scripts/check_import_time.py [--budget-ms 1500] [--runs 3] [--top 15]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import List, Tuple
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Módulos pesados que la aplicación construye de forma diferida
+LAZY_MODULES = ["numpy", "supabase"]
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure(module: str) -> List[Tuple[str, int, int, int]]:
+    """(módulo, self µs, acumulado µs, profundidad) por cada import; RuntimeError si falla"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def best_of(module: str, runs: int = 3) -> Tuple[float, List[Tuple[str, int, int, int]]]:
+    """Tiempo acumulado de `module` en ms y sus imports, en la más rápida de `runs` mediciones"""
+    best_ms, best_entries = float("inf"), []
+    for _ in range(max(1, runs)):
+        entries = measure(module)
+        total_ms = next((cumulative for name, _, cumulative, _ in entries if name == module), 0) / 1000
+        if total_ms < best_ms:
+            best_ms, best_entries = total_ms, entries
+    return best_ms, best_entries
+
+
+def eager_lazy_modules(entries: List[Tuple[str, int, int, int]]) -> List[str]:
+    """Módulos de LAZY_MODULES que se importaron"""
+    imported = {name for name, _, _, _ in entries}
+    return [name for name in LAZY_MODULES if name in imported]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Presupuesto de tiempo de importación de app.main")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "1500")))
+    parser.add_argument("--runs", type=int, default=3, help="Mediciones; se usa la más rápida")
+    parser.add_argument("--top", type=int, default=15, help="Dependencias directas más costosas a mostrar")
+    args = parser.parse_args()
+
+    try:
+        total_ms, entries = best_of(args.module, args.runs)
+    except RuntimeError as e:
+        sys.exit(str(e))
+
+    # Imports de primer nivel (los que disparó directamente la cadena de app.main)
+    top_level = sorted(
+        ((name, cumulative) for name, _, cumulative, depth in entries if depth <= 1),
+        key=lambda item: item[1], reverse=True
+    )
+    print(f"{'módulo':<48} {'acumulado ms':>12}")
+    for name, cumulative in top_level[:args.top]:
+        print(f"{name:<48} {cumulative / 1000:>12.1f}")
+
+    failures = []
+    eager = eager_lazy_modules(entries)
+    if eager:
+        failures.append(f"módulos que deberían cargarse en el primer uso: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        failures.append(f"{args.module} tarda {total_ms:.0f} ms (presupuesto: {args.budget_ms:.0f} ms)")
+
+    print(f"\n{args.module}: {total_ms:.0f} ms (presupuesto: {args.budget_ms:.0f} ms)")
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Dentro del presupuesto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+
+"""
+Generador de datos sintéticos para benchmarks.
+
+Carga usuarios, proyectos, miembros, tableros, listas, tarjetas, comentarios,
+historias, sprints y notificaciones con COPY, en bloques, de modo que millones
+de filas se cargan en minutos. Con la misma semilla y los mismos parámetros los
+datos (incluidos ids y fechas) son idénticos, así dos corridas de benchmark
+comparan lo mismo.
+
+Ejemplos:
+    # ~1.2 millones de tarjetas
+    python scripts/generate_dataset.py --projects 200 --boards-per-project 3 \\
+        --lists-per-board 5 --cards-per-list 400 --comments-per-card 2
+
+    # Vaciar antes las tablas (borra TODOS los datos de la aplicación)
+    python scripts/generate_dataset.py --truncate --seed 7
+
+Los usuarios generados usan emails @dataset.local; sus tokens para el GoTrue
+falso de loadtest.fakes son `lt.<rol>.<email>`.
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import psycopg2
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+from app.models.project import ProjectPriority, ProjectStatus  # noqa: E402
+
+# Fecha base fija: los timestamps no dependen del momento de ejecución
+BASE_DATE = datetime(2024, 1, 1, 8, 0, 0)
+COPY_BATCH_ROWS = 50000
+
+LIST_NAMES = ["Por hacer", "En progreso", "En revisión", "Hecho"]
+STORY_STATUSES = ["backlog", "sprint", "in_progress", "done"]
+# projects.status y priority son enums nativos de PostgreSQL creados por
+# create_all, cuyas etiquetas son los nombres de los miembros (ACTIVE, MEDIUM...)
+PROJECT_PRIORITIES = [
+    ProjectPriority.LOW, ProjectPriority.MEDIUM, ProjectPriority.MEDIUM,
+    ProjectPriority.HIGH, ProjectPriority.CRITICAL,
+]
+NOTIFICATION_TYPES = ["card_assigned", "card_comment", "card_updated", "project_invitation"]
+COVER_COLORS = [None, None, None, "#f87171", "#60a5fa", "#34d399", "#fbbf24"]
+WORDS = (
+    "api tablero sprint tarjeta usuario proyecto backlog despliegue base datos "
+    "login reporte métrica error rendimiento diseño prueba cliente servidor "
+    "notificación comentario búsqueda migración integración pago perfil"
+).split()
+
+# Tablas en orden de dependencia (para TRUNCATE y para el resumen)
+TABLES = [
+    "user_profiles", "projects", "project_members", "boards", "lists", "cards",
+    "comments", "user_stories", "sprints", "sprint_backlog", "notifications",
+]
+
+
+def get_dsn() -> str:
+    """DSN de psycopg2 a partir de DATABASE_URL o de las variables POSTGRES_*"""
+    database_url = os.environ.get("DATABASE_URL")
+    if database_url:
+        return database_url.replace("postgresql+asyncpg://", "postgresql://")
+    return "host={} port={} dbname={} user={} password={}".format(
+        os.environ.get("POSTGRES_HOST", "localhost"),
+        os.environ.get("POSTGRES_PORT", "5432"),
+        os.environ.get("POSTGRES_DB", "agiledb"),
+        os.environ.get("POSTGRES_USER", "agileuser"),
+        os.environ.get("POSTGRES_PASSWORD", "agilepassword"),
+    )
+
+
+class Generator:
+    """Fuente determinista de ids, fechas y textos"""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def ts(self, max_days: int = 365) -> datetime:
+        return BASE_DATE + timedelta(seconds=self.rng.randrange(max_days * 86400))
+
+    def sentence(self, min_words: int, max_words: int) -> str:
+        words = self.rng.choices(WORDS, k=self.rng.randint(min_words, max_words))
+        return " ".join(words).capitalize()
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    text = str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_rows(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """COPY en bloques de COPY_BATCH_ROWS filas; devuelve el total de filas"""
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    buffer = io.StringIO()
+    pending = total = 0
+
+    def flush():
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+        buffer.seek(0)
+        buffer.truncate()
+
+    for row in rows:
+        buffer.write("\t".join(_copy_value(v) for v in row))
+        buffer.write("\n")
+        pending += 1
+        if pending >= COPY_BATCH_ROWS:
+            flush()
+            total += pending
+            pending = 0
+    if pending:
+        flush()
+        total += pending
+    return total
+
+
+def generate(conn, args) -> Dict[str, int]:
+    gen = Generator(args.seed)
+    rng = gen.rng
+    cursor = conn.cursor()
+    counts = {}
+
+    def load(table: str, columns: Sequence[str], rows: Iterable[Sequence]):
+        start = time.perf_counter()
+        counts[table] = counts.get(table, 0) + copy_rows(cursor, table, columns, rows)
+        print(f"  {table:<16} {counts[table]:>10} filas  ({time.perf_counter() - start:.1f}s)")
+
+    # Usuarios: administradores y un grupo de miembros repartido entre proyectos
+    admins: List[str] = []
+    members: List[str] = []
+    user_rows = []
+    for i in range(args.admins + args.users):
+        user_id = gen.uuid()
+        is_admin = i < args.admins
+        (admins if is_admin else members).append(user_id)
+        email = f"{'admin' if is_admin else 'user'}{i}@dataset.local"
+        user_rows.append((
+            user_id, str(uuid.uuid5(uuid.NAMESPACE_URL, email)), f"Nombre{i}", f"Apellido{i}", email,
+            "admin" if is_admin else rng.choice(["developer", "developer", "product_owner", "member"]),
+            rng.random() < 0.3, BASE_DATE, BASE_DATE, True
+        ))
+    load("user_profiles", ["id", "auth_id", "first_name", "last_name", "email", "role",
+                           "email_notifications", "created_at", "updated_at", "is_active"], user_rows)
+
+    # Proyectos y membresías
+    projects = []  # (project_id, [member_ids], created)
+    project_rows, member_rows = [], []
+    for p in range(args.projects):
+        project_id = gen.uuid()
+        owner = rng.choice(admins)
+        created = gen.ts(90)
+        team = rng.sample(members, min(args.members_per_project, len(members)))
+        projects.append((project_id, team, created))
+        project_rows.append((
+            project_id, f"Proyecto {p} {gen.sentence(1, 3)}", gen.sentence(6, 14), owner, owner,
+            ProjectStatus.ACTIVE.name, rng.choice(PROJECT_PRIORITIES).name, created,
+            0.0, True, created, created
+        ))
+        for j, user_id in enumerate(team):
+            role = "product_owner" if j == 0 else "developer"
+            member_rows.append((gen.uuid(), user_id, project_id, role, created, True, created, created))
+    load("projects", ["id", "name", "description", "owner_id", "created_by", "status", "priority",
+                      "start_date", "completion_percentage", "is_active", "created_at", "updated_at"], project_rows)
+    load("project_members", ["id", "user_id", "project_id", "role", "joined_at", "is_active",
+                             "created_at", "updated_at"], member_rows)
+
+    # Tableros y listas
+    lists_by_project = []  # (team, [list_ids], created)
+    board_rows, list_rows = [], []
+    for project_id, team, created in projects:
+        list_ids = []
+        for b in range(args.boards_per_project):
+            board_id = gen.uuid()
+            board_rows.append((board_id, f"Tablero {b}", project_id, created, created, True))
+            for position in range(args.lists_per_board):
+                list_id = gen.uuid()
+                name = LIST_NAMES[position] if position < len(LIST_NAMES) else f"Lista {position}"
+                list_rows.append((list_id, name, board_id, position, created, created, True))
+                list_ids.append(list_id)
+        lists_by_project.append((team, list_ids, created))
+    load("boards", ["id", "name", "project_id", "created_at", "updated_at", "is_active"], board_rows)
+    load("lists", ["id", "name", "board_id", "position", "created_at", "updated_at", "is_active"], list_rows)
+
+    # Tarjetas y comentarios: se generan en streaming para no acumular millones de filas
+    card_ids_by_team: List[tuple] = []
+
+    def card_rows():
+        for team, list_ids, created in lists_by_project:
+            team_cards = []
+            for list_id in list_ids:
+                for position in range(args.cards_per_list):
+                    card_id = gen.uuid()
+                    team_cards.append(card_id)
+                    card_created = created + timedelta(seconds=rng.randrange(180 * 86400))
+                    due = card_created + timedelta(days=rng.randint(1, 45)) if rng.random() < 0.6 else None
+                    assignee = rng.choice(team) if team and rng.random() < 0.8 else None
+                    yield (card_id, gen.sentence(2, 6), gen.sentence(8, 30), list_id, position, due,
+                           assignee, rng.choice(COVER_COLORS), card_created, card_created, True)
+            card_ids_by_team.append((team, team_cards, created))
+
+    load("cards", ["id", "title", "description", "list_id", "position", "due_date", "assignee_id",
+                   "cover_color", "created_at", "updated_at", "is_active"], card_rows())
+
+    def comment_rows():
+        for team, team_cards, created in card_ids_by_team:
+            if not team:
+                continue
+            for card_id in team_cards:
+                for _ in range(args.comments_per_card):
+                    ts = created + timedelta(seconds=rng.randrange(200 * 86400))
+                    yield (gen.uuid(), card_id, rng.choice(team), gen.sentence(4, 20), ts, ts, True)
+
+    load("comments", ["id", "card_id", "user_id", "content", "created_at", "updated_at", "is_active"],
+         comment_rows())
+
+    # Sprints de dos semanas (el último de cada proyecto queda activo) e historias.
+    # Las historias fuera del backlog se asignan a un sprint: las terminadas a
+    # cualquiera y las pendientes al activo, como en el flujo normal.
+    story_rows, sprint_rows, backlog_rows = [], [], []
+    for project_id, team, created in projects:
+        sprint_ids = []
+        for s in range(args.sprints_per_project):
+            sprint_id = gen.uuid()
+            sprint_ids.append(sprint_id)
+            start = created + timedelta(days=14 * s)
+            status = "active" if s == args.sprints_per_project - 1 else "completed"
+            sprint_rows.append((sprint_id, f"Sprint {s + 1}", project_id, start, start + timedelta(days=14),
+                                gen.sentence(4, 10), status, True, start, start))
+        for s in range(args.stories_per_project):
+            story_id = gen.uuid()
+            status = rng.choice(STORY_STATUSES)
+            ts = created + timedelta(seconds=rng.randrange(120 * 86400))
+            story_rows.append((story_id, gen.sentence(3, 8), gen.sentence(10, 25), project_id,
+                               status, rng.randint(1, 5), rng.choice([1, 2, 3, 5, 8, 13]),
+                               ts, ts, True))
+            if sprint_ids and status != "backlog":
+                sprint_id = rng.choice(sprint_ids) if status == "done" else sprint_ids[-1]
+                backlog_rows.append((sprint_id, story_id))
+    load("user_stories", ["id", "title", "description", "project_id", "status", "priority", "story_points",
+                          "created_at", "updated_at", "is_active"], story_rows)
+    load("sprints", ["id", "name", "project_id", "start_date", "end_date", "goal", "status", "is_active",
+                     "created_at", "updated_at"], sprint_rows)
+    load("sprint_backlog", ["sprint_id", "story_id"], backlog_rows)
+
+    def notification_rows():
+        for user_id in admins + members:
+            for _ in range(args.notifications_per_user):
+                ts = gen.ts()
+                kind = rng.choice(NOTIFICATION_TYPES)
+                yield (gen.uuid(), user_id, gen.sentence(4, 10), kind, gen.uuid(),
+                       f'{{"generated": true, "kind": "{kind}"}}', rng.random() < 0.7, ts, ts, True)
+
+    load("notifications", ["id", "user_id", "content", "type", "entity_id", "data", "read",
+                           "created_at", "updated_at", "is_active"], notification_rows())
+
+    cursor.close()
+    return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generar un dataset sintético determinista con COPY")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--admins", type=int, default=5)
+    parser.add_argument("--users", type=int, default=500, help="Usuarios no administradores")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--members-per-project", type=int, default=8)
+    parser.add_argument("--boards-per-project", type=int, default=2)
+    parser.add_argument("--lists-per-board", type=int, default=4)
+    parser.add_argument("--cards-per-list", type=int, default=50)
+    parser.add_argument("--comments-per-card", type=int, default=2)
+    parser.add_argument("--stories-per-project", type=int, default=30)
+    parser.add_argument("--sprints-per-project", type=int, default=6)
+    parser.add_argument("--notifications-per-user", type=int, default=40)
+    parser.add_argument("--truncate", action="store_true",
+                        help="Vaciar las tablas de la aplicación antes de cargar (destructivo)")
+    args = parser.parse_args(argv)
+
+    conn = psycopg2.connect(get_dsn())
+    start = time.perf_counter()
+    try:
+        with conn:
+            if args.truncate:
+                print("Vaciando tablas...")
+                with conn.cursor() as cursor:
+                    cursor.execute(f"TRUNCATE {', '.join(TABLES)} CASCADE")
+            print(f"Generando dataset (semilla {args.seed})...")
+            counts = generate(conn, args)
+        with conn, conn.cursor() as cursor:
+            # Estadísticas frescas para que los planes de consulta reflejen el volumen nuevo
+            cursor.execute(f"ANALYZE {', '.join(TABLES)}")
+    except psycopg2.Error as e:
+        print(f"Error generando el dataset: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    print(f"\n{sum(counts.values())} filas en {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 #!/usr/bin/env python
 """
-Script para ejecutar migraciones de Alembic manualmente.
+Script para ejecutar migraciones manualmente.
+
+- --apply / --bootstrap / --check: migraciones versionadas de migrations/*.py
+  (ver app/database/schema.py). Es el paso único que debe correr antes de
+  arrancar los workers; la aplicación ya no ejecuta DDL al iniciar.
+- El resto de opciones envuelven los comandos de Alembic.
 """
 import os
 import sys
@@ -10,6 +15,23 @@ import argparse
 # Asegurar que estamos en el directorio correcto
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 os.chdir(ROOT_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+def run_schema_migrations(args):
+    """Aplicar o verificar las migraciones versionadas"""
+    import logging
+    from app.database.db import engine
+    from app.database.schema import SCHEMA_VERSION, apply_migrations, get_schema_version
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    if args.check:
+        current = get_schema_version(engine)
+        print(f"Versión del esquema: {current} (esperada: {SCHEMA_VERSION})")
+        sys.exit(0 if current == SCHEMA_VERSION else 1)
+
+    if not apply_migrations(engine, bootstrap=args.bootstrap):
+        sys.exit(1)
 
 def run_migrations(args):
     """Ejecutar migraciones según los argumentos proporcionados"""
@@ -57,6 +79,14 @@ if __name__ == "__main__":
     group.add_argument("--downgrade", "-d", help="Bajar a versión específica o número de pasos (-1, -2, etc)")
     group.add_argument("--history", "-H", action="store_true", help="Mostrar historial de migraciones")
     group.add_argument("--current", action="store_true", help="Mostrar versión actual")
+    group.add_argument("--apply", action="store_true", help="Aplicar las migraciones versionadas pendientes")
+    group.add_argument("--bootstrap", action="store_true",
+                       help="Crear el esquema base y ejecutar todas las migraciones versionadas (bases anteriores a la marca)")
+    group.add_argument("--check", action="store_true",
+                       help="Salir con código 0 si el esquema está en la versión esperada")
     
     args = parser.parse_args()
-    run_migrations(args) 
\ No newline at end of file
+    if args.apply or args.bootstrap or args.check:
+        run_schema_migrations(args)
+    else:
+        run_migrations(args) 
\ No newline at end of file
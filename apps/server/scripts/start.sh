@@ -44,18 +44,19 @@ if [[ -n "$DATABASE_URL" ]]; then
     echo "Database: $POSTGRES_DB"
 fi
 
-# Inicializar la base de datos utilizando nuestro script de Python mejorado
-echo "Inicializando base de datos con script mejorado..."
-python /app/scripts/init_db.py
+# Migraciones versionadas: paso único y explícito. En despliegues con varias
+# réplicas debe ejecutarlo un solo proceso (job de release) con RUN_MIGRATIONS=true;
+# el resto de réplicas arranca sin DDL.
+if [[ "$RUN_MIGRATIONS" == "true" ]]; then
+    wait_for_postgres
+    echo "Aplicando migraciones del esquema..."
+    (cd /app && python scripts/migrate.py --apply)
+fi
 
 # Verificar si se debe inicializar la base de datos con datos iniciales
 if [[ "$INITIALIZE_DB" == "true" ]]; then
     echo "Inicialización de datos solicitada..."
     
-    # Ejecutar script de migración para añadir columna creator_id si es necesario
-    echo "Ejecutando script de migración para añadir columna creator_id..."
-    python /app/migrations/add_creator_id.py
-    
     # Ejecutar script de actualización de roles
     echo "Actualizando roles de usuarios..."
     PGPASSWORD=${POSTGRES_PASSWORD} psql -h ${POSTGRES_HOST} -U ${POSTGRES_USER} -d ${POSTGRES_DB} -f /app/scripts/update_roles.sql
@@ -64,6 +65,13 @@ if [[ "$INITIALIZE_DB" == "true" ]]; then
     echo "Inicialización de la base de datos completada."
 fi
 
+# Métricas de Prometheus en modo multiproceso: los archivos de una ejecución
+# anterior no deben mezclarse con los de los workers nuevos
+if [[ -n "$PROMETHEUS_MULTIPROC_DIR" ]]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 # Iniciar la aplicación
 echo "Iniciando aplicación FastAPI..."
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000 
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Configuración común de las pruebas del servidor.
+
+La configuración (app/core/config.py) se lee al importar `app`, así que las
+variables de entorno se fijan aquí antes de cualquier importación de la
+aplicación: sin planificador, sin emails y sin servicios externos.
+
+Las pruebas que necesitan base de datos usan TEST_DATABASE_URL, un PostgreSQL
+desechable (en CI, el servicio del workflow). Se aplican las migraciones
+versionadas al iniciar la sesión; sin esa variable, esas pruebas se omiten.
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+import pytest
+
+os.environ.setdefault("ENABLE_SCHEDULER", "false")
+os.environ.setdefault("ENABLE_EMAIL_NOTIFICATIONS", "false")
+os.environ.setdefault("ENABLE_APITALLY", "false")
+os.environ.setdefault("SUPABASE_URL", "http://gotrue.test")
+os.environ.setdefault("SUPABASE_KEY", "test-anon-key")
+os.environ.setdefault("MAILJET_API_KEY", "test-key")
+os.environ.setdefault("MAILJET_SECRET_KEY", "test-secret")
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """Engine de la aplicación sobre la base de pruebas, con el esquema al día"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL no está definida")
+
+    from app.database.db import engine
+    from app.database.schema import SCHEMA_VERSION, apply_migrations, get_schema_version
+
+    if get_schema_version(engine) != SCHEMA_VERSION:
+        assert apply_migrations(engine), "No se pudieron aplicar las migraciones en la base de pruebas"
+    return engine
+
+
+@pytest.fixture
+def api_client(db_engine):
+    """TestClient sin lifespan (no arranca planificador ni despachador de emails)"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+
+
+def login_as(user: Dict[str, Any]) -> None:
+    """Autenticar las peticiones siguientes como `user` sin pasar por Supabase"""
+    from app.core.auth import AuthUser, get_current_user
+    from app.main import app
+
+    auth_user = AuthUser(id=user["auth_id"], email=user["email"], role=user["role"])
+    app.dependency_overrides[get_current_user] = lambda: auth_user
+
+
+def _insert_user(conn, role: str = "member") -> Dict[str, Any]:
+    from sqlalchemy import text
+
+    user = {
+        "id": str(uuid.uuid4()),
+        "auth_id": str(uuid.uuid4()),
+        "email": f"{uuid.uuid4().hex[:12]}@example.test",
+        "role": role,
+    }
+    conn.execute(text("""
+        INSERT INTO user_profiles (id, auth_id, first_name, last_name, email, role,
+                                   email_notifications, created_at, updated_at, is_active)
+        VALUES (:id, :auth_id, 'Test', 'User', :email, :role, false, NOW(), NOW(), true)
+    """), user)
+    return user
+
+
+@pytest.fixture
+def board_factory(db_engine):
+    """
+    Crear un proyecto con tablero, listas, tarjetas asignadas y sprints.
+
+    El tamaño es configurable para comprobar que el número de consultas no
+    crece con el número de filas.
+    """
+    from sqlalchemy import text
+
+    def create(lists: int = 4, cards_per_list: int = 10, assignees: int = 5, sprints: int = 3) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        with db_engine.begin() as conn:
+            owner = _insert_user(conn, role="product_owner")
+            member = _insert_user(conn)
+            developers = [_insert_user(conn, role="developer") for _ in range(assignees)]
+
+            project_id = str(uuid.uuid4())
+            conn.execute(text("""
+                INSERT INTO projects (id, name, owner_id, created_by, status, priority,
+                                      completion_percentage, created_at, updated_at, is_active)
+                VALUES (:id, 'Proyecto de prueba', :owner_id, :owner_id, 'ACTIVE', 'MEDIUM', 0, NOW(), NOW(), true)
+            """), {"id": project_id, "owner_id": owner["id"]})
+            for user, role in [(owner, "product_owner"), (member, "member")] + [(d, "developer") for d in developers]:
+                conn.execute(text("""
+                    INSERT INTO project_members (id, user_id, project_id, role, joined_at, created_at, updated_at, is_active)
+                    VALUES (:id, :user_id, :project_id, :role, NOW(), NOW(), NOW(), true)
+                """), {"id": str(uuid.uuid4()), "user_id": user["id"], "project_id": project_id, "role": role})
+
+            board_id = str(uuid.uuid4())
+            conn.execute(text("""
+                INSERT INTO boards (id, name, project_id, created_at, updated_at, is_active)
+                VALUES (:id, 'Tablero', :project_id, NOW(), NOW(), true)
+            """), {"id": board_id, "project_id": project_id})
+
+            list_ids = []
+            for position in range(lists):
+                list_id = str(uuid.uuid4())
+                list_ids.append(list_id)
+                conn.execute(text("""
+                    INSERT INTO lists (id, name, board_id, position, created_at, updated_at, is_active)
+                    VALUES (:id, :name, :board_id, :position, NOW(), NOW(), true)
+                """), {"id": list_id, "name": f"Lista {position}", "board_id": board_id, "position": position})
+                for card_position in range(cards_per_list):
+                    conn.execute(text("""
+                        INSERT INTO cards (id, title, list_id, position, due_date, assignee_id,
+                                           created_at, updated_at, is_active)
+                        VALUES (:id, :title, :list_id, :position, :due_date, :assignee_id, NOW(), NOW(), true)
+                    """), {
+                        "id": str(uuid.uuid4()),
+                        "title": f"Tarjeta {position}-{card_position}",
+                        "list_id": list_id,
+                        "position": card_position,
+                        "due_date": now + timedelta(days=card_position),
+                        "assignee_id": developers[card_position % assignees]["id"] if assignees else None,
+                    })
+
+            for index in range(sprints):
+                sprint_id = str(uuid.uuid4())
+                conn.execute(text("""
+                    INSERT INTO sprints (id, name, project_id, start_date, end_date, goal, status,
+                                         created_at, updated_at, is_active)
+                    VALUES (:id, :name, :project_id, :start_date, :end_date, '', :status, NOW(), NOW(), true)
+                """), {
+                    "id": sprint_id,
+                    "name": f"Sprint {index + 1}",
+                    "project_id": project_id,
+                    "start_date": now - timedelta(weeks=2 * (sprints - index)),
+                    "end_date": now - timedelta(weeks=2 * (sprints - index - 1)),
+                    "status": "active" if index == sprints - 1 else "completed",
+                })
+                for story_index in range(5):
+                    story_id = str(uuid.uuid4())
+                    conn.execute(text("""
+                        INSERT INTO user_stories (id, title, project_id, status, story_points,
+                                                  created_at, updated_at, is_active)
+                        VALUES (:id, :title, :project_id, :status, 3, NOW(), NOW(), true)
+                    """), {
+                        "id": story_id,
+                        "title": f"Historia {index}-{story_index}",
+                        "project_id": project_id,
+                        "status": "done" if story_index % 2 == 0 else "in_progress",
+                    })
+                    conn.execute(text("""
+                        INSERT INTO sprint_backlog (sprint_id, story_id) VALUES (:sprint_id, :story_id)
+                    """), {"sprint_id": sprint_id, "story_id": story_id})
+
+        return {
+            "project_id": project_id,
+            "board_id": board_id,
+            "list_ids": list_ids,
+            "owner": owner,
+            "member": member,
+            "developers": developers,
+        }
+
+    return create
@@ -0,0 +1,91 @@
+"""
+Presupuesto de consultas SQL de los endpoints de tableros.
+
+Cada endpoint de lectura debe ejecutar un número fijo de sentencias, sin
+importar cuántas listas, tarjetas, asignados o sprints tenga el tablero. Los
+datos de prueba tienen decenas de tarjetas con distintos asignados, así que una
+consulta por fila (N+1) supera el presupuesto y la prueba falla.
+"""
+
+import pytest
+
+from app.core.cache import invalidate_all
+from app.core.db_instrumentation import assert_query_budget
+from tests.conftest import login_as
+
+API = "/api/boards"
+
+
+@pytest.fixture
+def board(board_factory):
+    data = board_factory(lists=4, cards_per_list=12, assignees=6, sprints=4)
+    # Un miembro sin rol especial recorre todas las comprobaciones de acceso
+    login_as(data["member"])
+    # Las cachés por proyecto son del proceso: partir siempre de una caché vacía
+    invalidate_all()
+    return data
+
+
+# (ruta, presupuesto); el presupuesto es el número de sentencias actual de cada endpoint
+BOARD_ENDPOINTS = [
+    ("/{board_id}", 4),
+    ("/{board_id}/lists", 4),
+    ("/{board_id}/sprint", 2),
+    ("/{board_id}/sprints", 2),
+    ("/{board_id}/sprint-info", 2),
+    ("/{board_id}/developers", 7),
+]
+
+
+@pytest.mark.parametrize("path,budget", BOARD_ENDPOINTS)
+def test_board_endpoint_query_budget(api_client, board, path, budget):
+    url = API + path.format(board_id=board["board_id"])
+    with assert_query_budget(budget):
+        response = api_client.get(url)
+    assert response.status_code == 200, response.text
+
+
+def test_list_cards_query_budget(api_client, board):
+    list_id = board["list_ids"][0]
+    with assert_query_budget(5):
+        response = api_client.get(f"{API}/lists/{list_id}/cards")
+    assert response.status_code == 200, response.text
+
+    cards = response.json()
+    assert len(cards) == 12
+    # Los datos del asignado llegan en la misma consulta que las tarjetas
+    assert all(card["assignee_email"] for card in cards)
+
+
+def test_list_boards_query_budget(api_client, board):
+    with assert_query_budget(3):
+        response = api_client.get(f"{API}/")
+    assert response.status_code == 200, response.text
+    assert board["board_id"] in {b["id"] for b in response.json()}
+
+
+def test_sprint_info_is_served_from_cache(api_client, board):
+    url = f"{API}/{board['board_id']}/sprint-info"
+    first = api_client.get(url)
+    assert first.status_code == 200, first.text
+    assert first.json()["active_sprint"]["stories_count"] == 5
+
+    # Con el resumen en caché solo queda la comprobación de acceso
+    with assert_query_budget(1):
+        second = api_client.get(url)
+    assert second.json() == first.json()
+
+
+def test_query_count_does_not_grow_with_board_size(api_client, board_factory):
+    """Mismo número de sentencias para un tablero pequeño y uno grande"""
+    counts = []
+    for size in (2, 30):
+        data = board_factory(lists=2, cards_per_list=size, assignees=min(size, 8), sprints=2)
+        login_as(data["member"])
+        invalidate_all()
+        with assert_query_budget(50) as statements:
+            api_client.get(f"{API}/{data['board_id']}/lists")
+            api_client.get(f"{API}/lists/{data['list_ids'][0]}/cards")
+            api_client.get(f"{API}/{data['board_id']}/sprint-info")
+        counts.append(len(statements))
+    assert counts[0] == counts[1], counts
@@ -0,0 +1,41 @@
+"""
+Creación de tarjetas: el asignado se guarda con la tarjeta.
+"""
+
+from sqlalchemy import text
+
+from tests.conftest import login_as
+
+
+def test_created_card_keeps_its_assignee(api_client, board_factory, db_engine):
+    data = board_factory(lists=1, cards_per_list=0, assignees=1, sprints=0)
+    login_as(data["owner"])
+    list_id = data["list_ids"][0]
+    developer_id = data["developers"][0]["id"]
+
+    response = api_client.post(f"/api/boards/lists/{list_id}/cards",
+                               json={"title": "Asignada", "assignee_id": developer_id})
+    assert response.status_code == 200, response.text
+    card_id = response.json()["id"]
+
+    cards = api_client.get(f"/api/boards/lists/{list_id}/cards").json()
+    assert [card["assignee_id"] for card in cards if card["id"] == card_id] == [developer_id]
+    with db_engine.connect() as conn:
+        events = conn.execute(text("""
+            SELECT event_type, assignee_id FROM card_events WHERE card_id = :card_id ORDER BY id
+        """), {"card_id": card_id}).fetchall()
+    assert [tuple(event) for event in events] == [("created", None), ("assigned", developer_id)]
+
+
+def test_developer_card_is_self_assigned(api_client, board_factory):
+    data = board_factory(lists=1, cards_per_list=0, assignees=1, sprints=0)
+    developer = data["developers"][0]
+    login_as(developer)
+    list_id = data["list_ids"][0]
+
+    response = api_client.post(f"/api/boards/lists/{list_id}/cards", json={"title": "Propia"})
+    assert response.status_code == 200, response.text
+    card_id = response.json()["id"]
+
+    cards = api_client.get(f"/api/boards/lists/{list_id}/cards").json()
+    assert [card["assignee_id"] for card in cards if card["id"] == card_id] == [developer["id"]]
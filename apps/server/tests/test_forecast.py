@@ -0,0 +1,47 @@
+"""
+Simulación Monte Carlo del pronóstico: resultados y costo en el peor caso.
+"""
+
+import time
+
+import numpy as np
+
+from app.services.forecast import MAX_PERIODS, MAX_TRIALS, simulate_periods
+
+
+def test_simulation_finishes_within_bounds():
+    rng = np.random.default_rng(1)
+    periods = simulate_periods(np.asarray([3, 5, 4, 6, 2]), 40, 5000, rng)
+    assert periods.min() >= 40 // 6
+    assert periods.max() <= 40 // 2
+    assert (periods <= MAX_PERIODS).all()
+
+
+def test_unreachable_backlog_is_not_simulated():
+    rng = np.random.default_rng(1)
+    started = time.perf_counter()
+    periods = simulate_periods(np.asarray([1, 2]), 2 * MAX_PERIODS + 1, MAX_TRIALS, rng)
+    assert time.perf_counter() - started < 0.05
+    assert (periods == MAX_PERIODS + 1).all()
+
+
+def test_hopeless_scenarios_stop_early():
+    """Los escenarios que ya no pueden terminar se marcan como no terminados"""
+    rng = np.random.default_rng(1)
+    periods = simulate_periods(np.asarray([1, 2]), 1000, 2000, rng)
+    assert (periods == MAX_PERIODS + 1).all()
+
+    rng = np.random.default_rng(1)
+    periods = simulate_periods(np.asarray([0, 1, 0, 2, 0, 0]), 150, 2000, rng)
+    finished = periods[periods <= MAX_PERIODS]
+    assert finished.size and (finished >= 75).all()
+
+
+def test_sparse_throughput_worst_case_is_bounded():
+    """Historiales con muchos periodos en cero no recorren la simulación periodo a periodo"""
+    for history, remaining in (([0, 1], 250), ([0, 1, 0, 2, 0, 0], 150), ([0] * 9 + [3], 150)):
+        rng = np.random.default_rng(1)
+        started = time.perf_counter()
+        periods = simulate_periods(np.asarray(history), remaining, MAX_TRIALS, rng)
+        assert time.perf_counter() - started < 0.1
+        assert periods.shape == (MAX_TRIALS,)
@@ -0,0 +1,38 @@
+"""
+Presupuesto de tiempo de importación de app.main.
+
+Cada worker y cada script pagan este costo al arrancar. Usa la medición de
+scripts/check_import_time.py (`python -X importtime` en un proceso nuevo).
+
+Qué clientes pesados se importan es determinista y se comprueba siempre. El
+tiempo total depende de la máquina: solo se verifica si se define
+IMPORT_BUDGET_MS (en milisegundos).
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "..", "scripts", "check_import_time.py")
+
+
+@pytest.fixture(scope="module")
+def import_profile():
+    spec = importlib.util.spec_from_file_location("check_import_time", SCRIPT)
+    check_import_time = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(check_import_time)
+    total_ms, entries = check_import_time.best_of("app.main", runs=3)
+    return check_import_time, total_ms, entries
+
+
+def test_heavy_clients_are_not_imported_eagerly(import_profile):
+    check_import_time, _, entries = import_profile
+    assert check_import_time.eager_lazy_modules(entries) == []
+
+
+@pytest.mark.skipif(not os.getenv("IMPORT_BUDGET_MS"), reason="IMPORT_BUDGET_MS no está definida")
+def test_app_main_import_time_budget(import_profile):
+    _, total_ms, _ = import_profile
+    budget_ms = float(os.environ["IMPORT_BUDGET_MS"])
+    assert total_ms <= budget_ms, f"app.main tarda {total_ms:.0f} ms (presupuesto: {budget_ms:.0f} ms)"
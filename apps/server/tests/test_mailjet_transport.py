@@ -0,0 +1,190 @@
+"""
+Política de reintentos del transporte de Mailjet y lectura de los estados por
+mensaje, contra un Mailjet falso (httpx.MockTransport).
+"""
+
+from typing import List, Optional
+
+import httpx
+import pytest
+
+from app.services import mailjet_transport
+from app.services.email_service import EmailService
+from app.services.mailjet_transport import MailjetResult, MailjetTransport
+
+PAYLOAD = {"Messages": [{"To": [{"Email": "a@example.test"}], "Subject": "Hola"}]}
+
+
+class FakeMailjet:
+    """Handler de MockTransport que responde en orden con `responses`"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        if isinstance(response, int):
+            return httpx.Response(response, json={"ErrorMessage": "fallo"})
+        return response
+
+
+def ok_response(statuses: List[str]) -> httpx.Response:
+    code = 200 if all(s == "success" for s in statuses) else 400
+    return httpx.Response(code, json={"Messages": [{"Status": s} for s in statuses]})
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Transporte con 2 reintentos; registra las esperas en lugar de dormir"""
+    delays: List[tuple] = []
+
+    def install(fake: FakeMailjet) -> MailjetTransport:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(fake))
+        monkeypatch.setattr(mailjet_transport, "get_http_client", lambda: client)
+        instance = MailjetTransport("key", "secret", api_url="https://mailjet.test/", max_retries=2)
+        original_delay = instance._delay
+
+        def record_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+            delays.append((attempt, retry_after, original_delay(attempt, retry_after)))
+            return 0
+
+        instance._delay = record_delay
+        instance.delays = delays
+        return instance
+
+    return install
+
+
+@pytest.mark.asyncio
+async def test_connect_errors_are_retried_with_backoff(transport):
+    fake = FakeMailjet(httpx.ConnectError("refused"), httpx.ConnectTimeout("timeout"), ok_response(["success"]))
+    mailjet = transport(fake)
+
+    result = await mailjet.send(PAYLOAD)
+
+    assert result.ok and result.attempts == 3
+    assert len(fake.requests) == 3
+    assert [attempt for attempt, _, _ in mailjet.delays] == [1, 2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [429, 503])
+async def test_retryable_statuses_are_retried(transport, status):
+    fake = FakeMailjet(status, ok_response(["success"]))
+    mailjet = transport(fake)
+
+    result = await mailjet.send(PAYLOAD)
+
+    assert result.ok and result.attempts == 2
+    assert len(fake.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_after_header_is_honoured(transport):
+    fake = FakeMailjet(httpx.Response(429, headers={"Retry-After": "7"}), ok_response(["success"]))
+    mailjet = transport(fake)
+
+    await mailjet.send(PAYLOAD)
+
+    assert mailjet.delays == [(1, "7", 7.0)]
+
+
+@pytest.mark.asyncio
+async def test_last_response_is_returned_when_retries_run_out(transport):
+    fake = FakeMailjet(503)
+    mailjet = transport(fake)
+
+    result = await mailjet.send(PAYLOAD)
+
+    assert result.status_code == 503 and result.attempts == 3
+    assert len(fake.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_connect_error_is_raised_when_retries_run_out(transport):
+    fake = FakeMailjet(httpx.ConnectError("refused"))
+    mailjet = transport(fake)
+
+    with pytest.raises(httpx.ConnectError):
+        await mailjet.send(PAYLOAD)
+    assert len(fake.requests) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [400, 401, 502, 504])
+async def test_unsafe_statuses_are_not_retried(transport, status):
+    fake = FakeMailjet(status)
+    mailjet = transport(fake)
+
+    result = await mailjet.send(PAYLOAD)
+
+    assert result.status_code == status and result.attempts == 1
+    assert len(fake.requests) == 1
+    assert mailjet.delays == []
+
+
+@pytest.mark.asyncio
+async def test_read_timeout_is_not_retried(transport):
+    """Mailjet pudo haber aceptado el envío: reintentar duplicaría los emails"""
+    fake = FakeMailjet(httpx.ReadTimeout("read timeout"), ok_response(["success"]))
+    mailjet = transport(fake)
+
+    with pytest.raises(httpx.ReadTimeout):
+        await mailjet.send(PAYLOAD)
+    assert len(fake.requests) == 1
+
+
+def test_backoff_grows_exponentially_with_jitter():
+    mailjet = MailjetTransport("key", "secret", backoff=0.5)
+    for attempt in (1, 2, 3):
+        base = 0.5 * 2 ** (attempt - 1)
+        for _ in range(20):
+            assert base * 0.5 <= mailjet._delay(attempt) <= base * 1.5
+    assert mailjet._delay(1, "120") == 30.0
+
+
+def test_message_statuses_are_read_on_partial_failure():
+    result = MailjetResult(400, {"Messages": [
+        {"Status": "success"},
+        {"Status": "error", "Errors": [{"ErrorCode": "mj-0013"}]},
+        {"Status": "success"},
+    ]})
+    assert result.message_statuses(3) == [True, False, True]
+    assert MailjetResult(500, {"raw": "Internal error"}).message_statuses(2) == [False, False]
+
+
+@pytest.fixture
+def email_service(transport):
+    def create(fake: FakeMailjet) -> EmailService:
+        service = EmailService()
+        service.enabled = True
+        service._transport = transport(fake)
+        return service
+    return create
+
+
+def message(email: str) -> tuple:
+    return ("card_assigned", {"To": [{"Email": email}], "Subject": "Hola"})
+
+
+@pytest.mark.asyncio
+async def test_send_batch_counts_accepted_messages(email_service):
+    service = email_service(FakeMailjet(ok_response(["success", "success"])))
+    assert await service.send_batch([message("a@example.test"), message("b@example.test")]) == 2
+
+
+@pytest.mark.asyncio
+async def test_send_batch_counts_accepted_messages_on_400(email_service):
+    service = email_service(FakeMailjet(ok_response(["success", "error", "success"])))
+    sent = await service.send_batch([message("a@example.test"), message("invalid"), message("c@example.test")])
+    assert sent == 2
+
+
+@pytest.mark.asyncio
+async def test_send_batch_counts_nothing_without_per_message_statuses(email_service):
+    service = email_service(FakeMailjet(500))
+    assert await service.send_batch([message("a@example.test")]) == 0
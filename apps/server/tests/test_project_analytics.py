@@ -0,0 +1,96 @@
+"""
+Analíticas de proyecto: invalidación de la caché al cambiar las listas (no al
+reordenar tarjetas) y flujo acumulado de tarjetas eliminadas.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app.core.cache import invalidate_all
+from tests.conftest import login_as
+
+
+@pytest.fixture
+def project(board_factory):
+    data = board_factory(lists=2, cards_per_list=0, assignees=0, sprints=1)
+    login_as(data["owner"])
+    invalidate_all()
+    return data
+
+
+def cumulative_flow(api_client, project_id):
+    response = api_client.get(f"/api/projects/{project_id}/analytics", params={"days": 7})
+    assert response.status_code == 200, response.text
+    return {lst["list_id"]: lst["counts"] for lst in response.json()["cumulative_flow"][0]["lists"]}
+
+
+def test_new_list_invalidates_analytics(api_client, project):
+    assert len(cumulative_flow(api_client, project["project_id"])) == 2
+
+    response = api_client.post(f"/api/boards/{project['board_id']}/lists", json={"name": "Nueva"})
+    assert response.status_code == 200, response.text
+
+    flow = cumulative_flow(api_client, project["project_id"])
+    assert response.json()["id"] in flow
+
+
+def test_deleted_card_keeps_its_history(api_client, project, db_engine):
+    list_id = project["list_ids"][0]
+    response = api_client.post(f"/api/boards/lists/{list_id}/cards", json={"title": "Temporal"})
+    assert response.status_code == 200, response.text
+    card_id = response.json()["id"]
+    with db_engine.begin() as conn:
+        conn.execute(text("UPDATE card_events SET ts = ts - INTERVAL '3 days' WHERE card_id = :card_id"),
+                     {"card_id": card_id})
+
+    assert api_client.delete(f"/api/boards/cards/{card_id}").status_code == 200
+
+    # Estuvo en la lista desde hace 3 días hasta hoy, cuando se eliminó
+    assert cumulative_flow(api_client, project["project_id"])[list_id] == [0, 0, 0, 1, 1, 1, 0]
+
+
+def test_deleted_card_from_before_the_event_log(api_client, board_factory, db_engine):
+    """Una tarjeta sin evento 'created' que se mueve y luego se elimina no deja conteos negativos"""
+    data = board_factory(lists=2, cards_per_list=2, assignees=0, sprints=1)
+    login_as(data["owner"])
+    invalidate_all()
+    first, second = data["list_ids"]
+    with db_engine.connect() as conn:
+        card_id, remaining_id = [row[0] for row in conn.execute(
+            text("SELECT id FROM cards WHERE list_id = :list_id ORDER BY position"), {"list_id": first}
+        )]
+
+    response = api_client.put(f"/api/boards/cards/{card_id}", json={"list_id": second})
+    assert response.status_code == 200, response.text
+    with db_engine.begin() as conn:
+        conn.execute(text("UPDATE card_events SET ts = ts - INTERVAL '3 days' WHERE card_id = :card_id"),
+                     {"card_id": card_id})
+    assert api_client.delete(f"/api/boards/cards/{card_id}").status_code == 200
+
+    # Las tarjetas de la fábrica se crearon hoy; la eliminada estuvo en la
+    # segunda lista desde el inicio del registro hasta hoy
+    flow = cumulative_flow(api_client, data["project_id"])
+    assert flow[first] == [0, 0, 0, 0, 0, 0, 1]
+    assert flow[second] == [0, 0, 0, 1, 1, 1, 2]
+
+
+def test_reorder_does_not_record_activity_or_invalidate(api_client, board_factory, monkeypatch):
+    """Cambiar solo la posición de una tarjeta no registra actividad ni invalida cachés"""
+    import app.routers.boards as boards
+
+    data = board_factory(lists=1, cards_per_list=2, assignees=0, sprints=0)
+    login_as(data["owner"])
+    activities, invalidated = [], []
+    monkeypatch.setattr(boards, "record_activity", lambda *args, **kwargs: activities.append(args[3]))
+    monkeypatch.setattr(boards, "invalidate_project", invalidated.append)
+    response = api_client.get(f"/api/boards/lists/{data['list_ids'][0]}/cards")
+    card_id = response.json()[0]["id"]
+
+    response = api_client.put(f"/api/boards/cards/{card_id}", json={"position": 5})
+    assert response.status_code == 200, response.text
+    assert response.json()["position"] == 5
+    assert activities == [] and invalidated == []
+
+    response = api_client.put(f"/api/boards/cards/{card_id}", json={"title": "Renombrada", "position": 0})
+    assert response.status_code == 200, response.text
+    assert activities == ["card_updated"] and invalidated == [data["project_id"]]
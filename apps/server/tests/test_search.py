@@ -0,0 +1,52 @@
+"""
+Búsqueda de texto completo: solo sobre proyectos y tableros accesibles y activos.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from tests.conftest import login_as
+
+
+@pytest.fixture
+def searchable(board_factory, db_engine):
+    """Proyecto con una tarjeta de título único, sin tarjetas asignadas"""
+    data = board_factory(lists=1, cards_per_list=0, assignees=0, sprints=0)
+    term = f"zq{uuid.uuid4().hex[:10]}"
+    with db_engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO cards (id, title, list_id, position, created_at, updated_at, is_active)
+            VALUES (:id, :title, :list_id, 0, NOW(), NOW(), true)
+        """), {"id": str(uuid.uuid4()), "title": f"Tarjeta {term}", "list_id": data["list_ids"][0]})
+    return {**data, "term": term}
+
+
+def _hits(api_client, user, term):
+    login_as(user)
+    response = api_client.get("/api/search", params={"q": term})
+    assert response.status_code == 200, response.text
+    return response.json()["results"]
+
+
+def test_member_finds_cards(api_client, searchable):
+    assert len(_hits(api_client, searchable["member"], searchable["term"])) == 1
+
+
+def test_demoted_creator_gets_no_hits(api_client, db_engine, searchable):
+    owner = searchable["owner"]
+    with db_engine.begin() as conn:
+        conn.execute(text("UPDATE user_profiles SET role = 'developer' WHERE id = :id"), {"id": owner["id"]})
+        conn.execute(text("""
+            DELETE FROM project_members WHERE project_id = :project_id AND user_id = :user_id
+        """), {"project_id": searchable["project_id"], "user_id": owner["id"]})
+
+    assert _hits(api_client, {**owner, "role": "developer"}, searchable["term"]) == []
+
+
+def test_archived_project_gets_no_hits(api_client, db_engine, searchable):
+    with db_engine.begin() as conn:
+        conn.execute(text("UPDATE projects SET is_active = false WHERE id = :id"), {"id": searchable["project_id"]})
+
+    assert _hits(api_client, searchable["member"], searchable["term"]) == []
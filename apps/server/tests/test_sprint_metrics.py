@@ -0,0 +1,52 @@
+"""
+Métricas de sprint: la consulta no registra instantáneas y el resumen de
+sprint de los tableros lee la última instantánea.
+"""
+
+import uuid
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.cache import invalidate_all
+from app.services.sprint_metrics import SprintMetricsService
+from tests.conftest import login_as
+
+
+def test_latest_metrics_without_snapshot_are_computed_without_writing(board_factory, db_engine):
+    data = board_factory(lists=1, cards_per_list=0, assignees=0, sprints=1)
+    with Session(db_engine) as db:
+        sprint_id = db.execute(text("SELECT id FROM sprints WHERE project_id = :project_id"),
+                               {"project_id": data["project_id"]}).scalar()
+
+        metrics = SprintMetricsService(db).get_latest_metrics(sprint_id)
+
+        assert metrics["total_stories"] == 5
+        assert metrics["completed_stories"] == 3
+        assert metrics["velocity"] == 9
+        snapshots = db.execute(text("SELECT COUNT(*) FROM sprint_metrics WHERE sprint_id = :sprint_id"),
+                               {"sprint_id": sprint_id}).scalar()
+        assert snapshots == 0
+        assert SprintMetricsService(db).get_latest_metrics("no-existe") is None
+
+
+def test_board_sprint_info_reads_latest_snapshot(api_client, board_factory, db_engine):
+    data = board_factory(lists=1, cards_per_list=0, assignees=0, sprints=2)
+    login_as(data["member"])
+    invalidate_all()
+    with db_engine.begin() as conn:
+        sprint_id = conn.execute(text("""
+            SELECT id FROM sprints WHERE project_id = :project_id AND status = 'active'
+        """), {"project_id": data["project_id"]}).scalar()
+        for total, completed, age in [(40, 2, "2 days"), (42, 7, "1 hour")]:
+            conn.execute(text("""
+                INSERT INTO sprint_metrics (id, sprint_id, total_stories, completed_stories, velocity,
+                                            recorded_at, created_at, updated_at, is_active)
+                VALUES (:id, :sprint_id, :total, :completed, 0, NOW() - CAST(:age AS INTERVAL), NOW(), NOW(), true)
+            """), {"id": str(uuid.uuid4()), "sprint_id": sprint_id, "total": total,
+                   "completed": completed, "age": age})
+
+    response = api_client.get(f"/api/boards/{data['board_id']}/sprint-info")
+    assert response.status_code == 200, response.text
+    active = response.json()["active_sprint"]
+    assert (active["stories_count"], active["completed_stories_count"]) == (42, 7)
@@ -0,0 +1,223 @@
+"""
+Modo degradado de Supabase Auth: circuit breaker, caché de tokens verificados y
+validate_jwt_token contra un GoTrue falso (httpx.MockTransport).
+"""
+
+import base64
+import json
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import circuit_breaker as circuit_breaker_module
+from app.core import supabase
+from app.core.auth import get_current_user
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.core.config import settings
+from app.core.token_cache import VerifiedTokenCache, token_expiry
+
+
+def make_token(exp_in: float = 3600, sub: str = "user-1") -> str:
+    """JWT sin firma válida; solo importa el claim `exp`"""
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+    return f"{encode({'alg': 'HS256'})}.{encode({'sub': sub, 'exp': int(time.time() + exp_in)})}.firma"
+
+
+class FakeClock:
+    """Reemplazo de time.monotonic para avanzar el tiempo del breaker"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", fake)
+    return fake
+
+
+# --- CircuitBreaker -------------------------------------------------------
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("test_open", failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_success_resets_failure_count(clock):
+    breaker = CircuitBreaker("test_reset", failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_breaker_half_open_probe_closes_on_success(clock):
+    breaker = CircuitBreaker("test_probe_ok", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now += 29
+    assert not breaker.allow_request()
+
+    clock.now += 1
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    # Solo una llamada de prueba mientras no termine
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_breaker_half_open_probe_reopens_on_failure(clock):
+    breaker = CircuitBreaker("test_probe_fail", failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.snapshot()["retry_in_seconds"] == 30
+
+
+# --- VerifiedTokenCache ---------------------------------------------------
+
+def test_token_expiry_reads_exp_claim():
+    token = make_token(exp_in=60)
+    assert token_expiry(token) == pytest.approx(time.time() + 60, abs=2)
+    assert token_expiry("no-es-un-jwt") is None
+
+
+def test_token_cache_honours_exp_and_discard():
+    cache = VerifiedTokenCache(max_entries=10, max_age=900)
+    valid, expired = make_token(exp_in=60), make_token(exp_in=-1)
+    cache.set(valid, {"data": {"user": {"id": "u1"}}})
+    cache.set(expired, {"data": {"user": {"id": "u2"}}})
+
+    assert cache.get(valid) == {"data": {"user": {"id": "u1"}}}
+    assert cache.get(expired) is None
+
+    cache.discard(valid)
+    assert cache.get(valid) is None
+
+
+def test_token_cache_is_bounded_lru():
+    cache = VerifiedTokenCache(max_entries=2, max_age=900)
+    first, second, third = make_token(sub="a"), make_token(sub="b"), make_token(sub="c")
+    cache.set(first, {"id": "a"})
+    cache.set(second, {"id": "b"})
+    cache.get(first)
+    cache.set(third, {"id": "c"})
+
+    assert len(cache) == 2
+    assert cache.get(second) is None
+    assert cache.get(first) == {"id": "a"}
+
+
+# --- validate_jwt_token contra GoTrue falso -------------------------------
+
+class FakeGoTrue:
+    """Handler de MockTransport: 200 con el usuario, o el fallo configurado"""
+
+    def __init__(self):
+        self.requests = 0
+        self.failure = None  # None, un código HTTP o una excepción de httpx
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if isinstance(self.failure, Exception):
+            raise self.failure
+        if self.failure is not None:
+            return httpx.Response(self.failure, json={"msg": "unavailable"})
+        return httpx.Response(200, json={"id": "user-1", "email": "user@example.test", "user_metadata": {}})
+
+
+@pytest.fixture
+def gotrue(monkeypatch):
+    fake = FakeGoTrue()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake))
+    monkeypatch.setattr(supabase, "get_http_client", lambda: client)
+    monkeypatch.setattr(supabase, "auth_breaker", CircuitBreaker("test_supabase_auth", failure_threshold=2, reset_timeout=30))
+    monkeypatch.setattr(supabase, "verified_tokens", VerifiedTokenCache(max_entries=100, max_age=900))
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_cached_token_is_accepted_while_circuit_is_open(gotrue):
+    token = make_token()
+    assert (await supabase.validate_jwt_token(token))["data"]["user"]["id"] == "user-1"
+
+    gotrue.failure = httpx.ConnectError("connection refused")
+    for _ in range(2):
+        assert (await supabase.validate_jwt_token(token))["data"]["user"]["id"] == "user-1"
+    assert supabase.auth_breaker.state == OPEN
+
+    # Con el circuito abierto no se llama a GoTrue
+    requests = gotrue.requests
+    assert (await supabase.validate_jwt_token(token))["data"]["user"]["id"] == "user-1"
+    assert gotrue.requests == requests
+
+
+@pytest.mark.asyncio
+async def test_cached_token_is_accepted_on_5xx(gotrue):
+    token = make_token()
+    await supabase.validate_jwt_token(token)
+
+    gotrue.failure = 503
+    assert (await supabase.validate_jwt_token(token))["data"]["user"]["id"] == "user-1"
+
+
+@pytest.mark.asyncio
+async def test_rejected_token_is_dropped_from_cache(gotrue):
+    token = make_token()
+    await supabase.validate_jwt_token(token)
+
+    gotrue.failure = 401
+    assert await supabase.validate_jwt_token(token) is None
+
+    gotrue.failure = 503
+    with pytest.raises(supabase.AuthServiceUnavailable):
+        await supabase.validate_jwt_token(token)
+
+
+@pytest.mark.asyncio
+async def test_unknown_token_gets_503_with_retry_after(gotrue):
+    gotrue.failure = httpx.ConnectTimeout("timeout")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=make_token()))
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == str(int(settings.SUPABASE_BREAKER_RESET_SECONDS))
+
+
+def test_unknown_token_gets_503_over_http(gotrue):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    gotrue.failure = 502
+    response = TestClient(app).get("/api/boards/", headers={"Authorization": f"Bearer {make_token()}"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(int(settings.SUPABASE_BREAKER_RESET_SECONDS))
@@ -0,0 +1,42 @@
+"""
+Búsqueda de usuarios: los términos cortos solo coinciden como prefijo.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from tests.conftest import login_as
+
+
+@pytest.fixture
+def users(board_factory, db_engine):
+    data = board_factory(lists=0, cards_per_list=0, assignees=0, sprints=0)
+    suffix = uuid.uuid4().hex[:10]
+    emails = {"prefix": f"zq{suffix}@example.test", "inner": f"a-zq{suffix}@example.test"}
+    with db_engine.begin() as conn:
+        for email in emails.values():
+            conn.execute(text("""
+                INSERT INTO user_profiles (id, auth_id, first_name, last_name, email, role,
+                                           email_notifications, created_at, updated_at, is_active)
+                VALUES (:id, :auth_id, 'Busqueda', 'Prueba', :email, 'member', false, NOW(), NOW(), true)
+            """), {"id": str(uuid.uuid4()), "auth_id": str(uuid.uuid4()), "email": email})
+    login_as(data["owner"])
+    return {**emails, "suffix": suffix}
+
+
+def test_short_term_matches_only_prefixes(api_client, users):
+    response = api_client.get("/api/users/search", params={"q": "zQ", "limit": 50})
+    assert response.status_code == 200, response.text
+
+    emails = [user["email"] for user in response.json()]
+    assert all(email.startswith("zq") for email in emails)
+    assert users["inner"] not in emails
+
+
+def test_short_term_matches_name_prefix(api_client, users):
+    response = api_client.get("/api/users/search", params={"q": "bu", "limit": 50})
+    assert response.status_code == 200, response.text
+    names = [user["name"].lower() for user in response.json()]
+    assert names and all(name.startswith("bu") for name in names)